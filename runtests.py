@@ -65,6 +65,9 @@ def runtests():
     if args.bench:
         benchmarks = [
             'wagtail.admin.tests.benches',
+            'wagtail.embeds.benches',
+            'wagtail.api.v2.tests.benches',
+            'wagtail.contrib.routable_page.benches',
         ]
 
         argv = [sys.argv[0], 'test', '-v2'] + benchmarks + rest
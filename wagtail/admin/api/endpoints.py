@@ -53,6 +53,11 @@ class PagesAdminAPIEndpoint(PagesAPIEndpoint):
         'has_children'
     ])
 
+    def conditional_get_enabled(self):
+        # Listings in the admin include drafts and other data that doesn't
+        # change when pages are published
+        return False
+
     def get_queryset(self):
         request = self.request
 
@@ -1,4 +1,5 @@
 import difflib
+import re
 
 from bs4 import BeautifulSoup
 from django.utils.encoding import force_text
@@ -56,7 +57,89 @@ class RichTextFieldComparison(TextFieldComparison):
 
 
 class StreamFieldComparison(RichTextFieldComparison):
-    pass
+    """
+    Compares StreamField values block by block. The blocks of the two values
+    are matched up by their ids, so only the text of the blocks that have
+    changed needs to be diffed.
+    """
+    def get_blocks(self, value):
+        """
+        Returns a list of (id, type, raw value, child) for the blocks of a StreamValue
+        """
+        if value.is_lazy:
+            return [
+                (block.get('id'), block['type'], block['value'], value[i])
+                for i, block in enumerate(value.stream_data)
+            ]
+        else:
+            return [
+                (child.id, child.block_type, child.block.get_prep_value(child.value), child)
+                for child in value
+            ]
+
+    def get_block_text(self, child):
+        return BeautifulSoup('<div>%s</div>' % force_text(child.render()), 'html5lib').getText()
+
+    def get_block_changes(self):
+        """
+        Returns a list of changes for the whole value, or None if the blocks
+        can't be matched up by their ids
+        """
+        blocks_a = self.get_blocks(self.val_a)
+        blocks_b = self.get_blocks(self.val_b)
+
+        ids_a = [block[0] for block in blocks_a]
+        ids_b = [block[0] for block in blocks_b]
+        for ids in (ids_a, ids_b):
+            # Blocks that were saved before ids were given to them can't be matched up
+            if None in ids or len(set(ids)) != len(ids):
+                return None
+
+        blocks_a_by_id = {block[0]: block for block in blocks_a}
+        ids_b = set(ids_b)
+
+        # Deleted blocks are shown before the next block that was kept, so
+        # they stay in the same place relative to it
+        deleted_before = {}
+        deleted = []
+        for block in blocks_a:
+            if block[0] in ids_b:
+                deleted_before[block[0]] = deleted
+                deleted = []
+            else:
+                deleted.append(block)
+
+        block_changes = []
+        for block_id, block_type, raw_value, child in blocks_b:
+            for deleted_block in deleted_before.get(block_id, []):
+                block_changes.append([('deletion', self.get_block_text(deleted_block[3]))])
+
+            block_a = blocks_a_by_id.get(block_id)
+            if block_a is None:
+                block_changes.append([('addition', self.get_block_text(child))])
+            elif block_a[1] == block_type and block_a[2] == raw_value:
+                block_changes.append([('equal', self.get_block_text(child))])
+            else:
+                block_changes.append(diff_text(self.get_block_text(block_a[3]), self.get_block_text(child)).changes)
+
+        for deleted_block in deleted:
+            block_changes.append([('deletion', self.get_block_text(deleted_block[3]))])
+
+        # Blocks are separated by a newline when the value is rendered
+        changes = []
+        for i, block in enumerate(block_changes):
+            if i:
+                changes.append(('equal', '\n'))
+            changes.extend(block)
+
+        return merge_changes(changes)
+
+    def htmldiff(self):
+        changes = self.get_block_changes()
+        if changes is None:
+            return super().htmldiff()
+
+        return TextDiff(changes).to_html()
 
 
 class ChoiceFieldComparison(FieldComparison):
@@ -420,79 +503,103 @@ class TextDiff:
         return mark_safe(self.separator.join(html))
 
 
-def diff_text(a, b):
+# Runs of alphanumeric characters, or any other single character
+TOKEN_RE = re.compile(r'[^\W_]+|[\W_]')
+
+
+def tokenise(text):
     """
-    Performs a diffing algorithm on two pieces of text. Returns
-    a string of HTML containing the content of both texts with
-    <span> tags inserted indicating where the differences are.
+    Tokenises a string by spliting it into individual characters
+    and grouping the alphanumeric ones together.
+
+    This means that punctuation, whitespace, CJK characters, etc
+    become separate tokens and words/numbers are merged together
+    to form bigger tokens.
+
+    This makes the output of the diff easier to read as words are
+    not broken up.
     """
-    def tokenise(text):
-        """
-        Tokenises a string by spliting it into individual characters
-        and grouping the alphanumeric ones together.
+    return TOKEN_RE.findall(text)
 
-        This means that punctuation, whitespace, CJK characters, etc
-        become separate tokens and words/numbers are merged together
-        to form bigger tokens.
 
-        This makes the output of the diff easier to read as words are
-        not broken up.
-        """
-        tokens = []
-        current_token = ""
+def merge_changes(changes):
+    """
+    Merges adjacent changes which have the same type. This just cleans up the HTML a bit
+    """
+    merged_changes = []
+    current_value = []
+    current_change_type = None
+    for change_type, value in changes:
+        if change_type != current_change_type:
+            if current_change_type is not None:
+                merged_changes.append((current_change_type, ''.join(current_value)))
+                current_value = []
 
-        for c in text:
-            if c.isalnum():
-                current_token += c
-            else:
-                if current_token:
-                    tokens.append(current_token)
-                    current_token = ""
+            current_change_type = change_type
 
-                tokens.append(c)
+        current_value.append(value)
+
+    if current_value:
+        merged_changes.append((current_change_type, ''.join(current_value)))
 
-        if current_token:
-            tokens.append(current_token)
+    return merged_changes
 
-        return tokens
 
+def diff_text(a, b):
+    """
+    Performs a diffing algorithm on two pieces of text. Returns
+    a string of HTML containing the content of both texts with
+    <span> tags inserted indicating where the differences are.
+    """
     a_tok = tokenise(a)
     b_tok = tokenise(b)
-    sm = difflib.SequenceMatcher(lambda t: len(t) <= 4, a_tok, b_tok)
 
-    changes = []
+    # Edits are usually made to a small part of the text, so the tokens the
+    # texts start and end with are matched up front. Only the tokens between
+    # them need to be compared with SequenceMatcher, which takes much longer
+    # than linear time on long texts
+    def is_junk(token):
+        return len(token) <= 4
+
+    prefix = 0
+    max_prefix = min(len(a_tok), len(b_tok))
+    while prefix < max_prefix and a_tok[prefix] == b_tok[prefix]:
+        prefix += 1
+
+    suffix = 0
+    max_suffix = max_prefix - prefix
+    while suffix < max_suffix and a_tok[-suffix - 1] == b_tok[-suffix - 1]:
+        suffix += 1
+
+    # SequenceMatcher only matches junk tokens next to other matching tokens,
+    # so leave a prefix or suffix of only junk tokens for it to decide about
+    if all(is_junk(token) for token in a_tok[:prefix]):
+        prefix = 0
+    if all(is_junk(token) for token in a_tok[len(a_tok) - suffix:]):
+        suffix = 0
 
+    a_mid = a_tok[prefix:len(a_tok) - suffix]
+    b_mid = b_tok[prefix:len(b_tok) - suffix]
+
+    changes = [('equal', token) for token in a_tok[:prefix]]
+
+    sm = difflib.SequenceMatcher(is_junk, a_mid, b_mid)
     for op, i1, i2, j1, j2 in sm.get_opcodes():
         if op == 'replace':
-            for token in a_tok[i1:i2]:
+            for token in a_mid[i1:i2]:
                 changes.append(('deletion', token))
-            for token in b_tok[j1:j2]:
+            for token in b_mid[j1:j2]:
                 changes.append(('addition', token))
         elif op == 'delete':
-            for token in a_tok[i1:i2]:
+            for token in a_mid[i1:i2]:
                 changes.append(('deletion', token))
         elif op == 'insert':
-            for token in b_tok[j1:j2]:
+            for token in b_mid[j1:j2]:
                 changes.append(('addition', token))
         elif op == 'equal':
-            for token in a_tok[i1:i2]:
+            for token in a_mid[i1:i2]:
                 changes.append(('equal', token))
 
-    # Merge ajacent changes which have the same type. This just cleans up the HTML a bit
-    merged_changes = []
-    current_value = []
-    current_change_type = None
-    for change_type, value in changes:
-        if change_type != current_change_type:
-            if current_change_type is not None:
-                merged_changes.append((current_change_type, ''.join(current_value)))
-                current_value = []
-
-            current_change_type = change_type
-
-        current_value.append(value)
-
-    if current_value:
-        merged_changes.append((current_change_type, ''.join(current_value)))
+    changes.extend(('equal', token) for token in a_tok[len(a_tok) - suffix:])
 
-    return TextDiff(merged_changes)
+    return TextDiff(merge_changes(changes))
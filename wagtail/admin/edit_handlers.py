@@ -1,8 +1,11 @@
+import copy
 import re
 
 from django import forms
 from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
 from django.db.models.fields import FieldDoesNotExist
+from django.dispatch import receiver
 from django.forms.formsets import DELETION_FIELD_NAME, ORDERING_FIELD_NAME
 from django.forms.models import fields_for_model
 from django.template.loader import render_to_string
@@ -135,7 +138,10 @@ class EditHandler:
         pass
 
     def bind_to_instance(self, instance=None, form=None, request=None):
-        new = self.bind_to_model(self.model)
+        # This edit handler (and its children) are already bound to the model,
+        # so a shallow copy is enough; binding it to the model again would
+        # rebuild the whole tree of edit handlers below it
+        new = copy.copy(self)
 
         if not instance:
             raise ValueError("EditHandler did not receive an instance object")
@@ -320,28 +326,39 @@ class BaseFormEditHandler(BaseCompositeEditHandler):
     # WagtailAdminModelForm
     base_form_class = None
 
+    # The form class constructed by get_form_class
+    _form_class = None
+
     def get_form_class(self):
         """
         Construct a form class that has all the fields and formsets named in
         the children of this edit handler.
+
+        The form class is only constructed once for each edit handler. As page
+        types cache their edit handler (see ``get_edit_handler``), this is
+        once per page type.
         """
         if not hasattr(self, 'model'):
             raise AttributeError(
                 '%s is not bound to a model yet. Use `.bind_to_model(model)` '
                 'before using this method.' % self.__class__.__name__)
-        # If a custom form class was passed to the EditHandler, use it.
-        # Otherwise, use the base_form_class from the model.
-        # If that is not defined, use WagtailAdminModelForm.
-        model_form_class = getattr(self.model, 'base_form_class',
-                                   WagtailAdminModelForm)
-        base_form_class = self.base_form_class or model_form_class
 
-        return get_form_for_model(
-            self.model,
-            form_class=base_form_class,
-            fields=self.required_fields(),
-            formsets=self.required_formsets(),
-            widgets=self.widget_overrides())
+        if self._form_class is None:
+            # If a custom form class was passed to the EditHandler, use it.
+            # Otherwise, use the base_form_class from the model.
+            # If that is not defined, use WagtailAdminModelForm.
+            model_form_class = getattr(self.model, 'base_form_class',
+                                       WagtailAdminModelForm)
+            base_form_class = self.base_form_class or model_form_class
+
+            self._form_class = get_form_for_model(
+                self.model,
+                form_class=base_form_class,
+                fields=self.required_fields(),
+                formsets=self.required_formsets(),
+                widgets=self.widget_overrides())
+
+        return self._form_class
 
 
 class TabbedInterface(BaseFormEditHandler):
@@ -620,6 +637,9 @@ class PageChooserPanel(BaseChooserPanel):
 
 
 class InlinePanel(EditHandler):
+    # The edit handler returned by get_child_edit_handler
+    _child_edit_handler = None
+
     def __init__(self, relation_name, panels=None, heading='', label='',
                  min_num=None, max_num=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -653,9 +673,12 @@ class InlinePanel(EditHandler):
         )
 
     def get_child_edit_handler(self):
-        panels = self.get_panel_definitions()
-        child_edit_handler = MultiFieldPanel(panels, heading=self.heading)
-        return child_edit_handler.bind_to_model(self.related.related_model)
+        # The same edit handler is bound to the instance of each child form
+        if self._child_edit_handler is None:
+            panels = self.get_panel_definitions()
+            child_edit_handler = MultiFieldPanel(panels, heading=self.heading)
+            self._child_edit_handler = child_edit_handler.bind_to_model(self.related.related_model)
+        return self._child_edit_handler
 
     def required_formsets(self):
         child_edit_handler = self.get_child_edit_handler()
@@ -785,6 +808,10 @@ Page.base_form_class = WagtailAdminPageForm
 def get_edit_handler(cls):
     """
     Get the EditHandler to use in the Wagtail admin when editing this page type.
+
+    The edit handler (and the form class it constructs) is cached for each page
+    type. Use ``clear_edit_handler_cache`` after changing the panels of a page
+    type at runtime.
     """
     if hasattr(cls, 'edit_handler'):
         return cls.edit_handler.bind_to_model(cls)
@@ -807,6 +834,20 @@ def get_edit_handler(cls):
 Page.get_edit_handler = get_edit_handler
 
 
+def clear_edit_handler_cache():
+    """
+    Clear the edit handlers and form classes cached for all page types.
+    """
+    get_edit_handler.clear()
+
+
+@receiver(setting_changed)
+def reset_edit_handler_cache(setting, **kwargs):
+    # Form classes use the rich text editor widgets from these settings
+    if setting == 'WAGTAILADMIN_RICH_TEXT_EDITORS':
+        clear_edit_handler_cache()
+
+
 class StreamFieldPanel(FieldPanel):
     def classes(self):
         classes = super().classes()
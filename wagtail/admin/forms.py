@@ -17,7 +17,7 @@ from taggit.managers import TaggableManager
 from wagtail.admin import widgets
 from wagtail.core.models import (
     BaseViewRestriction, Collection, CollectionViewRestriction, GroupCollectionPermission, Page,
-    PageViewRestriction)
+    PageViewRestriction, invalidate_collection_permissions)
 
 
 class URLOrAbsolutePathValidator(validators.URLValidator):
@@ -481,6 +481,10 @@ class BaseGroupCollectionMemberPermissionFormSet(forms.BaseFormSet):
             for (collection, permission) in permissions_to_add
         ])
 
+        # bulk_create doesn't send the post_save signal
+        if permissions_to_add:
+            invalidate_collection_permissions()
+
     def as_admin_panel(self):
         return render_to_string(
             self.template,
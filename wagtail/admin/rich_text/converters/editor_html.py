@@ -131,15 +131,18 @@ class EditorHTMLConverter:
     @cached_property
     def html_rewriter(self):
         embed_rules = {}
+        bulk_embed_rules = {}
         link_rules = {}
         for rule in self.converter_rules:
             if isinstance(rule, EmbedTypeRule):
                 embed_rules[rule.embed_type] = rule.handler.expand_db_attributes
+                if hasattr(rule.handler, 'expand_db_attributes_many'):
+                    bulk_embed_rules[rule.embed_type] = rule.handler.expand_db_attributes_many
             elif isinstance(rule, LinkTypeRule):
                 link_rules[rule.link_type] = rule.handler.expand_db_attributes
 
         return MultiRuleRewriter([
-            LinkRewriter(link_rules), EmbedRewriter(embed_rules)
+            LinkRewriter(link_rules), EmbedRewriter(embed_rules, bulk_embed_rules)
         ])
 
     def from_database_format(self, html):
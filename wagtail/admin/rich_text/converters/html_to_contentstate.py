@@ -4,7 +4,7 @@ from html.parser import HTMLParser
 from wagtail.admin.rich_text.converters.contentstate_models import (
     Block, ContentState, Entity, EntityRange, InlineStyleRange)
 from wagtail.admin.rich_text.converters.html_ruleset import HTMLRuleset
-from wagtail.core.models import Page
+from wagtail.core.models import Page, Site
 from wagtail.core.rich_text import features as feature_registry
 
 # constants to keep track of what to do with leading whitespace on the next text node we encounter
@@ -26,6 +26,10 @@ class HandlerState:
         self.list_depth = 0
         self.list_item_type = None
 
+        # entities for page links, whose data is filled in once the whole document
+        # has been read (see resolve_page_links)
+        self.page_link_entities = []
+
         # an atomic block which is NOT preceded by a non-atomic block must have a spacer
         # paragraph inserted before it
         # NB This is not included in pushed/popped state, because after a pop() this
@@ -172,7 +176,7 @@ class InlineEntityElementHandler:
         # for get_attribute_data to work with
         attrs = dict(attrs)
 
-        entity = Entity(self.entity_type, self.mutability, self.get_attribute_data(attrs))
+        entity = self.create_entity(name, attrs, state, contentstate)
         key = contentstate.add_entity(entity)
 
         entity_range = EntityRange(key)
@@ -180,6 +184,9 @@ class InlineEntityElementHandler:
         state.current_block.entity_ranges.append(entity_range)
         state.current_entity_ranges.append(entity_range)
 
+    def create_entity(self, name, attrs, state, contentstate):
+        return Entity(self.entity_type, self.mutability, self.get_attribute_data(attrs))
+
     def get_attribute_data(self, attrs):
         """
         Given a dict of attributes found on the source element, return the data dict
@@ -201,18 +208,66 @@ class ExternalLinkElementHandler(LinkElementHandler):
         return {'url': attrs['href']}
 
 
+def get_page_link_data(page_ids):
+    """
+    Return a dict of the entity data for links to each of the given page IDs,
+    looking up all of the pages (and their parents) at once. Pages that do not
+    exist are left out.
+    """
+    page_ids = set(page_ids)
+    if not page_ids:
+        return {}
+
+    pages = list(Page.objects.filter(id__in=page_ids).specific())
+    parent_ids = dict(Page.objects.filter(
+        path__in=[page.path[:-page.steplen] for page in pages]
+    ).values_list('path', 'id'))
+
+    # Find the root paths of the sites once, rather than for each page
+    site_root_paths = Site.get_site_root_paths()
+
+    page_link_data = {}
+    for page in pages:
+        page._wagtail_cached_site_root_paths = site_root_paths
+        page_link_data[page.id] = {
+            'id': page.id,
+            'url': page.url,
+            'parentId': parent_ids.get(page.path[:-page.steplen]),
+        }
+
+    return page_link_data
+
+
+def resolve_page_links(entities):
+    """
+    Fill in the data of page link entities created by PageLinkElementHandler,
+    which only have the ID of the page they link to.
+    """
+    page_link_data = get_page_link_data(entity.data['id'] for entity in entities)
+    for entity in entities:
+        entity.data = page_link_data.get(entity.data['id'], {})
+
+
 class PageLinkElementHandler(LinkElementHandler):
+    def create_entity(self, name, attrs, state, contentstate):
+        try:
+            page_id = int(attrs['id'])
+        except (KeyError, ValueError):
+            return Entity(self.entity_type, self.mutability, {})
+
+        # The rest of the data is filled in by resolve_page_links when the whole
+        # document has been read, so that the linked pages are looked up together
+        entity = Entity(self.entity_type, self.mutability, {'id': page_id})
+        state.page_link_entities.append(entity)
+        return entity
+
     def get_attribute_data(self, attrs):
         try:
-            page = Page.objects.get(id=attrs['id']).specific
-        except Page.DoesNotExist:
+            page_id = int(attrs['id'])
+        except (KeyError, ValueError):
             return {}
 
-        return {
-            'id': page.id,
-            'url': page.url,
-            'parentId': page.get_parent().id,
-        }
+        return get_page_link_data([page_id]).get(page_id, {})
 
 
 class AtomicBlockEntityElementHandler:
@@ -349,3 +404,5 @@ class HtmlToContentStateHandler(HTMLParser):
         if not self.state.has_preceding_nonatomic_block:
             add_paragraph_block(self.state, self.contentstate)
         super().close()
+
+        resolve_page_links(self.state.page_link_entities)
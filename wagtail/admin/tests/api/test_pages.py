@@ -2,6 +2,8 @@ import collections
 import datetime
 import json
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.urls import reverse
 from django.utils import timezone
 
@@ -413,6 +415,41 @@ class TestAdminPageListing(AdminAPITestCase, TestPageListing):
         self.assertTrue(blog_page_seen, "No blog pages were found in the items")
         self.assertTrue(event_page_seen, "No event pages were found in the items")
 
+    # CONDITIONAL GET
+
+    # Not applicable to the admin API
+    test_conditional_get = None
+    test_conditional_get_after_publish = None
+    test_conditional_get_after_unpublish = None
+    test_conditional_get_with_if_modified_since = None
+
+    @override_settings(WAGTAILAPI_CONDITIONAL_GET=True)
+    def test_conditional_get_always_disabled(self):
+        # Drafts change the admin listing without changing any publish dates
+        response = self.get_response()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+        self.assertFalse(response.has_header('Last-Modified'))
+
+    # QUERY COUNT
+
+    def test_related_objects_are_loaded_in_bulk(self):
+        # The status field checks each page for scheduled revisions separately
+        fields = '-status,body,tags,date,feed_image(title),carousel_items(image),related_links'
+
+        # Warm up caches
+        self.get_response(type='demosite.BlogEntryPage', fields=fields)
+
+        with CaptureQueriesContext(connection) as one_page:
+            response = self.get_response(type='demosite.BlogEntryPage', fields=fields, limit=1)
+            self.assertEqual(len(json.loads(response.content.decode('UTF-8'))['items']), 1)
+
+        # The number of queries doesn't depend on the number of pages in the listing
+        with self.assertNumQueries(len(one_page)):
+            response = self.get_response(type='demosite.BlogEntryPage', fields=fields, limit=3)
+            self.assertEqual(len(json.loads(response.content.decode('UTF-8'))['items']), 3)
+
 
 class TestAdminPageDetail(AdminAPITestCase, TestPageDetail):
     fixtures = ['demosite.json']
@@ -420,6 +457,9 @@ class TestAdminPageDetail(AdminAPITestCase, TestPageDetail):
     def get_response(self, page_id, **params):
         return self.client.get(reverse('wagtailadmin_api_v1:pages:detail', args=(page_id, )), params)
 
+    # Not applicable to the admin API
+    test_conditional_get = None
+
     def test_basic(self):
         response = self.get_response(16)
 
@@ -1,12 +1,14 @@
 from __future__ import absolute_import, unicode_literals
 
+import mock
 from django.test import TestCase
 from django.urls import reverse
 from django.utils import timezone
 
+from wagtail.admin.edit_handlers import MultiFieldPanel
 from wagtail.core.models import Page, Site
 from wagtail.tests.benchmark import Benchmark
-from wagtail.tests.testapp.models import SingleEventPage, StreamPage
+from wagtail.tests.testapp.models import EventPage, SingleEventPage, StreamPage
 from wagtail.tests.utils import WagtailTestUtils
 
 
@@ -84,3 +86,38 @@ class BenchPageExplorerWithCustomURLPages(Benchmark, WagtailTestUtils, TestCase)
 
         # Check the URLs were rendered correctly
         self.assertContains(response, 'a href="http:///49/pointless-suffix/"')
+
+
+class BenchPageEditViewWith60Panels(Benchmark, WagtailTestUtils, TestCase):
+    """
+    Renders the edit view of a page type with 60 panels, including inline
+    panels. This will be slow if the edit handler and form class are rebuilt
+    for each request.
+    """
+    fixtures = ['test.json']
+
+    def setUp(self):
+        # Repeat the 15 content panels of EventPage in four sections
+        content_panels = [
+            MultiFieldPanel(EventPage.content_panels, heading="Section {}".format(i + 1))
+            for i in range(4)
+        ]
+        patcher = mock.patch.object(EventPage, 'content_panels', content_panels)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        EventPage.get_edit_handler.cache_clear()
+        self.addCleanup(EventPage.get_edit_handler.cache_clear)
+
+        self.page = EventPage.objects.get(url_path='/home/events/christmas/')
+        self.login()
+
+        # Build anything that is built once per process before the benchmark starts
+        self.client.get(reverse('wagtailadmin_pages:edit', args=(self.page.id, )))
+
+    def bench(self):
+        response = self.client.get(reverse('wagtailadmin_pages:edit', args=(self.page.id, )))
+
+        # Check the response was good
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Section 4")
@@ -1,5 +1,6 @@
 import unittest
 
+import mock
 from django.test import TestCase
 from django.utils.functional import curry
 from django.utils.safestring import SafeText
@@ -187,6 +188,72 @@ class TestStreamFieldComparison(TestCase):
         self.assertEqual(comparison.htmldiff(), '<span class="deletion">Original content</span><span class="addition">doSomethingBad();</span>')
         self.assertIsInstance(comparison.htmldiff(), SafeText)
 
+    def test_blocks_matched_by_id(self):
+        field = StreamPage._meta.get_field('body')
+
+        comparison = self.comparison_class(
+            field,
+            StreamPage(body=StreamValue(field.stream_block, [
+                ('text', "Deleted content", '0'),
+                ('text', "Unchanged content", '1'),
+                ('text', "Original content", '2'),
+            ])),
+            StreamPage(body=StreamValue(field.stream_block, [
+                ('text', "Added content", '3'),
+                ('text', "Modified content", '2'),
+                ('text', "Unchanged content", '1'),
+            ])),
+        )
+
+        self.assertEqual(comparison.htmldiff(), (
+            '<span class="addition">Added content</span>\n'
+            '<span class="deletion">Original</span><span class="addition">Modified</span> content\n'
+            '<span class="deletion">Deleted content</span>\n'
+            'Unchanged content'
+        ))
+        self.assertIsInstance(comparison.htmldiff(), SafeText)
+        self.assertTrue(comparison.has_changed())
+
+    def test_only_changed_blocks_are_diffed(self):
+        field = StreamPage._meta.get_field('body')
+
+        comparison = self.comparison_class(
+            field,
+            StreamPage(body=StreamValue(field.stream_block, [
+                ('text', "Unchanged content", '1'),
+                ('text', "Original content", '2'),
+            ])),
+            StreamPage(body=StreamValue(field.stream_block, [
+                ('text', "Unchanged content", '1'),
+                ('text', "Modified content", '2'),
+            ])),
+        )
+
+        with mock.patch('wagtail.admin.compare.diff_text', wraps=compare.diff_text) as diff_text:
+            comparison.htmldiff()
+
+        diff_text.assert_called_once_with("Original content", "Modified content")
+
+    def test_blocks_matched_by_id_lazy(self):
+        field = StreamPage._meta.get_field('body')
+
+        comparison = self.comparison_class(
+            field,
+            StreamPage(body=StreamValue(field.stream_block, [
+                {'type': 'text', 'value': "Unchanged content", 'id': '1'},
+                {'type': 'text', 'value': "Original content", 'id': '2'},
+            ], is_lazy=True)),
+            StreamPage(body=StreamValue(field.stream_block, [
+                {'type': 'text', 'value': "Modified content", 'id': '2'},
+                {'type': 'text', 'value': "Unchanged content", 'id': '1'},
+            ], is_lazy=True)),
+        )
+
+        self.assertEqual(comparison.htmldiff(), (
+            '<span class="deletion">Original</span><span class="addition">Modified</span> content\n'
+            'Unchanged content'
+        ))
+
 
 class TestChoiceFieldComparison(TestCase):
     comparison_class = compare.ChoiceFieldComparison
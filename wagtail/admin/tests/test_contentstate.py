@@ -4,6 +4,7 @@ from django.test import TestCase
 from mock import patch
 
 from wagtail.admin.rich_text.converters.contentstate import ContentstateConverter
+from wagtail.core.models import Site
 from wagtail.embeds.models import Embed
 
 
@@ -315,6 +316,28 @@ class TestHtmlToContentState(TestCase):
             ]
         })
 
+    def test_multiple_page_links(self):
+        converter = ContentstateConverter(features=['link'])
+        html = ''.join(
+            '<p><a linktype="page" id="%d">link</a></p>' % page_id
+            for page_id in [4, 5, 6, 4, 9999]
+        )
+
+        Site.get_site_root_paths()
+
+        # The pages (one query for each page type), their parents and the
+        # site root paths are each looked up once
+        with self.assertNumQueries(4):
+            result = json.loads(converter.from_database_format(html))
+
+        self.assertEqual([entity['data'] for key, entity in sorted(result['entityMap'].items())], [
+            {'id': 4, 'url': '/events/christmas/', 'parentId': 3},
+            {'id': 5, 'url': '/events/tentative-unpublished-event/', 'parentId': 3},
+            {'id': 6, 'url': '/events/someone-elses-event/', 'parentId': 3},
+            {'id': 4, 'url': '/events/christmas/', 'parentId': 3},
+            {},
+        ])
+
     def test_broken_page_link(self):
         converter = ContentstateConverter(features=['link'])
         result = json.loads(converter.from_database_format(
@@ -9,7 +9,8 @@ from django.test import RequestFactory, TestCase, override_settings
 
 from wagtail.admin.edit_handlers import (
     FieldPanel, FieldRowPanel, InlinePanel, ObjectList, PageChooserPanel, RichTextFieldPanel,
-    TabbedInterface, extract_panel_definitions_from_model_class, get_form_for_model)
+    TabbedInterface, clear_edit_handler_cache, extract_panel_definitions_from_model_class,
+    get_form_for_model)
 from wagtail.admin.forms import WagtailAdminModelForm, WagtailAdminPageForm
 from wagtail.admin.rich_text import DraftailRichTextArea
 from wagtail.admin.widgets import AdminAutoHeightTextInput, AdminDateInput, AdminPageChooser
@@ -196,6 +197,49 @@ class TestPageEditHandlers(TestCase):
             errors = ValidatedPage.check()
             self.assertEqual(errors, [])
 
+    def test_form_class_is_cached(self):
+        EventPage.get_edit_handler.cache_clear()
+        self.addCleanup(EventPage.get_edit_handler.cache_clear)
+
+        edit_handler = EventPage.get_edit_handler()
+        form_class = edit_handler.get_form_class()
+
+        # The edit handler and its form class are reused for each page
+        self.assertIs(EventPage.get_edit_handler(), edit_handler)
+        self.assertIs(EventPage.get_edit_handler().get_form_class(), form_class)
+
+        # and edit handlers bound to a page use the same form class
+        event_page = EventPage(title="Event")
+        bound_handler = edit_handler.bind_to_instance(
+            instance=event_page, form=form_class(instance=event_page), request=RequestFactory().get('/'))
+        self.assertIs(bound_handler.get_form_class(), form_class)
+
+        # Only the bound copy of the edit handler has the instance
+        self.assertFalse(hasattr(edit_handler, 'instance'))
+
+    def test_clear_edit_handler_cache(self):
+        self.addCleanup(clear_edit_handler_cache)
+
+        edit_handler = EventPage.get_edit_handler()
+        form_class = edit_handler.get_form_class()
+
+        with mock.patch.object(EventPage, 'content_panels', [FieldPanel('title')]):
+            clear_edit_handler_cache()
+
+            new_form_class = EventPage.get_edit_handler().get_form_class()
+            self.assertIsNot(new_form_class, form_class)
+            self.assertNotIn('date_from', new_form_class.base_fields)
+
+    def test_rich_text_editor_setting_change_clears_cache(self):
+        self.addCleanup(clear_edit_handler_cache)
+
+        edit_handler = EventPage.get_edit_handler()
+
+        with self.settings(WAGTAILADMIN_RICH_TEXT_EDITORS={
+            'default': {'WIDGET': 'wagtail.admin.rich_text.HalloRichTextArea'}
+        }):
+            self.assertIsNot(EventPage.get_edit_handler(), edit_handler)
+
 
 class TestExtractPanelDefinitionsFromModelClass(TestCase):
     def test_can_extract_panel_property(self):
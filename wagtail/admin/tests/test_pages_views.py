@@ -4084,6 +4084,44 @@ class TestCompareRevisions(TestCase, WagtailTestUtils):
 
         self.assertContains(response, '<span class="deletion">Last Christmas I gave you my heart, but the very next day you gave it away</span><span class="addition">This year, to save me from tears, I&#39;ll just feed it to the dog</span>')
 
+    def test_compare_revisions_is_cached(self):
+        compare_url = reverse(
+            'wagtailadmin_pages:revisions_compare',
+            args=(self.christmas_event.id, self.last_christmas_revision.id, self.this_christmas_revision.id)
+        )
+        self.client.get(compare_url)
+
+        with mock.patch('wagtail.admin.compare.RichTextFieldComparison.htmldiff', autospec=True) as htmldiff:
+            response = self.client.get(compare_url)
+
+        self.assertFalse(htmldiff.called)
+        self.assertContains(response, '<span class="deletion">Last Christmas I gave you my heart, but the very next day you gave it away</span><span class="addition">This year, to save me from tears, I&#39;ll give it to someone special</span>')
+
+    def test_compare_revisions_live_is_not_cached(self):
+        compare_url = reverse(
+            'wagtailadmin_pages:revisions_compare',
+            args=(self.christmas_event.id, self.last_christmas_revision.id, 'live')
+        )
+        self.client.get(compare_url)
+
+        with mock.patch('wagtail.admin.compare.RichTextFieldComparison.htmldiff', autospec=True, return_value='') as htmldiff:
+            self.client.get(compare_url)
+
+        self.assertTrue(htmldiff.called)
+
+    @override_settings(WAGTAILADMIN_REVISION_COMPARISON_CACHE_TIMEOUT=0)
+    def test_compare_revisions_cache_disabled(self):
+        compare_url = reverse(
+            'wagtailadmin_pages:revisions_compare',
+            args=(self.christmas_event.id, self.last_christmas_revision.id, self.this_christmas_revision.id)
+        )
+        self.client.get(compare_url)
+
+        with mock.patch('wagtail.admin.compare.RichTextFieldComparison.htmldiff', autospec=True, return_value='') as htmldiff:
+            self.client.get(compare_url)
+
+        self.assertTrue(htmldiff.called)
+
 
 class TestCompareRevisionsWithNonModelField(TestCase, WagtailTestUtils):
     """
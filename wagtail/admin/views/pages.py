@@ -1,5 +1,6 @@
 from time import time
 
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import PermissionDenied
 from django.db.models import Count
@@ -1107,16 +1108,18 @@ def revisions_compare(request, page_id, revision_id_a, revision_id_b):
 
         revision_a = page
         revision_a_heading = _("Live")
+        cache_revision_a = None
     elif revision_id_a == 'earliest':
-        revision_a = page.revisions.order_by('created_at', 'id').first()
-        if revision_a:
-            revision_a = revision_a.as_page_object()
+        cache_revision_a = page.revisions.order_by('created_at', 'id').first()
+        if cache_revision_a:
+            revision_a = cache_revision_a.as_page_object()
             revision_a_heading = _("Earliest")
         else:
             raise Http404
     else:
-        revision_a = get_object_or_404(page.revisions, id=revision_id_a).as_page_object()
-        revision_a_heading = str(get_object_or_404(page.revisions, id=revision_id_a).created_at)
+        cache_revision_a = get_object_or_404(page.revisions, id=revision_id_a)
+        revision_a = cache_revision_a.as_page_object()
+        revision_a_heading = str(cache_revision_a.created_at)
 
     # Get revision to compare to
     if revision_id_b == 'live':
@@ -1125,21 +1128,32 @@ def revisions_compare(request, page_id, revision_id_a, revision_id_b):
 
         revision_b = page
         revision_b_heading = _("Live")
+        cache_revision_b = None
     elif revision_id_b == 'latest':
-        revision_b = page.revisions.order_by('created_at', 'id').last()
-        if revision_b:
-            revision_b = revision_b.as_page_object()
+        cache_revision_b = page.revisions.order_by('created_at', 'id').last()
+        if cache_revision_b:
+            revision_b = cache_revision_b.as_page_object()
             revision_b_heading = _("Latest")
         else:
             raise Http404
     else:
-        revision_b = get_object_or_404(page.revisions, id=revision_id_b).as_page_object()
-        revision_b_heading = str(get_object_or_404(page.revisions, id=revision_id_b).created_at)
+        cache_revision_b = get_object_or_404(page.revisions, id=revision_id_b)
+        revision_b = cache_revision_b.as_page_object()
+        revision_b_heading = str(cache_revision_b.created_at)
 
     comparison = page.get_edit_handler().get_comparison()
     comparison = [comp(revision_a, revision_b) for comp in comparison]
     comparison = [comp for comp in comparison if comp.has_changed()]
 
+    # The content of revisions doesn't change, so the comparison of two of
+    # them is cached. The live page can change at any time, so comparisons
+    # with it aren't
+    comparison_cache_timeout = getattr(settings, 'WAGTAILADMIN_REVISION_COMPARISON_CACHE_TIMEOUT', 3600)
+    if cache_revision_a and cache_revision_b and comparison_cache_timeout:
+        comparison_cache_key = '%d:%d' % (cache_revision_a.id, cache_revision_b.id)
+    else:
+        comparison_cache_key = None
+
     return render(request, 'wagtailadmin/pages/revisions/compare.html', {
         'page': page,
         'revision_a_heading': revision_a_heading,
@@ -1147,6 +1161,8 @@ def revisions_compare(request, page_id, revision_id_a, revision_id_b):
         'revision_b_heading': revision_b_heading,
         'revision_b': revision_b,
         'comparison': comparison,
+        'comparison_cache_timeout': comparison_cache_timeout,
+        'comparison_cache_key': comparison_cache_key,
     })
 
 
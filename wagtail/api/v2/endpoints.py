@@ -1,7 +1,10 @@
 from collections import OrderedDict
+from functools import lru_cache
 
+from django.conf import settings
 from django.conf.urls import url
 from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count, Max, QuerySet
 from django.http import Http404
 from django.shortcuts import redirect
 from django.urls import reverse
@@ -13,6 +16,7 @@ from rest_framework.viewsets import GenericViewSet
 
 from wagtail.api import APIField
 from wagtail.core.models import Page
+from wagtail.core.utils import get_not_modified_response, make_etag, set_validator_headers
 
 from .filters import (
     FieldsFilter, OrderingFilter, RestrictedChildOfFilter, RestrictedDescendantOfFilter,
@@ -23,6 +27,19 @@ from .utils import (
     BadRequestError, filter_page_type, get_object_detail_url, page_models_from_string,
     parse_fields_parameter)
 
+# Maximum number of serializer classes that are kept for reuse. There is a
+# serializer class for each combination of model and "fields" parameter
+SERIALIZER_CLASS_CACHE_SIZE = 1000
+
+
+def _freeze_fields_config(fields_config):
+    # Convert the output of parse_fields_parameter into nested tuples so it
+    # can be used as a cache key
+    return tuple(
+        (field_name, negated, _freeze_fields_config(sub_fields) if sub_fields else None)
+        for field_name, negated, sub_fields in fields_config
+    )
+
 
 class BaseAPIEndpoint(GenericViewSet):
     renderer_classes = [JSONRenderer, BrowsableAPIRenderer]
@@ -35,6 +52,8 @@ class BaseAPIEndpoint(GenericViewSet):
     known_query_parameters = frozenset([
         'limit',
         'offset',
+        'after',
+        'total_count',
         'fields',
         'order',
         'search',
@@ -69,14 +88,34 @@ class BaseAPIEndpoint(GenericViewSet):
         queryset = self.get_queryset()
         self.check_query_parameters(queryset)
         queryset = self.filter_queryset(queryset)
-        queryset = self.paginate_queryset(queryset)
-        serializer = self.get_serializer(queryset, many=True)
-        return self.get_paginated_response(serializer.data)
+
+        etag, last_modified = self.get_listing_validators(queryset)
+        response = get_not_modified_response(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        objects = list(self.paginate_queryset(queryset))
+        serializer = self.get_serializer(objects, many=True)
+
+        # Load related objects for the whole page of results at once
+        serializer.child.prepare_objects(objects)
+
+        response = self.get_paginated_response(serializer.data)
+        set_validator_headers(response, etag, last_modified)
+        return response
 
     def detail_view(self, request, pk):
         instance = self.get_object()
+
+        etag, last_modified = self.get_detail_validators(instance)
+        response = get_not_modified_response(request, etag, last_modified)
+        if response is not None:
+            return response
+
         serializer = self.get_serializer(instance)
-        return Response(serializer.data)
+        response = Response(serializer.data)
+        set_validator_headers(response, etag, last_modified)
+        return response
 
     def find_view(self, request):
         queryset = self.get_queryset()
@@ -106,6 +145,27 @@ class BaseAPIEndpoint(GenericViewSet):
         if 'id' in request.GET:
             return queryset.get(id=request.GET['id'])
 
+    def conditional_get_enabled(self):
+        return getattr(settings, 'WAGTAILAPI_CONDITIONAL_GET', False)
+
+    def get_listing_validators(self, queryset):
+        """
+        Returns an (etag, last_modified) tuple describing the listing of the
+        given (filtered) queryset, used to answer conditional requests without
+        serializing the listing. Either value may be None.
+
+        Override this in endpoints whose objects record when they change.
+        """
+        return None, None
+
+    def get_detail_validators(self, instance):
+        """
+        Returns an (etag, last_modified) tuple describing the given object, used
+        to answer conditional requests without serializing the object. Either
+        value may be None.
+        """
+        return None, None
+
     def handle_exception(self, exc):
         if isinstance(exc, Http404):
             data = {'message': str(exc)}
@@ -290,6 +350,13 @@ class BaseAPIEndpoint(GenericViewSet):
             base=cls.base_serializer_class
         )
 
+    @classmethod
+    @lru_cache(maxsize=SERIALIZER_CLASS_CACHE_SIZE)
+    def _get_cached_serializer_class(cls, router, model, fields_config, show_details=False):
+        # Building serializer classes is slow, and DRF has to introspect the
+        # model each time a new class is used, so keep them between requests
+        return cls._get_serializer_class(router, model, fields_config, show_details=show_details)
+
     def get_serializer_class(self):
         request = self.request
 
@@ -315,7 +382,9 @@ class BaseAPIEndpoint(GenericViewSet):
         else:
             show_details = True
 
-        return self._get_serializer_class(self.request.wagtailapi_router, model, fields_config, show_details=show_details)
+        return self._get_cached_serializer_class(
+            self.request.wagtailapi_router, model, _freeze_fields_config(fields_config), show_details=show_details
+        )
 
     def get_serializer_context(self):
         """
@@ -437,6 +506,39 @@ class PagesAPIEndpoint(BaseAPIEndpoint):
         base = super().get_object()
         return base.specific
 
+    def get_listing_validators(self, queryset):
+        if not self.conditional_get_enabled() or not isinstance(queryset, QuerySet):
+            return None, None
+
+        # Publishing a page changes the latest publish time and revision, and
+        # unpublishing one changes the count
+        aggregates = queryset.order_by().aggregate(
+            count=Count('pk'),
+            last_published_at=Max('last_published_at'),
+            live_revision_id=Max('live_revision_id'),
+        )
+        etag = make_etag(
+            aggregates['count'],
+            aggregates['last_published_at'],
+            aggregates['live_revision_id'],
+            self.request.get_full_path(),
+            self.request.accepted_renderer.format,
+        )
+        return etag, aggregates['last_published_at']
+
+    def get_detail_validators(self, instance):
+        if not self.conditional_get_enabled():
+            return None, None
+
+        etag = make_etag(
+            instance.pk,
+            instance.live_revision_id,
+            instance.last_published_at,
+            self.request.get_full_path(),
+            self.request.accepted_renderer.format,
+        )
+        return etag, instance.last_published_at
+
     def find_object(self, queryset, request):
         if 'html_path' in request.GET and request.site is not None:
             path = request.GET['html_path']
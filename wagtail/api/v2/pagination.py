@@ -1,10 +1,151 @@
+import base64
+import binascii
+import datetime
+import json
 from collections import OrderedDict
 
 from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q, QuerySet
 from rest_framework.pagination import BasePagination
 from rest_framework.response import Response
 
-from .utils import BadRequestError
+from .utils import BadRequestError, parse_boolean
+
+
+class CursorJSONEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        # DjangoJSONEncoder drops microseconds, but they are needed to find
+        # the position exactly
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+
+        return super().default(o)
+
+
+def get_cursor_ordering(queryset):
+    """
+    Returns the ordering of the queryset as a list of (field_name, descending)
+    tuples that ends with the primary key, so each object has a unique position
+    """
+    if not isinstance(queryset, QuerySet):
+        raise BadRequestError("after cannot be used with search")
+
+    query = queryset.query
+    pk_name = queryset.model._meta.pk.name
+
+    if query.order_by:
+        ordering = query.order_by
+    elif query.default_ordering:
+        ordering = query.get_meta().ordering
+    else:
+        ordering = []
+
+    cursor_ordering = []
+    for field_name in ordering:
+        if not isinstance(field_name, str) or field_name == '?' or '__' in field_name:
+            raise BadRequestError("after cannot be used with this ordering")
+
+        descending = field_name.startswith('-')
+        field_name = field_name.lstrip('-')
+        if field_name == 'pk':
+            field_name = pk_name
+
+        if not query.standard_ordering:
+            # The queryset has been reversed
+            descending = not descending
+
+        cursor_ordering.append((field_name, descending))
+
+        # Fields after the primary key make no difference to the ordering
+        if field_name == pk_name:
+            break
+    else:
+        cursor_ordering.append((pk_name, not query.standard_ordering))
+
+    return cursor_ordering
+
+
+def encode_cursor(cursor_ordering, obj):
+    cursor = {
+        'o': [field_name for field_name, descending in cursor_ordering],
+        'v': [obj.serializable_value(field_name) for field_name, descending in cursor_ordering],
+    }
+    return base64.urlsafe_b64encode(json.dumps(cursor, cls=CursorJSONEncoder).encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor_ordering, cursor):
+    try:
+        cursor = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+        field_names, values = cursor['o'], cursor['v']
+    except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError):
+        raise BadRequestError("after must be a cursor returned in next_cursor")
+
+    if field_names != [field_name for field_name, descending in cursor_ordering]:
+        raise BadRequestError("after was returned for a different ordering")
+
+    return values
+
+
+def is_nullable(model, field_name):
+    try:
+        return model._meta.get_field(field_name).null
+    except FieldDoesNotExist:
+        return False
+
+
+def order_by_cursor(queryset, cursor_ordering):
+    """
+    Orders the queryset by the given fields. Empty values of nullable fields
+    are put last in ascending order (and first in descending order) on all
+    databases, to match filter_after_cursor
+    """
+    order_by = []
+    for field_name, descending in cursor_ordering:
+        if is_nullable(queryset.model, field_name):
+            if descending:
+                order_by.append(F(field_name).desc(nulls_first=True))
+            else:
+                order_by.append(F(field_name).asc(nulls_last=True))
+        else:
+            order_by.append(('-' if descending else '') + field_name)
+
+    queryset = queryset.order_by(*order_by)
+
+    if not queryset.query.standard_ordering:
+        # The directions above already take the reversal into account
+        queryset = queryset.reverse()
+
+    return queryset
+
+
+def filter_after_cursor(queryset, cursor_ordering, values):
+    """
+    Filters the queryset to the objects that come after the given values of
+    the ordering fields. For ordering (a, b, pk) this is:
+    a > x OR (a = x AND b > y) OR (a = x AND b = y AND pk > z)
+    """
+    q = Q()
+    equal_q = Q()
+    for (field_name, descending), value in zip(cursor_ordering, values):
+        if value is None:
+            # Only non-empty values come after an empty value, in descending order
+            if descending:
+                q |= equal_q & Q(**{field_name + '__isnull': False})
+
+            equal_q &= Q(**{field_name + '__isnull': True})
+        else:
+            after_q = Q(**{field_name + ('__lt' if descending else '__gt'): value})
+
+            # Empty values come after all others in ascending order
+            if not descending and is_nullable(queryset.model, field_name):
+                after_q |= Q(**{field_name + '__isnull': True})
+
+            q |= equal_q & after_q
+            equal_q &= Q(**{field_name: value})
+
+    return queryset.filter(q)
 
 
 class WagtailPagination(BasePagination):
@@ -30,18 +171,57 @@ class WagtailPagination(BasePagination):
             raise BadRequestError(
                 "limit cannot be higher than %d" % limit_max)
 
+        try:
+            with_total_count = parse_boolean(request.GET.get('total_count', 'true'))
+        except ValueError as e:
+            raise BadRequestError("total_count must be a boolean: %s" % str(e))
+
+        self.view = view
+        self.total_count = queryset.count() if with_total_count else None
+
+        if 'after' in request.GET:
+            # Cursor pagination. The position is taken from the ordering
+            # values of the last object on the previous page, so the database
+            # doesn't have to skip over all the objects before it
+            if 'offset' in request.GET:
+                raise BadRequestError("offset and after cannot be used together")
+
+            self.cursor_ordering = get_cursor_ordering(queryset)
+
+            # Make sure ties between the other ordering fields are always
+            # broken by the primary key
+            queryset = order_by_cursor(queryset, self.cursor_ordering)
+
+            if request.GET['after']:
+                values = decode_cursor(self.cursor_ordering, request.GET['after'])
+                queryset = filter_after_cursor(queryset, self.cursor_ordering, values)
+
+            results = list(queryset[:limit])
+
+            # A short page means there are no more objects
+            if results and len(results) == limit:
+                self.next_cursor = encode_cursor(self.cursor_ordering, results[-1])
+            else:
+                self.next_cursor = None
+
+            return results
+
+        self.cursor_ordering = None
+
         start = offset
         stop = offset + limit
 
-        self.view = view
-        self.total_count = queryset.count()
         return queryset[start:stop]
 
     def get_paginated_response(self, data):
+        meta = OrderedDict()
+        if self.total_count is not None:
+            meta['total_count'] = self.total_count
+        if self.cursor_ordering is not None:
+            meta['next_cursor'] = self.next_cursor
+
         data = OrderedDict([
-            ('meta', OrderedDict([
-                ('total_count', self.total_count),
-            ])),
+            ('meta', meta),
             ('items', data),
         ])
         return Response(data)
@@ -1,6 +1,11 @@
+import copy
 from collections import OrderedDict
+from functools import lru_cache
 
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import prefetch_related_objects
 from django.urls.exceptions import NoReverseMatch
+from django.utils.functional import cached_property
 from modelcluster.models import get_all_child_relations
 from rest_framework import relations, serializers
 from rest_framework.fields import Field, SkipField
@@ -59,7 +64,8 @@ class PageHtmlUrlField(Field):
 
     def to_representation(self, page):
         try:
-            return page.full_url
+            # Passing the request lets all pages share the same copy of the site root paths
+            return page.get_full_url(request=self.context.get('request'))
         except NoReverseMatch:
             return None
 
@@ -102,9 +108,13 @@ class RelatedField(relations.RelatedField):
         self.serializer_class = kwargs.pop('serializer_class')
         super().__init__(*args, **kwargs)
 
+    @cached_property
+    def serializer(self):
+        # Shared by all the objects serialized through this field
+        return self.serializer_class(context=self.context)
+
     def to_representation(self, value):
-        serializer = self.serializer_class(context=self.context)
-        return serializer.to_representation(value)
+        return self.serializer.to_representation(value)
 
 
 class PageParentField(relations.RelatedField):
@@ -117,14 +127,33 @@ class PageParentField(relations.RelatedField):
     The representation is the same as the RelatedField class.
     """
     def get_attribute(self, instance):
+        parents = getattr(self, '_parents', None)
+        if parents is not None and instance.pk in parents:
+            return parents[instance.pk]
+
         parent = instance.get_parent()
 
         site_pages = pages_for_site(self.context['request'].site)
         if site_pages.filter(id=parent.id).exists():
             return parent
 
+    def prepare_objects(self, pages):
+        # Find the parents of all pages with one query. The path of a page's
+        # parent is the page's path without its last step
+        parent_paths = {page.pk: page.path[:-page.steplen] for page in pages}
+        site_pages = pages_for_site(self.context['request'].site)
+        parents_by_path = {
+            parent.path: parent
+            for parent in site_pages.filter(path__in=set(parent_paths.values()))
+        }
+
+        self._parents = {
+            page_pk: parents_by_path.get(parent_path)
+            for page_pk, parent_path in parent_paths.items()
+        }
+
     def to_representation(self, value):
-        serializer_class = get_serializer_class(value.__class__, ['id', 'type', 'detail_url', 'html_url', 'title'], meta_fields=['type', 'detail_url', 'html_url'], base=PageSerializer)
+        serializer_class = get_parent_serializer_class(value.__class__)
         serializer = serializer_class(context=self.context)
         return serializer.to_representation(value)
 
@@ -171,11 +200,14 @@ class ChildRelationField(Field):
         self.serializer_class = kwargs.pop('serializer_class')
         super().__init__(*args, **kwargs)
 
-    def to_representation(self, value):
-        serializer = self.serializer_class(context=self.context)
+    @cached_property
+    def serializer(self):
+        # Shared by all the objects serialized through this field
+        return self.serializer_class(context=self.context)
 
+    def to_representation(self, value):
         return [
-            serializer.to_representation(child_object)
+            self.serializer.to_representation(child_object)
             for child_object in value.all()
         ]
 
@@ -219,6 +251,21 @@ class StreamField(Field):
         return value.stream_block.get_api_representation(value, self.context)
 
 
+def get_tagged_items_accessor_name(through):
+    """
+    Returns the name of the relation from the tagged objects to the given
+    "through" model of a TaggableManager, or None if it isn't a foreign key
+    (such as when using taggit's generic TaggedItem model)
+    """
+    try:
+        content_object = through._meta.get_field('content_object')
+    except FieldDoesNotExist:
+        return None
+
+    if content_object.many_to_one and content_object.remote_field is not None:
+        return content_object.remote_field.get_accessor_name()
+
+
 class TagsField(Field):
     """
     Serializes django-taggit TaggableManager fields.
@@ -232,6 +279,12 @@ class TagsField(Field):
     "tags": ["bird", "wagtail"]
     """
     def to_representation(self, value):
+        accessor_name = get_tagged_items_accessor_name(value.through)
+        prefetched_objects = getattr(value.instance, '_prefetched_objects_cache', {})
+        if accessor_name in prefetched_objects:
+            # The tags were loaded with the other objects in the listing
+            return sorted(tagged_item.tag.name for tagged_item in prefetched_objects[accessor_name])
+
         return list(value.all().order_by('name').values_list('name', flat=True))
 
 
@@ -247,6 +300,56 @@ class BaseSerializer(serializers.ModelSerializer):
     type = TypeField(read_only=True)
     detail_url = DetailUrlField(read_only=True)
 
+    def get_fields(self):
+        # Building the fields requires introspecting the model. As serializer
+        # classes are reused between requests, only do this once per class
+        # and give each serializer its own copy
+        cls = type(self)
+        if '_field_plan' not in cls.__dict__:
+            cls._field_plan = super().get_fields()
+
+        return copy.deepcopy(cls._field_plan)
+
+    def get_prefetch_lookups(self):
+        """
+        Returns the prefetch_related lookups needed to serialize the related
+        objects of many instances at once, including those of nested serializers
+        """
+        lookups = []
+
+        for field in self.fields.values():
+            if field.source == '*' or '.' in field.source:
+                continue
+
+            if isinstance(field, (RelatedField, ChildRelationField)):
+                lookups.append(field.source)
+                lookups.extend(
+                    field.source + '__' + lookup
+                    for lookup in field.serializer.get_prefetch_lookups()
+                )
+            elif isinstance(field, TagsField):
+                # Taggable managers don't use prefetched tags, so prefetch the
+                # "through" objects and their tags instead
+                through = self.Meta.model._meta.get_field(field.source).through
+                accessor_name = get_tagged_items_accessor_name(through)
+                if accessor_name:
+                    lookups.append(accessor_name + '__tag')
+
+        return lookups
+
+    def prepare_objects(self, objects):
+        """
+        Loads the data needed to serialize a list of objects in bulk, so it
+        doesn't have to be fetched for each object separately
+        """
+        lookups = self.get_prefetch_lookups()
+        if lookups:
+            prefetch_related_objects(objects, *lookups)
+
+        for field in self.fields.values():
+            if hasattr(field, 'prepare_objects'):
+                field.prepare_objects(objects)
+
     def to_representation(self, instance):
         data = OrderedDict()
         fields = [field for field in self.fields.values() if not field.write_only]
@@ -345,3 +448,8 @@ def get_serializer_class(model, field_names, meta_fields, field_serializer_overr
         attrs.update(field_serializer_overrides)
 
     return type(str(model_.__name__ + 'Serializer'), (base, ), attrs)
+
+
+@lru_cache()
+def get_parent_serializer_class(model):
+    return get_serializer_class(model, ['id', 'type', 'detail_url', 'html_url', 'title'], meta_fields=['type', 'detail_url', 'html_url'], base=PageSerializer)
@@ -1,7 +1,7 @@
 from django.db.models.signals import post_delete, post_save
 from django.urls import reverse
 
-from wagtail.contrib.frontend_cache.utils import purge_url_from_cache
+from wagtail.contrib.frontend_cache.utils import queue_urls_for_purge
 from wagtail.core.models import get_page_models
 from wagtail.core.signals import page_published, page_unpublished
 from wagtail.documents.models import get_document_model
@@ -12,19 +12,19 @@ from .utils import get_base_url
 
 def purge_page_from_cache(instance, **kwargs):
     base_url = get_base_url()
-    purge_url_from_cache(base_url + reverse('wagtailapi_v2:pages:detail', args=(instance.id, )))
+    queue_urls_for_purge([base_url + reverse('wagtailapi_v2:pages:detail', args=(instance.id, ))])
 
 
 def purge_image_from_cache(instance, **kwargs):
     if not kwargs.get('created', False):
         base_url = get_base_url()
-        purge_url_from_cache(base_url + reverse('wagtailapi_v2:images:detail', args=(instance.id, )))
+        queue_urls_for_purge([base_url + reverse('wagtailapi_v2:images:detail', args=(instance.id, ))])
 
 
 def purge_document_from_cache(instance, **kwargs):
     if not kwargs.get('created', False):
         base_url = get_base_url()
-        purge_url_from_cache(base_url + reverse('wagtailapi_v2:documents:detail', args=(instance.id, )))
+        queue_urls_for_purge([base_url + reverse('wagtailapi_v2:documents:detail', args=(instance.id, ))])
 
 
 def register_signal_handlers():
@@ -0,0 +1,31 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from wagtail.tests.benchmark import Benchmark
+
+
+class BenchPagesListingRequests(Benchmark, TestCase):
+    """
+    Makes 100 requests to the pages listing, with a few different field
+    configurations. Most of the time spent outside the database is in
+    building and introspecting serializer classes.
+    """
+    fixtures = ['demosite.json']
+
+    def bench(self):
+        for i in range(25):
+            for fields in ['title', 'title,slug', '*', '_,id,title']:
+                response = self.client.get(reverse('wagtailapi_v2:pages:listing'), {'fields': fields, 'limit': 5})
+                assert response.status_code == 200
+
+
+class BenchPageDetailRequests(Benchmark, TestCase):
+    """
+    Makes 100 requests to a page's detail view
+    """
+    fixtures = ['demosite.json']
+
+    def bench(self):
+        for i in range(100):
+            response = self.client.get(reverse('wagtailapi_v2:pages:detail', args=(16, )))
+            assert response.status_code == 200
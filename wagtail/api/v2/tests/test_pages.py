@@ -1,15 +1,20 @@
 import collections
+import datetime
 import json
 
 import mock
+from django.db import connection
 from django.test import TestCase
-from django.test.utils import override_settings
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.urls import reverse
+from django.utils.timezone import utc
 
 from wagtail.api.v2 import signal_handlers
+from wagtail.api.v2.endpoints import PagesAPIEndpoint, _freeze_fields_config
 from wagtail.core.models import Page, Site
 from wagtail.tests.demosite import models
 from wagtail.tests.testapp.models import StreamPage
+from wagtail.tests.urls import api_router
 
 
 def get_total_page_count():
@@ -686,6 +691,125 @@ class TestPageListing(TestCase):
         self.assertEqual(content, {'message': "offset must be a positive integer"})
 
 
+    # AFTER (CURSOR PAGINATION)
+
+    def walk_with_cursor(self, **params):
+        page_id_list = []
+        after = ''
+
+        while after is not None:
+            response = self.get_response(after=after, **params)
+            self.assertEqual(response.status_code, 200)
+            content = json.loads(response.content.decode('UTF-8'))
+
+            page_id_list.extend(self.get_page_id_list(content))
+            after = content['meta']['next_cursor']
+
+        return page_id_list
+
+    def test_after_walks_all_pages(self):
+        all_page_id_list = self.get_page_id_list(json.loads(self.get_response().content.decode('UTF-8')))
+
+        self.assertEqual(self.walk_with_cursor(limit=3), all_page_id_list)
+
+    def test_after_with_order(self):
+        for order in ['title', '-title', 'id', '-id', 'first_published_at']:
+            ordered_page_id_list = self.get_page_id_list(
+                json.loads(self.get_response(order=order).content.decode('UTF-8'))
+            )
+
+            page_id_list = self.walk_with_cursor(order=order, limit=2)
+            self.assertEqual(page_id_list, ordered_page_id_list)
+
+    def test_after_with_empty_values(self):
+        # Only two pages have a first_published_at date
+        Page.objects.filter(id=16).update(first_published_at=datetime.datetime(2018, 1, 1, 10, 0, 0, 123456, tzinfo=utc))
+        Page.objects.filter(id=18).update(first_published_at=datetime.datetime(2018, 1, 1, 10, 0, 0, 123457, tzinfo=utc))
+        all_page_id_list = self.get_page_id_list(json.loads(self.get_response().content.decode('UTF-8')))
+
+        # Empty values come last in ascending order
+        page_id_list = self.walk_with_cursor(order='first_published_at', limit=2)
+        self.assertEqual(page_id_list[:2], [16, 18])
+        self.assertEqual(sorted(page_id_list), sorted(all_page_id_list))
+
+        # And first in descending order
+        page_id_list = self.walk_with_cursor(order='-first_published_at', limit=2)
+        self.assertEqual(page_id_list[-2:], [18, 16])
+        self.assertEqual(sorted(page_id_list), sorted(all_page_id_list))
+
+    def test_after_with_filter(self):
+        page_id_list = self.walk_with_cursor(type='demosite.BlogEntryPage', limit=1)
+
+        self.assertEqual(set(page_id_list), set([16, 18, 19]))
+
+    def test_after_total_count(self):
+        response = self.get_response(after='', limit=2)
+        content = json.loads(response.content.decode('UTF-8'))
+
+        self.assertEqual(content['meta']['total_count'], get_total_page_count())
+
+        response = self.get_response(after=content['meta']['next_cursor'], limit=2)
+        content = json.loads(response.content.decode('UTF-8'))
+
+        # The total count must not be affected by "after"
+        self.assertEqual(content['meta']['total_count'], get_total_page_count())
+
+    def test_after_with_offset_gives_error(self):
+        response = self.get_response(after='', offset=2)
+        content = json.loads(response.content.decode('UTF-8'))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content, {'message': "offset and after cannot be used together"})
+
+    def test_after_invalid_cursor_gives_error(self):
+        response = self.get_response(after='foo')
+        content = json.loads(response.content.decode('UTF-8'))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content, {'message': "after must be a cursor returned in next_cursor"})
+
+    def test_after_with_different_order_gives_error(self):
+        response = self.get_response(after='', limit=2)
+        next_cursor = json.loads(response.content.decode('UTF-8'))['meta']['next_cursor']
+
+        response = self.get_response(after=next_cursor, order='title')
+        content = json.loads(response.content.decode('UTF-8'))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content, {'message': "after was returned for a different ordering"})
+
+    def test_after_with_random_order_gives_error(self):
+        response = self.get_response(after='', order='random')
+        content = json.loads(response.content.decode('UTF-8'))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content, {'message': "after cannot be used with this ordering"})
+
+    def test_after_with_search_gives_error(self):
+        response = self.get_response(after='', search='blog')
+        content = json.loads(response.content.decode('UTF-8'))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content, {'message': "after cannot be used with search"})
+
+
+    # TOTAL COUNT
+
+    def test_without_total_count(self):
+        response = self.get_response(total_count='false')
+        content = json.loads(response.content.decode('UTF-8'))
+
+        self.assertNotIn('total_count', content['meta'])
+        self.assertEqual(len(content['items']), get_total_page_count())
+
+    def test_total_count_not_boolean_gives_error(self):
+        response = self.get_response(total_count='foo')
+        content = json.loads(response.content.decode('UTF-8'))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content, {'message': "total_count must be a boolean: expected 'true' or 'false', got 'foo'"})
+
+
     # SEARCH
 
     def test_search_for_blog(self):
@@ -777,6 +901,85 @@ class TestPageListing(TestCase):
         self.assertEqual(response['Content-type'], 'application/json')
         self.assertEqual(content['meta']['total_count'], 0)
 
+    # CONDITIONAL GET
+
+    def test_conditional_get_disabled_by_default(self):
+        response = self.get_response()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+
+    @override_settings(WAGTAILAPI_CONDITIONAL_GET=True)
+    def test_conditional_get(self):
+        response = self.get_response(type='demosite.BlogEntryPage')
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        response = self.client.get(reverse('wagtailapi_v2:pages:listing'), {'type': 'demosite.BlogEntryPage'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # Other parameters give a different listing
+        response = self.client.get(
+            reverse('wagtailapi_v2:pages:listing'), {'type': 'demosite.BlogEntryPage', 'limit': 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(WAGTAILAPI_CONDITIONAL_GET=True)
+    def test_conditional_get_after_publish(self):
+        response = self.get_response(type='demosite.BlogEntryPage')
+        etag = response['ETag']
+
+        models.BlogEntryPage.objects.get(id=16).save_revision().publish()
+
+        response = self.client.get(reverse('wagtailapi_v2:pages:listing'), {'type': 'demosite.BlogEntryPage'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    @override_settings(WAGTAILAPI_CONDITIONAL_GET=True)
+    def test_conditional_get_after_unpublish(self):
+        response = self.get_response(type='demosite.BlogEntryPage')
+        etag = response['ETag']
+
+        models.BlogEntryPage.objects.get(id=16).unpublish()
+
+        response = self.client.get(reverse('wagtailapi_v2:pages:listing'), {'type': 'demosite.BlogEntryPage'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(WAGTAILAPI_CONDITIONAL_GET=True)
+    def test_conditional_get_with_if_modified_since(self):
+        models.BlogEntryPage.objects.get(id=16).save_revision().publish()
+
+        response = self.get_response(type='demosite.BlogEntryPage')
+        last_modified = response['Last-Modified']
+
+        response = self.client.get(
+            reverse('wagtailapi_v2:pages:listing'), {'type': 'demosite.BlogEntryPage'}, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    # QUERY COUNT
+
+    def test_related_objects_are_loaded_in_bulk(self):
+        fields = 'body,tags,date,feed_image(title),carousel_items(image),related_links'
+
+        # Warm up caches
+        self.get_response(type='demosite.BlogEntryPage', fields=fields)
+
+        with CaptureQueriesContext(connection) as one_page:
+            response = self.get_response(type='demosite.BlogEntryPage', fields=fields, limit=1)
+            self.assertEqual(len(json.loads(response.content.decode('UTF-8'))['items']), 1)
+
+        # The number of queries doesn't depend on the number of pages in the listing
+        with self.assertNumQueries(len(one_page)):
+            response = self.get_response(type='demosite.BlogEntryPage', fields=fields, limit=3)
+            self.assertEqual(len(json.loads(response.content.decode('UTF-8'))['items']), 3)
+
+    def test_prefetched_tags(self):
+        response = self.get_response(type='demosite.BlogEntryPage', fields='tags')
+        content = json.loads(response.content.decode('UTF-8'))
+
+        for page in content['items']:
+            blog_page = models.BlogEntryPage.objects.get(id=page['id'])
+            self.assertEqual(page['tags'], sorted(tag.name for tag in blog_page.tags.all()))
+
     # REGRESSION TESTS
 
     def test_issue_3967(self):
@@ -1037,6 +1240,30 @@ class TestPageDetail(TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(content, {'message': "'title' does not support nested fields"})
 
+    # CONDITIONAL GET
+
+    def test_conditional_get_disabled_by_default(self):
+        response = self.get_response(16)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+
+    @override_settings(WAGTAILAPI_CONDITIONAL_GET=True)
+    def test_conditional_get(self):
+        response = self.get_response(16)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        response = self.client.get(reverse('wagtailapi_v2:pages:detail', args=(16, )), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # Publishing the page changes the ETag
+        models.BlogEntryPage.objects.get(id=16).save_revision().publish()
+
+        response = self.client.get(reverse('wagtailapi_v2:pages:detail', args=(16, )), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
 
 class TestPageFind(TestCase):
     fixtures = ['demosite.json']
@@ -1157,6 +1384,54 @@ class TestPageDetailWithStreamField(TestCase):
         self.assertEqual(content['body'][0]['value'], {'id': 1, 'title': 'A missing image'})
 
 
+class TestPageSerializerClassCache(TestCase):
+    fixtures = ['demosite.json']
+
+    def get_serializer_class(self, fields_config, show_details=False):
+        return PagesAPIEndpoint._get_cached_serializer_class(
+            api_router, models.BlogEntryPage, _freeze_fields_config(fields_config),
+            show_details=show_details
+        )
+
+    def test_serializer_class_is_reused(self):
+        serializer_class = self.get_serializer_class([('title', False, None)])
+
+        self.assertIs(self.get_serializer_class([('title', False, None)]), serializer_class)
+        self.assertIsNot(self.get_serializer_class([('title', False, None)], show_details=True), serializer_class)
+        self.assertIsNot(self.get_serializer_class([('slug', False, None)]), serializer_class)
+
+    def test_nested_fields_are_part_of_key(self):
+        serializer_class = self.get_serializer_class([('feed_image', False, [('title', False, None)])])
+
+        self.assertIs(
+            self.get_serializer_class([('feed_image', False, [('title', False, None)])]),
+            serializer_class
+        )
+        self.assertIsNot(
+            self.get_serializer_class([('feed_image', False, [('width', False, None)])]),
+            serializer_class
+        )
+
+    def test_cache_is_bounded(self):
+        self.assertEqual(PagesAPIEndpoint._get_cached_serializer_class.cache_info().maxsize, 1000)
+
+    def test_responses_are_consistent(self):
+        url = reverse('wagtailapi_v2:pages:listing')
+        params = {'type': 'demosite.BlogEntryPage', 'fields': 'title,feed_image(width)'}
+
+        first_content = json.loads(self.client.get(url, params).content.decode('UTF-8'))
+        second_content = json.loads(self.client.get(url, params).content.decode('UTF-8'))
+        self.assertEqual(first_content, second_content)
+
+        # Other field configurations aren't affected
+        params['fields'] = 'title,feed_image(height)'
+        content = json.loads(self.client.get(url, params).content.decode('UTF-8'))
+        for page in content['items']:
+            if page['feed_image'] is not None:
+                self.assertIn('height', page['feed_image'])
+                self.assertNotIn('width', page['feed_image'])
+
+
 @override_settings(
     WAGTAILFRONTENDCACHE={
         'varnish': {
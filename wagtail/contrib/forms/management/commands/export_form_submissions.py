@@ -0,0 +1,63 @@
+import csv
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from wagtail.contrib.forms.models import AbstractForm
+from wagtail.contrib.forms.utils import CSV_EXPORT_CHUNK_SIZE, get_csv_headings, iter_csv_rows
+from wagtail.core.models import Page
+
+
+def parse_date(value):
+    return datetime.datetime.strptime(value, '%Y-%m-%d').date()
+
+
+class Command(BaseCommand):
+
+    help = 'Exports the submissions of a form page to a CSV file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('page_id', type=int)
+        parser.add_argument(
+            '--output', '-o', dest='output',
+            help="File to write the CSV to. Written to standard output if not given")
+        parser.add_argument(
+            '--date-from', dest='date_from', type=parse_date,
+            help="Only export submissions made on or after this date (YYYY-MM-DD)")
+        parser.add_argument(
+            '--date-to', dest='date_to', type=parse_date,
+            help="Only export submissions made on or before this date (YYYY-MM-DD)")
+        parser.add_argument(
+            '--chunk-size', dest='chunk_size', type=int, default=CSV_EXPORT_CHUNK_SIZE,
+            help="Number of submissions to load from the database at a time")
+
+    def write_csv(self, f, form_page, submissions, chunk_size):
+        data_fields = form_page.get_data_fields()
+
+        writer = csv.writer(f)
+        writer.writerow(get_csv_headings(data_fields))
+        for data_row in iter_csv_rows(submissions, data_fields, chunk_size=chunk_size):
+            writer.writerow(data_row)
+
+    def handle(self, *args, **options):
+        try:
+            form_page = Page.objects.get(id=options['page_id']).specific
+        except Page.DoesNotExist:
+            raise CommandError("Page %d does not exist" % options['page_id'])
+
+        if not isinstance(form_page, AbstractForm):
+            raise CommandError("Page %d is not a form page" % options['page_id'])
+
+        submissions = form_page.get_submission_class()._default_manager.filter(page=form_page)
+        if options['date_from']:
+            submissions = submissions.filter(submit_time__gte=options['date_from'])
+        if options['date_to']:
+            # submit_time is a time, so must be before the start of the next day
+            submissions = submissions.filter(submit_time__lt=options['date_to'] + datetime.timedelta(days=1))
+        submissions = submissions.order_by('submit_time')
+
+        if options['output']:
+            with open(options['output'], 'w', newline='', encoding='utf-8') as f:
+                self.write_csv(f, form_page, submissions, options['chunk_size'])
+        else:
+            self.write_csv(self.stdout, form_page, submissions, options['chunk_size'])
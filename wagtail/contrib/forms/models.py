@@ -45,13 +45,36 @@ class AbstractFormSubmission(models.Model):
 
     submit_time = models.DateTimeField(verbose_name=_('submit time'), auto_now_add=True)
 
+    @classmethod
+    def encode_form_data(cls, form_data):
+        """
+        Converts the cleaned data of a form to the value stored in form_data.
+        """
+        return json.dumps(form_data, cls=DjangoJSONEncoder)
+
+    def decode_form_data(self):
+        """
+        Returns the stored form_data as a dict.
+        """
+        return json.loads(self.form_data)
+
+    @classmethod
+    def get_form_data_expression(cls, name):
+        """
+        Returns an expression for the value of the named form field, which
+        the submissions list uses to filter and order submissions in the
+        database. Returns None if form_data can't be queried, as the JSON
+        text stored by this model can't.
+        """
+        return None
+
     def get_data(self):
         """
         Returns dict with form data.
 
         You can override this method to add additional data.
         """
-        form_data = json.loads(self.form_data)
+        form_data = self.decode_form_data()
         form_data.update({
             'submit_time': self.submit_time,
         })
@@ -196,8 +219,9 @@ class AbstractForm(Page):
         For example, if you want to save reference to a user.
         """
 
-        return self.get_submission_class().objects.create(
-            form_data=json.dumps(form.cleaned_data, cls=DjangoJSONEncoder),
+        submission_class = self.get_submission_class()
+        return submission_class.objects.create(
+            form_data=submission_class.encode_form_data(form.cleaned_data),
             page=self,
         )
 
@@ -244,6 +268,13 @@ class AbstractForm(Page):
             context
         )
 
+    def get_etag(self, request, *args, **kwargs):
+        # Forms contain a CSRF token, so must always be rendered
+        return None
+
+    def get_last_modified(self, request, *args, **kwargs):
+        return None
+
     preview_modes = [
         ('form', 'Form'),
         ('landing', 'Landing page'),
@@ -0,0 +1,87 @@
+import hashlib
+import json
+
+from django.contrib.postgres.fields import JSONField
+from django.contrib.postgres.fields.jsonb import KeyTextTransform
+from django.contrib.postgres.indexes import GinIndex
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.migrations.operations.base import Operation
+
+from .models import AbstractFormSubmission
+
+
+class AbstractJSONFormSubmission(AbstractFormSubmission):
+    """
+    Data for a form submission, stored in a PostgreSQL ``jsonb`` column.
+
+    Unlike AbstractFormSubmission, the submissions list can filter, order and
+    count these submissions by the values of their form fields in the database.
+    """
+
+    form_data = JSONField()
+
+    @classmethod
+    def encode_form_data(cls, form_data):
+        # Convert dates, decimals, etc. the same way as the JSON text version,
+        # so the values are the same before and after the submission is saved
+        return json.loads(json.dumps(form_data, cls=DjangoJSONEncoder))
+
+    def decode_form_data(self):
+        return dict(self.form_data)
+
+    @classmethod
+    def get_form_data_expression(cls, name):
+        return KeyTextTransform(name, 'form_data')
+
+    def __str__(self):
+        return json.dumps(self.form_data, cls=DjangoJSONEncoder)
+
+    class Meta(AbstractFormSubmission.Meta):
+        abstract = True
+        indexes = [
+            GinIndex(fields=['form_data']),
+        ]
+
+
+class AddFormDataIndex(Operation):
+    """
+    Migration operation that indexes the value of a form field in the
+    form_data of an AbstractJSONFormSubmission model, for fields the
+    submissions are often filtered or ordered by:
+
+    >>> operations = [
+    ...     AddFormDataIndex('FormSubmission', 'email'),
+    ... ]
+    """
+    reduces_to_sql = True
+    reversible = True
+
+    def __init__(self, model_name, field_name):
+        self.model_name = model_name
+        self.field_name = field_name
+
+    def deconstruct(self):
+        return (self.__class__.__name__, [self.model_name, self.field_name], {})
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def get_index_name(self, model):
+        digest = hashlib.md5(self.field_name.encode('utf-8')).hexdigest()[:8]
+        return '%s_form_data_%s' % (model._meta.db_table[:40], digest)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        schema_editor.execute('CREATE INDEX %s ON %s ((%s ->> %s))' % (
+            schema_editor.quote_name(self.get_index_name(model)),
+            schema_editor.quote_name(model._meta.db_table),
+            schema_editor.quote_name(model._meta.get_field('form_data').column),
+            schema_editor.quote_value(self.field_name),
+        ))
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        schema_editor.execute('DROP INDEX %s' % schema_editor.quote_name(self.get_index_name(model)))
+
+    def describe(self):
+        return "Index the %s form field of %s" % (self.field_name, self.model_name)
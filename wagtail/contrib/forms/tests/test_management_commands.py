@@ -0,0 +1,85 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+import mock
+from django.core import management
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from wagtail.contrib.forms.models import FormSubmission
+from wagtail.contrib.forms.tests.utils import make_form_page
+from wagtail.core.models import Page
+
+
+class TestExportFormSubmissionsCommand(TestCase):
+    def setUp(self):
+        self.form_page = make_form_page()
+
+        for submit_time, email in [
+            ('2014-01-01T12:00:00.000Z', 'new@example.com'),
+            ('2013-01-01T12:00:00.000Z', 'old@example.com'),
+        ]:
+            form_submission = FormSubmission.objects.create(
+                page=self.form_page,
+                form_data=json.dumps({
+                    'your-email': email,
+                    'your-message': "Hello",
+                    'your-choices': ['foo', 'baz'],
+                }),
+            )
+            form_submission.submit_time = submit_time
+            form_submission.save()
+
+    def run_command(self, *args, **options):
+        output = StringIO()
+        management.call_command('export_form_submissions', *args, stdout=output, **options)
+        output.seek(0)
+
+        return output.read()
+
+    def test_export(self):
+        data_lines = self.run_command(str(self.form_page.id)).split("\n")
+
+        self.assertEqual(data_lines[0], 'Submission date,Your email,Your message,Your choices\r')
+        self.assertEqual(data_lines[1], '2013-01-01 12:00:00+00:00,old@example.com,Hello,"foo, baz"\r')
+        self.assertEqual(data_lines[2], '2014-01-01 12:00:00+00:00,new@example.com,Hello,"foo, baz"\r')
+        self.assertEqual(len(data_lines), 4)
+
+    def test_export_with_date_filtering(self):
+        data_lines = self.run_command(
+            str(self.form_page.id), '--date-from=2013-12-31', '--date-to=2014-01-01'
+        ).split("\n")
+
+        self.assertEqual(data_lines[1], '2014-01-01 12:00:00+00:00,new@example.com,Hello,"foo, baz"\r')
+        self.assertEqual(len(data_lines), 3)
+
+    def test_export_to_file(self):
+        tempdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tempdir)
+        output = os.path.join(tempdir, 'export.csv')
+
+        self.run_command(str(self.form_page.id), output=output, chunk_size=1)
+
+        with open(output, newline='', encoding='utf-8') as f:
+            data_lines = f.read().split("\n")
+
+        self.assertEqual(data_lines[0], 'Submission date,Your email,Your message,Your choices\r')
+        self.assertEqual(len(data_lines), 4)
+
+    @mock.patch('django.VERSION', (1, 11, 0, 'final', 0))
+    def test_export_on_django_1_11(self):
+        data_lines = self.run_command(str(self.form_page.id), chunk_size=1).split("\n")
+
+        self.assertEqual(data_lines[1], '2013-01-01 12:00:00+00:00,old@example.com,Hello,"foo, baz"\r')
+        self.assertEqual(len(data_lines), 4)
+
+    def test_export_non_form_page(self):
+        with self.assertRaises(CommandError):
+            self.run_command(str(Page.objects.get(url_path='/home/').id))
+
+    def test_export_missing_page(self):
+        with self.assertRaises(CommandError):
+            self.run_command('100000')
@@ -0,0 +1,119 @@
+import datetime
+import unittest
+
+import mock
+from django.apps import apps
+from django.db import connection
+from django.db.migrations.state import ProjectState
+from django.test import TestCase
+from django.urls import reverse
+
+from wagtail.contrib.forms.tests.utils import make_form_page
+from wagtail.tests.testapp.models import FormPage
+from wagtail.tests.utils import WagtailTestUtils
+
+if connection.vendor == 'postgresql':
+    from wagtail.contrib.forms.postgres import AddFormDataIndex
+    from wagtail.tests.postgresforms.models import JSONFormSubmission, OtherJSONFormSubmission
+
+
+def get_index_names(model):
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT indexname FROM pg_indexes WHERE tablename = %s', [model._meta.db_table])
+        return {row[0] for row in cursor.fetchall()}
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "Stores submissions in a PostgreSQL jsonb column")
+class TestJSONFormSubmission(TestCase, WagtailTestUtils):
+    def setUp(self):
+        self.form_page = make_form_page()
+
+        for submit_time, email in [
+            ('2014-01-01T12:00:00.000Z', 'b@example.com'),
+            ('2013-01-01T12:00:00.000Z', 'c@example.com'),
+            ('2015-01-01T12:00:00.000Z', 'a@example.com'),
+        ]:
+            form_submission = JSONFormSubmission.objects.create(
+                page=self.form_page,
+                form_data=JSONFormSubmission.encode_form_data({
+                    'your-email': email,
+                    'your-message': "Hello",
+                }),
+            )
+            form_submission.submit_time = submit_time
+            form_submission.save()
+
+        patcher = mock.patch.object(FormPage, 'get_submission_class', return_value=JSONFormSubmission)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.login()
+
+    def get(self, params):
+        return self.client.get(reverse('wagtailforms:list_submissions', args=(self.form_page.id,)), params)
+
+    def get_emails(self, response):
+        return [row['fields'][1] for row in response.context['data_rows']]
+
+    def test_form_data_is_the_same_after_saving(self):
+        form_data = JSONFormSubmission.encode_form_data({'date': datetime.date(2018, 1, 2), 'choices': ['foo']})
+        form_submission = JSONFormSubmission.objects.create(page=self.form_page, form_data=form_data)
+
+        form_submission = JSONFormSubmission.objects.get(id=form_submission.id)
+        self.assertEqual(form_submission.decode_form_data(), {'date': '2018-01-02', 'choices': ['foo']})
+
+    def test_filter_and_order_queries(self):
+        email = JSONFormSubmission.get_form_data_expression('your-email')
+        submissions = JSONFormSubmission.objects.annotate(email=email)
+
+        self.assertEqual(
+            list(submissions.order_by('email').values_list('email', flat=True)),
+            ['a@example.com', 'b@example.com', 'c@example.com']
+        )
+        self.assertEqual(submissions.filter(email='b@example.com').count(), 1)
+        self.assertEqual(submissions.filter(email='d@example.com').count(), 0)
+
+    def test_order_by_form_field(self):
+        response = self.get({'order_by': '-your-email'})
+        self.assertEqual(self.get_emails(response), ['c@example.com', 'b@example.com', 'a@example.com'])
+
+    def test_filter_by_form_field(self):
+        response = self.get({'filter-your-email': 'b@example.com'})
+
+        self.assertEqual(self.get_emails(response), ['b@example.com'])
+        self.assertEqual(response.context['paginator'].count, 1)
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', "Indexes a PostgreSQL jsonb column")
+class TestFormDataIndexes(TestCase):
+    def test_gin_index_names_are_unique(self):
+        # The GinIndex declared on the abstract model is copied and named for
+        # each subclass, so they don't clash in the database
+        index_name = JSONFormSubmission._meta.indexes[0].name
+        other_index_name = OtherJSONFormSubmission._meta.indexes[0].name
+
+        self.assertNotEqual(index_name, other_index_name)
+        self.assertIn(index_name, get_index_names(JSONFormSubmission))
+        self.assertIn(other_index_name, get_index_names(OtherJSONFormSubmission))
+
+    def test_add_form_data_index(self):
+        operation = AddFormDataIndex('OtherJSONFormSubmission', 'your-email')
+        index_name = operation.get_index_name(OtherJSONFormSubmission)
+        state = ProjectState.from_apps(apps)
+
+        with connection.schema_editor() as editor:
+            operation.database_forwards('postgresformstests', editor, state, state)
+        self.assertIn(index_name, get_index_names(OtherJSONFormSubmission))
+
+        with connection.schema_editor() as editor:
+            operation.database_backwards('postgresformstests', editor, state, state)
+        self.assertNotIn(index_name, get_index_names(OtherJSONFormSubmission))
+
+    def test_form_data_index_from_migration(self):
+        # Applied by the initial migration of the test app
+        index_name = AddFormDataIndex('JSONFormSubmission', 'your-email').get_index_name(JSONFormSubmission)
+        self.assertIn(index_name, get_index_names(JSONFormSubmission))
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT indexdef FROM pg_indexes WHERE indexname = %s', [index_name])
+            self.assertIn("'your-email'", cursor.fetchone()[0])
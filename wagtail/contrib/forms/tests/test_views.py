@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
 import json
+import unittest
+
+import mock
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.db.models import F, Func, TextField, Value
 from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from wagtail.admin.edit_handlers import get_form_for_model
@@ -384,6 +390,76 @@ class TestFormsSubmissionsList(TestCase, WagtailTestUtils):
         self.assertTrue('this is a really old message' in first_row_values)
 
 
+def json_extract(name):
+    # Stands in for the key lookup of a JSON column, which SQLite can do on text
+    return Func(F('form_data'), Value('$."%s"' % name), function='json_extract', output_field=TextField())
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', "Uses the SQLite json_extract function")
+@mock.patch.object(FormSubmission, 'get_form_data_expression', json_extract)
+class TestFormsSubmissionsListWithQueryableFormData(TestCase, WagtailTestUtils):
+    def setUp(self):
+        self.form_page = make_form_page()
+
+        for submit_time, email in [
+            ('2014-01-01T12:00:00.000Z', 'b@example.com'),
+            ('2013-01-01T12:00:00.000Z', 'c@example.com'),
+            ('2015-01-01T12:00:00.000Z', 'a@example.com'),
+        ]:
+            form_submission = FormSubmission.objects.create(
+                page=self.form_page,
+                form_data=json.dumps({
+                    'your-email': email,
+                    'your-message': "Hello",
+                }),
+            )
+            form_submission.submit_time = submit_time
+            form_submission.save()
+
+        self.login()
+
+    def get(self, params):
+        return self.client.get(reverse('wagtailforms:list_submissions', args=(self.form_page.id,)), params)
+
+    def get_emails(self, response):
+        return [row['fields'][1] for row in response.context['data_rows']]
+
+    def test_form_fields_are_orderable(self):
+        response = self.get({})
+
+        headings = {heading['name']: heading['order'] for heading in response.context['data_headings']}
+        self.assertEqual(headings['your-email'], 'orderable')
+        self.assertEqual(headings['submit_time'], 'descending')
+
+    def test_order_by_form_field(self):
+        response = self.get({'order_by': 'your-email'})
+        self.assertEqual(self.get_emails(response), ['a@example.com', 'b@example.com', 'c@example.com'])
+
+        response = self.get({'order_by': '-your-email'})
+        self.assertEqual(self.get_emails(response), ['c@example.com', 'b@example.com', 'a@example.com'])
+
+    def test_filter_by_form_field(self):
+        response = self.get({'filter-your-email': 'b@example.com'})
+
+        self.assertEqual(self.get_emails(response), ['b@example.com'])
+        self.assertEqual(response.context['paginator'].count, 1)
+
+        # The filter is kept when downloading a CSV
+        self.assertContains(response, '<input type="hidden" name="filter-your-email" value="b@example.com">', html=True)
+
+    def test_filter_by_unknown_field_is_ignored(self):
+        response = self.get({'filter-submit_time': 'b@example.com'})
+        self.assertEqual(len(response.context['data_rows']), 3)
+
+    def test_csv_export_is_filtered_and_ordered(self):
+        response = self.get({'action': 'CSV', 'filter-your-message': 'Hello', 'order_by': 'your-email'})
+        data_lines = b''.join(response.streaming_content).decode().split("\n")
+
+        self.assertEqual(len(data_lines), 5)
+        self.assertIn('a@example.com', data_lines[1])
+        self.assertIn('c@example.com', data_lines[3])
+
+
 class TestFormsSubmissionsExport(TestCase, WagtailTestUtils):
     def setUp(self):
         # Create a form page
@@ -422,12 +498,30 @@ class TestFormsSubmissionsExport(TestCase, WagtailTestUtils):
 
         # Check response
         self.assertEqual(response.status_code, 200)
-        data_lines = response.content.decode().split("\n")
+        data_lines = b''.join(response.streaming_content).decode().split("\n")
 
         self.assertEqual(data_lines[0], 'Submission date,Your email,Your message,Your choices\r')
         self.assertEqual(data_lines[1], '2013-01-01 12:00:00+00:00,old@example.com,this is a really old message,"foo, baz"\r')
         self.assertEqual(data_lines[2], '2014-01-01 12:00:00+00:00,new@example.com,this is a fairly new message,None\r')
 
+    def test_list_submissions_csv_export_is_streamed(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse('wagtailforms:list_submissions', args=(self.form_page.id,)),
+                {'action': 'CSV'}
+            )
+            query_count = len(queries)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.streaming)
+
+            # The submissions are only loaded as the response is streamed
+            data_lines = b''.join(response.streaming_content).decode().split("\n")
+            self.assertGreater(len(queries), query_count)
+
+        self.assertEqual(data_lines[0], 'Submission date,Your email,Your message,Your choices\r')
+        self.assertEqual(len(data_lines), 4)
+
     def test_list_submissions_csv_large_export(self):
         for i in range(100):
             new_form_submission = FormSubmission.objects.create(
@@ -447,7 +541,7 @@ class TestFormsSubmissionsExport(TestCase, WagtailTestUtils):
 
         # Check that csv export is not paginated
         self.assertEqual(response.status_code, 200)
-        data_lines = response.content.decode().split("\n")
+        data_lines = b''.join(response.streaming_content).decode().split("\n")
         self.assertEqual(104, len(data_lines))
 
     def test_list_submissions_csv_export_after_filter_form_submissions_for_user_hook(self):
@@ -462,7 +556,7 @@ class TestFormsSubmissionsExport(TestCase, WagtailTestUtils):
 
         # An user can export form submissions without the hook
         self.assertEqual(response.status_code, 200)
-        data_lines = response.content.decode().split("\n")
+        data_lines = b''.join(response.streaming_content).decode().split("\n")
 
         self.assertEqual(data_lines[0], 'Submission date,Your email,Your message,Your choices\r')
         self.assertEqual(data_lines[1], '2013-01-01 12:00:00+00:00,old@example.com,this is a really old message,"foo, baz"\r')
@@ -485,7 +579,7 @@ class TestFormsSubmissionsExport(TestCase, WagtailTestUtils):
 
         # Check response
         self.assertEqual(response.status_code, 200)
-        data_lines = response.content.decode().split("\n")
+        data_lines = b''.join(response.streaming_content).decode().split("\n")
 
         self.assertEqual(data_lines[0], 'Submission date,Your email,Your message,Your choices\r')
         self.assertEqual(data_lines[1], '2014-01-01 12:00:00+00:00,new@example.com,this is a fairly new message,None\r')
@@ -498,7 +592,7 @@ class TestFormsSubmissionsExport(TestCase, WagtailTestUtils):
 
         # Check response
         self.assertEqual(response.status_code, 200)
-        data_lines = response.content.decode().split("\n")
+        data_lines = b''.join(response.streaming_content).decode().split("\n")
 
         self.assertEqual(data_lines[0], 'Submission date,Your email,Your message,Your choices\r')
         self.assertEqual(data_lines[1], '2013-01-01 12:00:00+00:00,old@example.com,this is a really old message,"foo, baz"\r')
@@ -511,7 +605,7 @@ class TestFormsSubmissionsExport(TestCase, WagtailTestUtils):
 
         # Check response
         self.assertEqual(response.status_code, 200)
-        data_lines = response.content.decode().split("\n")
+        data_lines = b''.join(response.streaming_content).decode().split("\n")
 
         self.assertEqual(data_lines[0], 'Submission date,Your email,Your message,Your choices\r')
         self.assertEqual(data_lines[1], '2014-01-01 12:00:00+00:00,new@example.com,this is a fairly new message,None\r')
@@ -534,7 +628,7 @@ class TestFormsSubmissionsExport(TestCase, WagtailTestUtils):
 
         # Check response
         self.assertEqual(response.status_code, 200)
-        data_line = response.content.decode('utf-8').split("\n")[1]
+        data_line = b''.join(response.streaming_content).decode('utf-8').split("\n")[1]
         self.assertIn('こんにちは、世界', data_line)
 
     def test_list_submissions_csv_export_with_unicode_in_field(self):
@@ -566,7 +660,7 @@ class TestFormsSubmissionsExport(TestCase, WagtailTestUtils):
         # Check response
         self.assertEqual(response.status_code, 200)
 
-        data_lines = response.content.decode('utf-8').split("\n")
+        data_lines = b''.join(response.streaming_content).decode('utf-8').split("\n")
         self.assertIn('Выберите самую любимую IDE для разработке на Python', data_lines[0])
         self.assertIn('vim', data_lines[1])
 
@@ -613,7 +707,7 @@ class TestCustomFormsSubmissionsExport(TestCase, WagtailTestUtils):
 
         # Check response
         self.assertEqual(response.status_code, 200)
-        data_lines = response.content.decode().split("\n")
+        data_lines = b''.join(response.streaming_content).decode().split("\n")
 
         self.assertEqual(data_lines[0], 'Username,Submission date,Your email,Your message,Your choices\r')
         self.assertEqual(data_lines[1],
@@ -629,7 +723,7 @@ class TestCustomFormsSubmissionsExport(TestCase, WagtailTestUtils):
 
         # Check response
         self.assertEqual(response.status_code, 200)
-        data_lines = response.content.decode().split("\n")
+        data_lines = b''.join(response.streaming_content).decode().split("\n")
 
         self.assertEqual(data_lines[0], 'Username,Submission date,Your email,Your message,Your choices\r')
         self.assertEqual(data_lines[1],
@@ -643,7 +737,7 @@ class TestCustomFormsSubmissionsExport(TestCase, WagtailTestUtils):
 
         # Check response
         self.assertEqual(response.status_code, 200)
-        data_lines = response.content.decode().split("\n")
+        data_lines = b''.join(response.streaming_content).decode().split("\n")
 
         self.assertEqual(data_lines[0], 'Username,Submission date,Your email,Your message,Your choices\r')
         self.assertEqual(data_lines[1],
@@ -657,7 +751,7 @@ class TestCustomFormsSubmissionsExport(TestCase, WagtailTestUtils):
 
         # Check response
         self.assertEqual(response.status_code, 200)
-        data_lines = response.content.decode().split("\n")
+        data_lines = b''.join(response.streaming_content).decode().split("\n")
 
         self.assertEqual(data_lines[0], 'Username,Submission date,Your email,Your message,Your choices\r')
         self.assertEqual(data_lines[1],
@@ -682,7 +776,7 @@ class TestCustomFormsSubmissionsExport(TestCase, WagtailTestUtils):
 
         # Check response
         self.assertEqual(response.status_code, 200)
-        data_line = response.content.decode('utf-8').split("\n")[1]
+        data_line = b''.join(response.streaming_content).decode('utf-8').split("\n")[1]
         self.assertIn('こんにちは、世界', data_line)
 
     def test_list_submissions_csv_export_with_unicode_in_field(self):
@@ -715,7 +809,7 @@ class TestCustomFormsSubmissionsExport(TestCase, WagtailTestUtils):
         # Check response
         self.assertEqual(response.status_code, 200)
 
-        data_lines = response.content.decode('utf-8').split("\n")
+        data_lines = b''.join(response.streaming_content).decode('utf-8').split("\n")
         self.assertIn('Выберите самую любимую IDE для разработке на Python', data_lines[0])
         self.assertIn('vim', data_lines[1])
 
@@ -1116,7 +1210,7 @@ class TestFormsWithCustomSubmissionsList(TestCase, WagtailTestUtils):
 
         # Check response
         self.assertEqual(response.status_code, 200)
-        data_lines = response.content.decode().split("\n")
+        data_lines = b''.join(response.streaming_content).decode().split("\n")
         self.assertIn('filename=%s-export' % self.form_page.slug, response.get('Content-Disposition'))
         self.assertEqual(data_lines[0], 'Username,Submission date,Your email,Chocolate,Ingredients,Your Excitement\r')
         # first result should be the most recent as order_csv has been reversed
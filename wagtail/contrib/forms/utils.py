@@ -1,10 +1,16 @@
+import django
 from django.contrib.contenttypes.models import ContentType
+from django.db.models import QuerySet
+from django.utils.encoding import smart_str
 
 from wagtail.core import hooks
 from wagtail.core.models import UserPagePermissionsProxy, get_page_models
 
 _FORM_CONTENT_TYPES = None
 
+# Number of submissions loaded from the database at a time when exporting
+CSV_EXPORT_CHUNK_SIZE = 2000
+
 
 def get_form_types():
     global _FORM_CONTENT_TYPES
@@ -33,3 +39,36 @@ def get_forms_for_user(user):
         editable_forms = fn(user, editable_forms)
 
     return editable_forms
+
+
+def get_csv_headings(data_fields):
+    """
+    Return the heading row of a CSV export of the given data fields
+    """
+    return [smart_str(label) for name, label in data_fields]
+
+
+def iter_csv_rows(submissions, data_fields, chunk_size=CSV_EXPORT_CHUNK_SIZE):
+    """
+    Yield a CSV row of the given data fields for each submission.
+
+    Querysets are loaded chunk_size submissions at a time, so exports of
+    forms with many submissions don't need to fit in memory.
+    """
+    if isinstance(submissions, QuerySet):
+        if django.VERSION >= (2, 0):
+            submissions = submissions.iterator(chunk_size=chunk_size)
+        else:
+            # Before Django 2.0, iterator() doesn't take a chunk size
+            submissions = submissions.iterator()
+
+    for submission in submissions:
+        form_data = submission.get_data()
+        data_row = []
+        for name, label in data_fields:
+            val = form_data.get(name)
+            if isinstance(val, list):
+                val = ', '.join(val)
+            # Using smart_str prevents UnicodeEncodeError for values with non-ansi symbols
+            data_row.append(smart_str(val))
+        yield data_row
@@ -3,19 +3,26 @@ import datetime
 
 from django.core.exceptions import PermissionDenied
 from django.core.paginator import InvalidPage
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect
-from django.utils.encoding import smart_str
 from django.utils.translation import ungettext
 from django.views.generic import ListView, TemplateView
 
 from wagtail.admin import messages
 from wagtail.contrib.forms.forms import SelectDateForm
-from wagtail.contrib.forms.utils import get_forms_for_user
+from wagtail.contrib.forms.utils import (
+    CSV_EXPORT_CHUNK_SIZE, get_csv_headings, get_forms_for_user, iter_csv_rows)
 from wagtail.core.models import Page
 from wagtail.utils.pagination import DEFAULT_PAGE_KEY
 
 
+class Echo:
+    """ A file-like object that returns what is written to it, for streaming CSV writers """
+
+    def write(self, value):
+        return value
+
+
 def get_submissions_list_view(request, *args, **kwargs):
     """ Call the form page's list submissions view class """
     page_id = kwargs.get('page_id')
@@ -141,6 +148,9 @@ class SubmissionsListView(SafePaginateListView):
     ordering_csv = ('submit_time',)  # keep legacy CSV ordering
     orderable_fields = ('id', 'submit_time',)  # used to validate ordering in URL
     select_date_form = None
+    form_data_expressions = None
+    csv_export_chunk_size = CSV_EXPORT_CHUNK_SIZE
+    filter_param_prefix = 'filter-'  # prefix of URL parameters filtering by form field values
 
     def dispatch(self, request, *args, **kwargs):
         """ Check permissions and set the form page """
@@ -165,6 +175,11 @@ class SubmissionsListView(SafePaginateListView):
         if filtering and isinstance(filtering, dict):
             queryset = queryset.filter(**filtering)
 
+        form_data_expressions = self.get_form_data_expressions()
+        for i, (name, value) in enumerate(self.get_form_data_filtering()):
+            alias = 'form_data_filter_%d' % i
+            queryset = queryset.annotate(**{alias: form_data_expressions[name]}).filter(**{alias: value})
+
         ordering = self.get_ordering()
         if ordering:
             if isinstance(ordering, str):
@@ -179,9 +194,30 @@ class SubmissionsListView(SafePaginateListView):
             return None
         return self.paginate_by
 
+    def get_form_data_expressions(self):
+        """
+        Return a dict of form field names to expressions for their values, for
+        the fields submissions can be filtered and ordered by in the database
+        """
+        if self.form_data_expressions is None:
+            submission_class = self.form_page.get_submission_class()
+            self.form_data_expressions = {}
+            for field in self.form_page.get_form_fields():
+                expression = submission_class.get_form_data_expression(field.clean_name)
+                if expression is not None:
+                    self.form_data_expressions[field.clean_name] = expression
+        return self.form_data_expressions
+
+    def get_orderable_fields(self):
+        """ Return the names of the fields submissions can be ordered by """
+        orderable_fields = tuple(self.orderable_fields or ())
+        return orderable_fields + tuple(
+            name for name in self.get_form_data_expressions() if name not in orderable_fields
+        )
+
     def get_validated_ordering(self):
         """ Return a dict of field names with ordering labels if ordering is valid """
-        orderable_fields = self.orderable_fields or ()
+        orderable_fields = self.get_orderable_fields()
         ordering = dict()
         if self.is_csv_export:
             #  Revert to CSV order_by submit_time ascending for backwards compatibility
@@ -192,20 +228,27 @@ class SubmissionsListView(SafePaginateListView):
             default_ordering = (default_ordering,)
         ordering_strs = self.request.GET.getlist('order_by') or list(default_ordering)
         for order in ordering_strs:
-            try:
-                _, prefix, field_name = order.rpartition('-')
-                if field_name in orderable_fields:
-                    ordering[field_name] = (
-                        prefix, 'descending' if prefix == '-' else 'ascending'
-                    )
-            except (IndexError, ValueError):
-                continue  # invalid ordering specified, skip it
+            # Form field names may contain hyphens, so only a leading one is a prefix
+            prefix = '-' if order.startswith('-') else ''
+            field_name = order[len(prefix):]
+            if field_name in orderable_fields:
+                ordering[field_name] = (
+                    prefix, 'descending' if prefix == '-' else 'ascending'
+                )
         return ordering
 
     def get_ordering(self):
         """ Return the field or fields to use for ordering the queryset """
         ordering = self.get_validated_ordering()
-        return [values[0] + name for name, values in ordering.items()]
+        form_data_expressions = self.get_form_data_expressions()
+        result = []
+        for name, values in ordering.items():
+            if name in form_data_expressions and name not in (self.orderable_fields or ()):
+                expression = form_data_expressions[name]
+                result.append(expression.desc() if values[0] == '-' else expression.asc())
+            else:
+                result.append(values[0] + name)
+        return result
 
     def get_filtering(self):
         """ Return filering as a dict for submissions queryset """
@@ -226,22 +269,36 @@ class SubmissionsListView(SafePaginateListView):
                 result['submit_time__gte'] = date_from
         return result
 
+    def get_form_data_filtering(self):
+        """ Return a list of (field name, value) pairs to filter submissions by in the database """
+        form_data_expressions = self.get_form_data_expressions()
+        result = []
+        for param, values in self.request.GET.lists():
+            if not param.startswith(self.filter_param_prefix):
+                continue
+            name = param[len(self.filter_param_prefix):]
+            if name in form_data_expressions:
+                result.extend((name, value) for value in values)
+        return result
+
     def get_csv_filename(self):
         """ Returns the filename for the generated CSV file """
         return 'export-{}.csv'.format(
             datetime.datetime.today().strftime('%Y-%m-%d')
         )
 
+    def stream_csv(self, context):
+        """ Yields the lines of the CSV file as they are written """
+        writer = csv.writer(Echo())
+        yield writer.writerow(context['data_headings'])
+        for data_row in context['data_rows']:
+            yield writer.writerow(data_row)
+
     def get_csv_response(self, context):
-        """ Returns a CSV response """
+        """ Returns a streaming CSV response """
         filename = self.get_csv_filename()
-        response = HttpResponse(content_type='text/csv; charset=utf-8')
+        response = StreamingHttpResponse(self.stream_csv(context), content_type='text/csv; charset=utf-8')
         response['Content-Disposition'] = 'attachment;filename={}'.format(filename)
-
-        writer = csv.writer(response)
-        writer.writerow(context['data_headings'])
-        for data_row in context['data_rows']:
-            writer.writerow(data_row)
         return response
 
     def render_to_response(self, context, **response_kwargs):
@@ -257,18 +314,11 @@ class SubmissionsListView(SafePaginateListView):
         data_rows = []
 
         if self.is_csv_export:
-            # Build data_rows as list of lists containing formatted data values
-            # Using smart_str prevents UnicodeEncodeError for values with non-ansi symbols
-            for submission in submissions:
-                form_data = submission.get_data()
-                data_row = []
-                for name, label in data_fields:
-                    val = form_data.get(name)
-                    if isinstance(val, list):
-                        val = ', '.join(val)
-                    data_row.append(smart_str(val))
-                data_rows.append(data_row)
-            data_headings = [smart_str(label) for name, label in data_fields]
+            # Build data_rows as a generator of lists containing formatted data values.
+            # The rows are produced as the response is streamed, with the submissions
+            # loaded in chunks, so large exports don't have to fit in memory
+            data_rows = iter_csv_rows(submissions, data_fields, chunk_size=self.csv_export_chunk_size)
+            data_headings = get_csv_headings(data_fields)
         else:
             # Build data_rows as list of dicts containing model_id and fields
             for submission in submissions:
@@ -285,7 +335,7 @@ class SubmissionsListView(SafePaginateListView):
                 })
             # Build data_headings as list of dicts containing model_id and fields
             ordering_by_field = self.get_validated_ordering()
-            orderable_fields = self.orderable_fields
+            orderable_fields = self.get_orderable_fields()
             data_headings = []
             for name, label in data_fields:
                 order_label = None
@@ -304,6 +354,10 @@ class SubmissionsListView(SafePaginateListView):
         context.update({
             'form_page': self.form_page,
             'select_date_form': self.select_date_form,
+            'form_data_filters': [
+                (self.filter_param_prefix + name, value)
+                for name, value in self.get_form_data_filtering()
+            ],
             'data_headings': data_headings,
             'data_rows': data_rows,
             'submissions': submissions,
@@ -1,9 +1,8 @@
 import logging
+import threading
 import uuid
 from collections import defaultdict
-from urllib.error import HTTPError, URLError
 from urllib.parse import urlparse, urlunparse
-from urllib.request import Request, urlopen
 
 import requests
 from django.core.exceptions import ImproperlyConfigured
@@ -13,11 +12,6 @@ from wagtail import __version__
 logger = logging.getLogger('wagtail.frontendcache')
 
 
-class PurgeRequest(Request):
-    def get_method(self):
-        return 'PURGE'
-
-
 class BaseBackend:
     def purge(self, url):
         raise NotImplementedError
@@ -27,12 +21,29 @@ class BaseBackend:
         for url in urls:
             self.purge(url)
 
+    def close(self):
+        # Called when the backend won't be used again
+        pass
+
 
 class HTTPBackend(BaseBackend):
     def __init__(self, params):
         location_url_parsed = urlparse(params.pop('LOCATION'))
         self.cache_scheme = location_url_parsed.scheme
         self.cache_netloc = location_url_parsed.netloc
+        self.timeout = params.pop('TIMEOUT', 10)
+
+        # All purge requests sent by this backend share a session so the
+        # connection to the cache server is kept alive between them. Backends
+        # are shared by all threads, and requests.Session isn't thread-safe,
+        # so only one thread uses it at a time
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = 'Wagtail-frontendcache/' + __version__
+        self.session_lock = threading.Lock()
+
+    def close(self):
+        with self.session_lock:
+            self.session.close()
 
     def purge(self, url):
         url_parsed = urlparse(url)
@@ -42,36 +53,40 @@ class HTTPBackend(BaseBackend):
         if url_parsed.port:
             host += (':' + str(url_parsed.port))
 
-        request = PurgeRequest(
-            url=urlunparse([
-                self.cache_scheme,
-                self.cache_netloc,
-                url_parsed.path,
-                url_parsed.params,
-                url_parsed.query,
-                url_parsed.fragment
-            ]),
-            headers={
-                'Host': host,
-                'User-Agent': 'Wagtail-frontendcache/' + __version__
-            }
-        )
+        purge_url = urlunparse([
+            self.cache_scheme,
+            self.cache_netloc,
+            url_parsed.path,
+            url_parsed.params,
+            url_parsed.query,
+            url_parsed.fragment
+        ])
 
         try:
-            urlopen(request)
-        except HTTPError as e:
-            logger.error("Couldn't purge '%s' from HTTP cache. HTTPError: %d %s", url, e.code, e.reason)
-        except URLError as e:
-            logger.error("Couldn't purge '%s' from HTTP cache. URLError: %s", url, e.reason)
+            with self.session_lock:
+                response = self.session.request('PURGE', purge_url, headers={'Host': host}, timeout=self.timeout)
+        except requests.exceptions.RequestException as e:
+            logger.error("Couldn't purge '%s' from HTTP cache. %s: %s", url, type(e).__name__, e)
+            return
+
+        if response.status_code >= 400:
+            logger.error("Couldn't purge '%s' from HTTP cache. HTTPError: %d %s", url, response.status_code, response.reason)
 
 
 class CloudflareBackend(BaseBackend):
+    # Cloudflare accepts at most this many URLs in a single purge request
+    CHUNK_SIZE = 30
+
     def __init__(self, params):
         self.cloudflare_email = params.pop('EMAIL')
         self.cloudflare_token = params.pop('TOKEN')
         self.cloudflare_zoneid = params.pop('ZONEID')
 
     def purge_batch(self, urls):
+        for i in range(0, len(urls), self.CHUNK_SIZE):
+            self._purge_urls(urls[i:i + self.CHUNK_SIZE])
+
+    def _purge_urls(self, urls):
         try:
             purge_url = 'https://api.cloudflare.com/client/v4/zones/{0}/purge_cache'.format(self.cloudflare_zoneid)
 
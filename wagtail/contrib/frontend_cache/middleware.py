@@ -0,0 +1,14 @@
+from wagtail.contrib.frontend_cache.utils import batch_purges
+
+
+class BatchPurgesMiddleware:
+    """
+    Purges the URLs queued while handling a request in a single batch, once
+    the response has been generated
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with batch_purges():
+            return self.get_response(request)
@@ -1,15 +1,15 @@
 from django.apps import apps
 
-from wagtail.contrib.frontend_cache.utils import purge_page_from_cache
+from wagtail.contrib.frontend_cache.utils import queue_page_for_purge
 from wagtail.core.signals import page_published, page_unpublished
 
 
 def page_published_signal_handler(instance, **kwargs):
-    purge_page_from_cache(instance)
+    queue_page_for_purge(instance)
 
 
 def page_unpublished_signal_handler(instance, **kwargs):
-    purge_page_from_cache(instance)
+    queue_page_for_purge(instance)
 
 
 def register_signal_handlers():
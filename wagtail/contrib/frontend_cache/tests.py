@@ -9,9 +9,10 @@ from wagtail.contrib.frontend_cache.utils import get_backends
 from wagtail.core.models import Page
 from wagtail.tests.testapp.models import EventIndex
 
+from .middleware import BatchPurgesMiddleware
 from .utils import (
-    PurgeBatch, purge_page_from_cache, purge_pages_from_cache, purge_url_from_cache,
-    purge_urls_from_cache)
+    PurgeBatch, _get_configured_backends, batch_purges, purge_page_from_cache, purge_pages_from_cache,
+    purge_url_from_cache, purge_urls_from_cache)
 
 
 class TestBackendConfiguration(TestCase):
@@ -128,6 +129,90 @@ class TestBackendConfiguration(TestCase):
         self.assertEqual(backends['default'].cache_netloc, 'localhost:8000')
 
 
+class TestBackends(TestCase):
+    @mock.patch('requests.Session.request')
+    def test_http_purge(self, request):
+        request.return_value.status_code = 200
+        backend = HTTPBackend({'LOCATION': 'http://localhost:8000'})
+
+        backend.purge_batch(['http://www.example.com/foo/', 'http://www.example.com:8080/bar/?page=2'])
+
+        self.assertEqual(request.call_args_list, [
+            mock.call('PURGE', 'http://localhost:8000/foo/', headers={'Host': 'www.example.com'}, timeout=10),
+            mock.call('PURGE', 'http://localhost:8000/bar/?page=2', headers={'Host': 'www.example.com:8080'}, timeout=10),
+        ])
+
+    @override_settings(WAGTAILFRONTENDCACHE_LOCATION='http://localhost:8000')
+    @mock.patch('requests.Session.request')
+    def test_http_session_is_reused(self, request):
+        request.return_value.status_code = 200
+        backend = _get_configured_backends()['default']
+
+        purge_url_from_cache('http://www.example.com/foo/')
+        purge_url_from_cache('http://www.example.com/bar/')
+
+        self.assertIs(_get_configured_backends()['default'], backend)
+        self.assertEqual(request.call_count, 2)
+
+        # The backends are created again when the settings change
+        with override_settings(WAGTAILFRONTENDCACHE_LOCATION='http://localhost:8001'):
+            self.assertEqual(_get_configured_backends()['default'].cache_netloc, 'localhost:8001')
+
+    @mock.patch('requests.Session.request')
+    def test_http_session_is_used_by_one_thread_at_a_time(self, request):
+        backend = HTTPBackend({'LOCATION': 'http://localhost:8000'})
+
+        def check_lock(*args, **kwargs):
+            self.assertTrue(backend.session_lock.locked())
+            return mock.Mock(status_code=200)
+
+        request.side_effect = check_lock
+        backend.purge('http://www.example.com/foo/')
+
+        self.assertEqual(request.call_count, 1)
+        self.assertFalse(backend.session_lock.locked())
+
+    @mock.patch('requests.Session.close')
+    @mock.patch('requests.Session.request')
+    def test_http_session_is_closed_after_purge_with_backend_settings(self, request, close):
+        request.return_value.status_code = 200
+
+        purge_url_from_cache('http://www.example.com/foo/', backend_settings={
+            'varnish': {
+                'BACKEND': 'wagtail.contrib.frontend_cache.backends.HTTPBackend',
+                'LOCATION': 'http://localhost:8000',
+            },
+        })
+
+        self.assertEqual(request.call_count, 1)
+        close.assert_called_once_with()
+
+    @mock.patch('requests.Session.request')
+    def test_http_purge_error(self, request):
+        request.return_value.status_code = 405
+        request.return_value.reason = "Method Not Allowed"
+        backend = HTTPBackend({'LOCATION': 'http://localhost:8000'})
+
+        with self.assertLogs('wagtail.frontendcache', level='ERROR') as log:
+            backend.purge('http://www.example.com/foo/')
+
+        self.assertIn("Couldn't purge 'http://www.example.com/foo/' from HTTP cache. HTTPError: 405 Method Not Allowed", log.output[0])
+
+    @mock.patch('requests.delete')
+    def test_cloudflare_purge_is_split_into_chunks(self, delete):
+        delete.return_value.json.return_value = {'success': True}
+        backend = CloudflareBackend({'EMAIL': 'test@test.com', 'TOKEN': 'token', 'ZONEID': 'zone'})
+        urls = ['http://www.example.com/%d/' % i for i in range(65)]
+
+        backend.purge_batch(urls)
+
+        self.assertEqual(delete.call_count, 3)
+        self.assertEqual(
+            [call[1]['json']['files'] for call in delete.call_args_list],
+            [urls[:30], urls[30:60], urls[60:]]
+        )
+
+
 PURGED_URLS = []
 
 
@@ -178,6 +263,44 @@ class TestCachePurgingFunctions(TestCase):
 
         self.assertEqual(PURGED_URLS, ['http://localhost/events/', 'http://localhost/events/past/', 'http://localhost/foo'])
 
+    @override_settings(WAGTAILFRONTENDCACHE={
+        'varnish': {
+            'BACKEND': 'wagtail.contrib.frontend_cache.tests.MockBackend',
+        },
+        'varnish2': {
+            'BACKEND': 'wagtail.contrib.frontend_cache.tests.MockBackend',
+        },
+    })
+    def test_purge_with_multiple_backends(self):
+        purge_urls_from_cache(['http://localhost/foo', 'http://localhost/bar'])
+
+        self.assertEqual(sorted(PURGED_URLS), [
+            'http://localhost/bar', 'http://localhost/bar', 'http://localhost/foo', 'http://localhost/foo'
+        ])
+
+    @override_settings(WAGTAILFRONTENDCACHE_PURGE_ON_COMMIT=True)
+    @mock.patch('django.db.transaction.on_commit')
+    def test_purge_on_commit(self, on_commit):
+        purge_url_from_cache('http://localhost/foo')
+
+        # Nothing is purged until the transaction is committed
+        self.assertEqual(PURGED_URLS, [])
+        self.assertEqual(on_commit.call_count, 1)
+
+        on_commit.call_args[0][0]()
+        self.assertEqual(PURGED_URLS, ['http://localhost/foo'])
+
+    @override_settings(WAGTAILFRONTENDCACHE_PURGE_IN_BACKGROUND=True)
+    @mock.patch('threading.Thread')
+    def test_purge_in_background(self, Thread):
+        purge_url_from_cache('http://localhost/foo')
+
+        self.assertEqual(PURGED_URLS, [])
+        Thread.return_value.start.assert_called_once_with()
+
+        Thread.call_args[1]['target']()
+        self.assertEqual(PURGED_URLS, ['http://localhost/foo'])
+
 
 @override_settings(WAGTAILFRONTENDCACHE={
     'varnish': {
@@ -209,6 +332,67 @@ class TestCachePurgingSignals(TestCase):
         page.save_revision().publish()
         self.assertEqual(PURGED_URLS, [])
 
+    @mock.patch('wagtail.contrib.frontend_cache.tests.MockBackend.purge_batch')
+    def test_batch_purges(self, purge_batch):
+        page = EventIndex.objects.get(url_path='/home/events/')
+
+        with batch_purges():
+            page.save_revision().publish()
+            page.save_revision().publish()
+            page.unpublish()
+
+            # Nothing is purged until the block exits
+            purge_batch.assert_not_called()
+
+        # The URLs are purged once, in a single batch
+        purge_batch.assert_called_once_with(['http://localhost/events/', 'http://localhost/events/past/'])
+
+    @mock.patch('wagtail.contrib.frontend_cache.tests.MockBackend.purge_batch')
+    def test_nested_batch_purges(self, purge_batch):
+        page = EventIndex.objects.get(url_path='/home/events/')
+
+        with batch_purges():
+            with batch_purges():
+                page.save_revision().publish()
+
+            purge_batch.assert_not_called()
+            purge_url_from_cache('http://localhost/foo')
+
+            # Purges that don't go through the queue aren't held back
+            purge_batch.assert_called_once_with(['http://localhost/foo'])
+
+        self.assertEqual(purge_batch.call_count, 2)
+        purge_batch.assert_called_with(['http://localhost/events/', 'http://localhost/events/past/'])
+
+    @mock.patch('wagtail.contrib.frontend_cache.tests.MockBackend.purge_batch')
+    def test_batch_purges_middleware(self, purge_batch):
+        page = EventIndex.objects.get(url_path='/home/events/')
+
+        def get_response(request):
+            page.save_revision().publish()
+            page.save_revision().publish()
+            purge_batch.assert_not_called()
+            return 'response'
+
+        middleware = BatchPurgesMiddleware(get_response)
+        self.assertEqual(middleware('request'), 'response')
+        purge_batch.assert_called_once_with(['http://localhost/events/', 'http://localhost/events/past/'])
+
+    @override_settings(WAGTAILFRONTENDCACHE_PURGE_ON_COMMIT=True)
+    @mock.patch('django.db.transaction.on_commit')
+    def test_purges_are_coalesced_until_commit(self, on_commit):
+        page = EventIndex.objects.get(url_path='/home/events/')
+        page.save_revision().publish()
+        page.unpublish()
+
+        self.assertEqual(PURGED_URLS, [])
+
+        # Run the commit hooks
+        for args, kwargs in on_commit.call_args_list:
+            args[0]()
+
+        self.assertEqual(PURGED_URLS, ['http://localhost/events/', 'http://localhost/events/past/'])
+
     @override_settings(ROOT_URLCONF='wagtail.tests.urls_multilang',
                        LANGUAGE_CODE='en',
                        WAGTAILFRONTENDCACHE_LANGUAGES=['en'])
@@ -1,13 +1,30 @@
 import logging
 import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.dispatch import receiver
 from django.utils.module_loading import import_string
 from django.utils.six.moves.urllib.parse import urlparse, urlunparse
 
 logger = logging.getLogger('wagtail.frontendcache')
 
+# URLs waiting to be purged by the current thread. See queue_urls_for_purge
+_purge_queue = threading.local()
+
+# The backends configured by the WAGTAILFRONTENDCACHE settings. These are kept
+# for the life of the process, so their connections to the cache servers are
+# reused from one purge to the next
+_configured_backends = None
+_configured_backends_lock = threading.Lock()
+
 
 class InvalidFrontendCacheBackendError(ImproperlyConfigured):
     pass
@@ -55,11 +72,36 @@ def get_backends(backend_settings=None, backends=None):
     return backend_objects
 
 
+def _get_configured_backends(backends=None):
+    global _configured_backends
+
+    with _configured_backends_lock:
+        if _configured_backends is None:
+            _configured_backends = get_backends()
+
+    return {
+        backend_name: backend
+        for backend_name, backend in _configured_backends.items()
+        if backends is None or backend_name in backends
+    }
+
+
+@receiver(setting_changed)
+def reset_configured_backends(**kwargs):
+    global _configured_backends
+
+    if kwargs['setting'] in ('WAGTAILFRONTENDCACHE', 'WAGTAILFRONTENDCACHE_LOCATION'):
+        with _configured_backends_lock:
+            _configured_backends = None
+
+
 def purge_url_from_cache(url, backend_settings=None, backends=None):
     purge_urls_from_cache([url], backend_settings=backend_settings, backends=backends)
 
 
 def purge_urls_from_cache(urls, backend_settings=None, backends=None):
+    urls = list(urls)
+
     # Convert each url to urls one for each managed language (WAGTAILFRONTENDCACHE_LANGUAGES setting).
     # The managed languages are common to all the defined backends.
     # This depends on settings.USE_I18N
@@ -90,11 +132,73 @@ def purge_urls_from_cache(urls, backend_settings=None, backends=None):
 
         urls = new_urls
 
-    for backend_name, backend in get_backends(backend_settings, backends).items():
-        for url in urls:
-            logger.info("[%s] Purging URL: %s", backend_name, url)
+    if not urls:
+        return
+
+    if backend_settings is None:
+        backends = _get_configured_backends(backends)
+    else:
+        backends = get_backends(backend_settings, backends)
+
+    if not backends:
+        return
+
+    def purge():
+        try:
+            _purge_urls_with_backends(urls, backends)
+        finally:
+            # Backends for other settings are only used for this purge
+            if backend_settings is not None:
+                for backend in backends.values():
+                    backend.close()
+
+    if getattr(settings, 'WAGTAILFRONTENDCACHE_PURGE_IN_BACKGROUND', False):
+        def purge_in_background():
+            thread = threading.Thread(target=purge)
+            thread.daemon = True
+            thread.start()
+
+        callback = purge_in_background
+    else:
+        callback = purge
+
+    if getattr(settings, 'WAGTAILFRONTENDCACHE_PURGE_ON_COMMIT', False):
+        # Wait until the changes that caused the purge are visible to other
+        # requests, otherwise the cache could be refilled with stale content.
+        # Runs immediately when there is no transaction.
+        transaction.on_commit(callback)
+    else:
+        callback()
+
+
+def _purge_urls_with_backend(backend_name, backend, urls):
+    for url in urls:
+        logger.info("[%s] Purging URL: %s", backend_name, url)
+
+    start_time = time.time()
+    backend.purge_batch(urls)
+
+    logger.info("[%s] Purged %d URLs in %.3f seconds", backend_name, len(urls), time.time() - start_time)
+
 
-        backend.purge_batch(urls)
+def _purge_urls_with_backends(urls, backends):
+    if len(backends) == 1:
+        for backend_name, backend in backends.items():
+            _purge_urls_with_backend(backend_name, backend, urls)
+
+        return
+
+    # Send the purge requests to all backends at the same time so publishing a
+    # page doesn't have to wait for each cache to respond in turn
+    with ThreadPoolExecutor(max_workers=len(backends)) as executor:
+        futures = [
+            executor.submit(_purge_urls_with_backend, backend_name, backend, urls)
+            for backend_name, backend in backends.items()
+        ]
+
+    # Raise any exceptions from the backends
+    for future in futures:
+        future.result()
 
 
 def _get_page_cached_urls(page):
@@ -174,3 +278,76 @@ class PurgeBatch:
           will only be sent to these backends
         """
         purge_urls_from_cache(self.urls, backend_settings, backends)
+
+
+def _get_purge_queue():
+    queue = getattr(_purge_queue, 'urls', None)
+    if queue is None:
+        queue = _purge_queue.urls = OrderedDict()
+
+    return queue
+
+
+def queue_urls_for_purge(urls):
+    """
+    Purges the given URLs, coalescing them with other purges made by the
+    current thread where possible:
+
+    - Inside a ``batch_purges()`` block, the URLs are purged when the block
+      exits.
+    - Inside a database transaction, when ``WAGTAILFRONTENDCACHE_PURGE_ON_COMMIT``
+      is set, the URLs are purged when the transaction is committed.
+
+    URLs are only purged once, however many times they are queued. Outside
+    of these cases, the URLs are purged immediately.
+    """
+    queue = _get_purge_queue()
+    queue.update((url, None) for url in urls)
+
+    if getattr(_purge_queue, 'depth', 0):
+        return
+
+    if getattr(settings, 'WAGTAILFRONTENDCACHE_PURGE_ON_COMMIT', False):
+        # Runs immediately when there is no transaction. The first callback
+        # to run purges the whole queue, the others find it empty. If the
+        # transaction is rolled back, its URLs stay queued and are purged
+        # along with the next batch, which is harmless
+        transaction.on_commit(flush_purge_queue)
+    else:
+        flush_purge_queue()
+
+
+def queue_page_for_purge(page):
+    queue_urls_for_purge(_get_page_cached_urls(page))
+
+
+def flush_purge_queue():
+    """
+    Purges all URLs queued by the current thread, in one batch per backend
+    """
+    urls = list(_get_purge_queue())
+    _purge_queue.urls = None
+
+    if urls:
+        PurgeBatch(urls).purge()
+
+
+@contextmanager
+def batch_purges():
+    """
+    Holds back the purges queued by the current thread (through
+    ``queue_urls_for_purge``, which is used by the signal handlers) until the
+    end of the block, so each URL is only purged once. Can also be used as a
+    decorator.
+
+    Blocks can be nested, the queue is purged when the outermost one exits.
+    """
+    _purge_queue.depth = getattr(_purge_queue, 'depth', 0) + 1
+
+    try:
+        yield
+    finally:
+        _purge_queue.depth -= 1
+
+        if not _purge_queue.depth:
+            flush_purge_queue()
@@ -2,6 +2,7 @@ from warnings import warn
 
 from django.contrib.postgres.search import SearchQuery as PostgresSearchQuery
 from django.contrib.postgres.search import SearchRank, SearchVector
+from django.core.exceptions import EmptyResultSet
 from django.db import DEFAULT_DB_ALIAS, NotSupportedError, connections, transaction
 from django.db.models import F, Manager, Q, TextField, Value
 from django.db.models.constants import LOOKUP_SEP
@@ -316,6 +317,15 @@ class PostgresSearchResults(BaseSearchResults):
             self.backend.config, None, None,
             score_field=self._score_field).count()
 
+    def _get_cache_key_data(self):
+        try:
+            return self.query_compiler.search(
+                self.backend.config, None, None).query.sql_with_params()
+        except EmptyResultSet:
+            # The queryset can't match anything (e.g. .none()), so there is
+            # no SQL to identify it by. These queries are cheap, so don't cache them
+            return None
+
 
 class PostgresSearchRebuilder:
     def __init__(self, index):
@@ -373,6 +383,7 @@ class PostgresSearchBackend(BaseSearchBackend):
     def reset_index(self):
         for connection in get_postgresql_connections():
             IndexEntry._default_manager.using(connection.alias).delete()
+        self.invalidate_results_cache()
 
     def add_type(self, model):
         pass  # Not needed.
@@ -382,13 +393,16 @@ class PostgresSearchBackend(BaseSearchBackend):
 
     def add(self, obj):
         self.get_index_for_object(obj).add_item(obj)
+        self.invalidate_results_cache()
 
     def add_bulk(self, model, obj_list):
         if obj_list:
             self.get_index_for_object(obj_list[0]).add_items(model, obj_list)
+            self.invalidate_results_cache()
 
     def delete(self, obj):
         self.get_index_for_object(obj).delete_item(obj)
+        self.invalidate_results_cache()
 
 
 SearchBackend = PostgresSearchBackend
@@ -6,3 +6,7 @@ class WagtailRedirectsAppConfig(AppConfig):
     name = 'wagtail.contrib.redirects'
     label = 'wagtailredirects'
     verbose_name = _("Wagtail redirects")
+
+    def ready(self):
+        from wagtail.contrib.redirects.signal_handlers import register_signal_handlers
+        register_signal_handlers()
@@ -0,0 +1,99 @@
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from wagtail.contrib.redirects.models import Redirect
+from wagtail.contrib.redirects.utils import invalidate_redirect_tables
+from wagtail.core.models import Site
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates redirects from a CSV file. Each row contains the path to redirect from "
+        "followed by the path or URL to redirect to."
+    )
+
+    def add_arguments(self, parser):
+        # Positional arguments
+        parser.add_argument('csv_file')
+
+        parser.add_argument(
+            '--site', type=int, dest='site_id', default=None,
+            help="ID of the site the redirects apply to. Defaults to all sites.")
+        parser.add_argument(
+            '--temporary', action='store_true', dest='temporary', default=False,
+            help="Create temporary (302) redirects rather than permanent ones.")
+        parser.add_argument(
+            '--skip-header', action='store_true', dest='skip_header', default=False,
+            help="Ignore the first row of the file.")
+        parser.add_argument(
+            '--batch-size', type=int, dest='batch_size', default=1000,
+            help="Number of redirects to insert per query.")
+        parser.add_argument(
+            '--dryrun', action='store_true', dest='dryrun', default=False,
+            help="Dry run -- don't change anything.")
+
+    def handle(self, *args, **options):
+        site = None
+        if options['site_id'] is not None:
+            try:
+                site = Site.objects.get(id=options['site_id'])
+            except Site.DoesNotExist:
+                raise CommandError("Site with ID %d does not exist" % options['site_id'])
+
+        old_path_max_length = Redirect._meta.get_field('old_path').max_length
+        redirect_link_max_length = Redirect._meta.get_field('redirect_link').max_length
+
+        # Paths that already have a redirect on this site are skipped
+        existing_paths = set(Redirect.objects.filter(site=site).values_list('old_path', flat=True))
+
+        redirects = []
+        skipped = 0
+
+        with open(options['csv_file'], newline='', encoding='utf-8') as csv_file:
+            reader = csv.reader(csv_file)
+            if options['skip_header']:
+                next(reader, None)
+
+            for row in reader:
+                # Ignore blank lines
+                if not any(value.strip() for value in row):
+                    continue
+
+                if len(row) < 2:
+                    raise CommandError("Line %d: expected two columns, got %d" % (reader.line_num, len(row)))
+
+                old_path = Redirect.normalise_path(row[0])
+                redirect_link = row[1].strip()
+
+                if len(old_path) > old_path_max_length or len(redirect_link) > redirect_link_max_length:
+                    self.stderr.write("Line %d: skipping redirect longer than %d characters" % (
+                        reader.line_num, max(old_path_max_length, redirect_link_max_length)))
+                    skipped += 1
+                    continue
+
+                if old_path in existing_paths:
+                    skipped += 1
+                    continue
+
+                existing_paths.add(old_path)
+                redirects.append(Redirect(
+                    old_path=old_path,
+                    site=site,
+                    redirect_link=redirect_link,
+                    is_permanent=not options['temporary'],
+                ))
+
+        if options['dryrun']:
+            self.stdout.write("Would create %d redirects (%d skipped)" % (len(redirects), skipped))
+            return
+
+        # bulk_create doesn't send the post_save signal, so the redirect
+        # tables are invalidated once all redirects are created instead
+        with transaction.atomic():
+            Redirect.objects.bulk_create(redirects, batch_size=options['batch_size'])
+
+        invalidate_redirect_tables()
+
+        self.stdout.write("Created %d redirects (%d skipped)" % (len(redirects), skipped))
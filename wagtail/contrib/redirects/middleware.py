@@ -4,7 +4,7 @@ from django import http
 from django.utils.deprecation import MiddlewareMixin
 from django.utils.encoding import uri_to_iri
 
-from wagtail.contrib.redirects import models
+from wagtail.contrib.redirects import models, utils
 
 
 def _get_redirect(request, path):
@@ -25,6 +25,14 @@ def get_redirect(request, path):
     return redirect
 
 
+def get_redirect_from_table(request, path):
+    redirect = utils.get_redirect_from_table(request.site, path)
+    if not redirect:
+        # try unencoding the path
+        redirect = utils.get_redirect_from_table(request.site, uri_to_iri(path))
+    return redirect
+
+
 # Originally pinched from: https://github.com/django/django/blob/master/django/contrib/redirects/middleware.py
 class RedirectMiddleware(MiddlewareMixin):
     def process_response(self, request, response):
@@ -40,8 +48,9 @@ class RedirectMiddleware(MiddlewareMixin):
         # Get the path
         path = models.Redirect.normalise_path(request.get_full_path())
 
-        # Find redirect
-        redirect = get_redirect(request, path)
+        # Find redirect. The redirects are looked up in a table held in
+        # memory, so 404s don't cause any database queries
+        redirect = get_redirect_from_table(request, path)
         if redirect is None:
             # Get the path without the query string or params
             path_without_query = urlparse(path).path
@@ -50,7 +59,7 @@ class RedirectMiddleware(MiddlewareMixin):
                 # don't try again if we know we will get the same response
                 return response
 
-            redirect = get_redirect(request, path_without_query)
+            redirect = get_redirect_from_table(request, path_without_query)
             if redirect is None:
                 return response
 
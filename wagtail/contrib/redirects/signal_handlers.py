@@ -0,0 +1,13 @@
+from django.db.models.signals import post_delete, post_save
+
+from wagtail.contrib.redirects.models import Redirect
+from wagtail.contrib.redirects.utils import invalidate_redirect_tables
+
+
+def redirect_changed_signal_handler(**kwargs):
+    invalidate_redirect_tables()
+
+
+def register_signal_handlers():
+    post_save.connect(redirect_changed_signal_handler, sender=Redirect)
+    post_delete.connect(redirect_changed_signal_handler, sender=Redirect)
@@ -1,8 +1,17 @@
 # -*- coding: utf-8 -*-
-from django.test import TestCase, override_settings
+import os
+import tempfile
+
+import mock
+from django.core.cache import cache
+from django.core.management import call_command
+from django.http import HttpResponseNotFound
+from django.test import RequestFactory, TestCase, override_settings
 from django.urls import reverse
+from django.utils.six import StringIO
 
 from wagtail.contrib.redirects import models
+from wagtail.contrib.redirects.middleware import RedirectMiddleware
 from wagtail.core.models import Page, Site
 from wagtail.tests.utils import WagtailTestUtils
 
@@ -274,6 +283,172 @@ class TestRedirects(TestCase):
         self.assertRedirects(response, '/redirectto', status_code=301, fetch_redirect_response=False)
 
 
+@override_settings(CACHES={
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+})
+class TestRedirectTable(TestCase):
+    fixtures = ['test.json']
+
+    def setUp(self):
+        self.site = Site.objects.get(is_default_site=True)
+        self.middleware = RedirectMiddleware()
+
+        # The version of the tables is only changed when the transaction is
+        # committed, which never happens in a TestCase
+        cache.clear()
+        self.on_commit_callbacks = []
+        patcher = mock.patch('django.db.transaction.on_commit', side_effect=self.on_commit_callbacks.append)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def commit(self):
+        while self.on_commit_callbacks:
+            self.on_commit_callbacks.pop(0)()
+
+    def get_response(self, path):
+        request = RequestFactory().get(path)
+        request.site = self.site
+        return self.middleware.process_response(request, HttpResponseNotFound())
+
+    def test_no_queries_for_404(self):
+        models.Redirect.objects.create(old_path='/redirectme', redirect_link='/redirectto')
+
+        # Build the table
+        self.get_response('/foo/')
+
+        with self.assertNumQueries(0):
+            response = self.get_response('/notredirected/?foo=bar')
+            self.assertEqual(response.status_code, 404)
+
+            response = self.get_response('/redirectme/?utm_source=irrelevant')
+            self.assertEqual(response.status_code, 301)
+            self.assertEqual(response['Location'], '/redirectto')
+
+    def test_table_is_invalidated_on_save(self):
+        redirect = models.Redirect.objects.create(old_path='/redirectme', redirect_link='/redirectto')
+        self.assertEqual(self.get_response('/redirectme/')['Location'], '/redirectto')
+
+        redirect.redirect_link = '/somewhere-else'
+        redirect.save()
+        self.commit()
+        self.assertEqual(self.get_response('/redirectme/')['Location'], '/somewhere-else')
+
+        models.Redirect.objects.create(old_path='/another', redirect_link='/redirectto')
+        self.commit()
+        self.assertEqual(self.get_response('/another/').status_code, 301)
+
+    def test_table_is_invalidated_on_commit(self):
+        redirect = models.Redirect.objects.create(old_path='/redirectme', redirect_link='/redirectto')
+        self.commit()
+        self.assertEqual(self.get_response('/redirectme/')['Location'], '/redirectto')
+
+        # Until the change is committed, other processes could rebuild their
+        # tables from the old redirect, so the version isn't changed yet
+        redirect.redirect_link = '/somewhere-else'
+        redirect.save()
+        self.assertEqual(self.get_response('/redirectme/')['Location'], '/redirectto')
+
+        self.commit()
+        self.assertEqual(self.get_response('/redirectme/')['Location'], '/somewhere-else')
+
+    def test_table_max_age(self):
+        models.Redirect.objects.create(old_path='/redirectme', redirect_link='/redirectto')
+        self.commit()
+        self.assertEqual(self.get_response('/redirectme/')['Location'], '/redirectto')
+
+        # A change that didn't invalidate the tables isn't seen until they
+        # are too old
+        models.Redirect.objects.filter(old_path='/redirectme').update(redirect_link='/somewhere-else')
+        self.assertEqual(self.get_response('/redirectme/')['Location'], '/redirectto')
+
+        with override_settings(WAGTAILREDIRECTS_TABLE_MAX_AGE=0):
+            self.assertEqual(self.get_response('/redirectme/')['Location'], '/somewhere-else')
+
+    def test_table_is_invalidated_on_delete(self):
+        redirect = models.Redirect.objects.create(old_path='/redirectme', redirect_link='/redirectto')
+        self.assertEqual(self.get_response('/redirectme/').status_code, 301)
+
+        redirect.delete()
+        self.commit()
+        self.assertEqual(self.get_response('/redirectme/').status_code, 404)
+
+    def test_page_redirect_follows_page_url(self):
+        christmas_page = Page.objects.get(url_path='/home/events/christmas/')
+        models.Redirect.objects.create(old_path='/xmas', redirect_page=christmas_page)
+        self.commit()
+        self.assertEqual(self.get_response('/xmas/')['Location'], '/events/christmas/')
+
+        # Changing the page's URL doesn't change the redirect, but it still
+        # goes to the right place
+        christmas_page = christmas_page.specific
+        christmas_page.slug = 'xmas'
+        christmas_page.save()
+        self.assertEqual(self.get_response('/xmas/')['Location'], '/events/xmas/')
+
+
+class TestImportRedirectsCommand(TestCase):
+    fixtures = ['test.json']
+
+    def import_redirects(self, content, *args):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8') as csv_file:
+            csv_file.write(content)
+
+        try:
+            stdout = StringIO()
+            call_command('import_redirects', csv_file.name, *args, stdout=stdout, stderr=StringIO())
+            return stdout.getvalue()
+        finally:
+            os.unlink(csv_file.name)
+
+    def test_import(self):
+        output = self.import_redirects(
+            "/old-path/,/new-path/\n"
+            "\n"
+            "old-with-query?b=2&a=1,http://example.com/\n"
+        )
+
+        self.assertEqual(output, "Created 2 redirects (0 skipped)\n")
+
+        redirect = models.Redirect.objects.get(old_path='/old-path')
+        self.assertEqual(redirect.redirect_link, '/new-path/')
+        self.assertIsNone(redirect.site)
+        self.assertTrue(redirect.is_permanent)
+
+        redirect = models.Redirect.objects.get(old_path='/old-with-query?a=1&b=2')
+        self.assertEqual(redirect.redirect_link, 'http://example.com/')
+
+    def test_import_skips_header_and_existing_redirects(self):
+        models.Redirect.objects.create(old_path='/old-path', redirect_link='/existing/')
+
+        output = self.import_redirects(
+            "from,to\n"
+            "/old-path/,/new-path/\n"
+            "/other-path/,/new-path/\n"
+            "/other-path,/duplicate/\n",
+            '--skip-header'
+        )
+
+        self.assertEqual(output, "Created 1 redirects (2 skipped)\n")
+        self.assertEqual(models.Redirect.objects.get(old_path='/old-path').redirect_link, '/existing/')
+        self.assertEqual(models.Redirect.objects.get(old_path='/other-path').redirect_link, '/new-path/')
+
+    def test_import_with_site_and_temporary(self):
+        site = Site.objects.get(is_default_site=True)
+        self.import_redirects("/old-path/,/new-path/\n", '--site', str(site.id), '--temporary')
+
+        redirect = models.Redirect.objects.get(old_path='/old-path')
+        self.assertEqual(redirect.site, site)
+        self.assertFalse(redirect.is_permanent)
+
+    def test_dryrun(self):
+        output = self.import_redirects("/old-path/,/new-path/\n", '--dryrun')
+
+        self.assertEqual(output, "Would create 1 redirects (0 skipped)\n")
+        self.assertFalse(models.Redirect.objects.exists())
+
+
 class TestRedirectsIndexView(TestCase, WagtailTestUtils):
     def setUp(self):
         self.login()
@@ -0,0 +1,100 @@
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+from wagtail.contrib.redirects.models import Redirect
+
+# Cache key of the version of the redirect tables. The tables built by each
+# process are thrown away when this changes
+VERSION_CACHE_KEY = 'wagtailredirects:version'
+
+# Fields of the redirects stored in the tables
+REDIRECT_FIELDS = ('old_path', 'id', 'site_id', 'is_permanent', 'redirect_page_id', 'redirect_link')
+
+_redirect_tables = {}
+_redirect_tables_lock = threading.Lock()
+
+
+def _get_version():
+    version = cache.get(VERSION_CACHE_KEY)
+
+    if version is None:
+        # Use add so concurrent processes agree on the same version
+        cache.add(VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+        version = cache.get(VERSION_CACHE_KEY)
+
+    return version
+
+
+def invalidate_redirect_tables():
+    """
+    Makes all processes rebuild their redirect tables the next time they are
+    used. Called whenever a redirect is saved or deleted.
+
+    The version is changed once the current transaction is committed, so that
+    other processes can't rebuild their tables from the old redirects.
+    """
+    transaction.on_commit(lambda: cache.set(VERSION_CACHE_KEY, uuid.uuid4().hex, None))
+
+
+def _build_redirect_table(site_id):
+    redirects = Redirect.objects.all()
+    if site_id is not None:
+        redirects = redirects.filter(Q(site_id=site_id) | Q(site__isnull=True))
+
+    table = {}
+    for values in redirects.values_list(*REDIRECT_FIELDS).iterator():
+        old_path = values[0]
+
+        # When a path has both a site-specific redirect and a redirect for any
+        # site, the redirect for the requested site wins. When there is no
+        # site, the redirect for any site wins
+        if old_path not in table or values[2] == site_id:
+            table[old_path] = values
+
+    return table
+
+
+def get_redirect_table(site):
+    """
+    Returns a dict mapping each normalised path that can be redirected on the
+    given site to the values of REDIRECT_FIELDS for its Redirect.
+
+    Tables are built once per process and site, and rebuilt when the version
+    stored in the cache changes, so looking up a path doesn't query the
+    database. They are also rebuilt after WAGTAILREDIRECTS_TABLE_MAX_AGE
+    seconds, in case a change to the version was missed.
+    """
+    site_id = site.id if site else None
+    version = _get_version()
+    max_age = getattr(settings, 'WAGTAILREDIRECTS_TABLE_MAX_AGE', 300)
+    now = time.time()
+
+    entry = _redirect_tables.get(site_id)
+    if entry is not None and entry[0] == version and now - entry[1] < max_age:
+        return entry[2]
+
+    table = _build_redirect_table(site_id)
+    with _redirect_tables_lock:
+        _redirect_tables[site_id] = (version, now, table)
+
+    return table
+
+
+def get_redirect_from_table(site, path):
+    """
+    Finds the redirect for the given normalised path on the given site without
+    querying the database. Returns None if there isn't one.
+    """
+    values = get_redirect_table(site).get(path)
+    if values is None:
+        return None
+
+    # Return a new instance every time, so the destination page is looked
+    # up again rather than stored in the table
+    return Redirect(**dict(zip(REDIRECT_FIELDS, values)))
@@ -0,0 +1,105 @@
+from django.test import RequestFactory, TestCase
+
+from wagtail.contrib.routable_page.models import RoutablePageMixin, route
+from wagtail.tests.benchmark import Benchmark
+
+# The routes of a blog index with date, tag, category and author archives.
+# Each is given as (name, pattern, an example path)
+ROUTES = [
+    ('latest', r'^latest/$', 'latest/'),
+    ('popular', r'^popular/$', 'popular/'),
+    ('featured', r'^featured/$', 'featured/'),
+    ('feed', r'^feed/$', 'feed/'),
+    ('atom_feed', r'^feed/atom/$', 'feed/atom/'),
+    ('sitemap', r'^sitemap/$', 'sitemap/'),
+    ('search', r'^search/$', 'search/'),
+    ('page', r'^page/(\d+)/$', 'page/3/'),
+    ('year', r'^(\d{4})/$', '2018/'),
+    ('year_page', r'^(\d{4})/page/(\d+)/$', '2018/page/2/'),
+    ('month', r'^(\d{4})/(\d{2})/$', '2018/06/'),
+    ('month_page', r'^(\d{4})/(\d{2})/page/(\d+)/$', '2018/06/page/2/'),
+    ('day', r'^(\d{4})/(\d{2})/(\d{2})/$', '2018/06/21/'),
+    ('post', r'^(\d{4})/(\d{2})/(\d{2})/([\w-]+)/$', '2018/06/21/hello-world/'),
+    ('tags', r'^tags/$', 'tags/'),
+    ('tag', r'^tags/([\w-]+)/$', 'tags/django/'),
+    ('tag_page', r'^tags/([\w-]+)/page/(\d+)/$', 'tags/django/page/2/'),
+    ('tag_feed', r'^tags/([\w-]+)/feed/$', 'tags/django/feed/'),
+    ('categories', r'^categories/$', 'categories/'),
+    ('category', r'^categories/([\w-]+)/$', 'categories/news/'),
+    ('category_page', r'^categories/([\w-]+)/page/(\d+)/$', 'categories/news/page/2/'),
+    ('category_feed', r'^categories/([\w-]+)/feed/$', 'categories/news/feed/'),
+    ('authors', r'^authors/$', 'authors/'),
+    ('author', r'^authors/(?P<username>[\w-]+)/$', 'authors/karl/'),
+    ('author_page', r'^authors/(?P<username>[\w-]+)/page/(?P<page>\d+)/$', 'authors/karl/page/2/'),
+    ('author_feed', r'^authors/(?P<username>[\w-]+)/feed/$', 'authors/karl/feed/'),
+    ('series', r'^series/([\w-]+)/$', 'series/wagtail-2/'),
+    ('archive', r'^archive/$', 'archive/'),
+    ('drafts', r'^drafts/([\w-]+)/$', 'drafts/abc123/'),
+    ('legacy_post', r'^([\w-]+)/$', 'hello-world/'),
+]
+
+
+def make_view(name):
+    def view(self, request, *args, **kwargs):
+        return name
+
+    view.__name__ = name
+    return view
+
+
+BlogIndex = type('BlogIndex', (RoutablePageMixin, ), {
+    name: route(pattern, name=name)(make_view(name))
+    for name, pattern, path in ROUTES
+})
+
+
+class BenchRoutablePageRoute(Benchmark, TestCase):
+    """
+    Routes 3000 requests to the subpages of a page with 30 routes, as the
+    serve view does for every request.
+    """
+
+    def setUp(self):
+        self.page = BlogIndex()
+        self.page.live = True
+        self.request = RequestFactory().get('/')
+
+        # Make sure the routes are compiled before the benchmark starts
+        self.page.route(self.request, [])
+
+        paths = [path for name, pattern, path in ROUTES] + ['']
+        self.path_components = [
+            [component for component in paths[i % len(paths)].split('/') if component]
+            for i in range(3000)
+        ]
+
+    def bench(self):
+        for path_components in self.path_components:
+            self.page.route(self.request, path_components)
+
+
+class BenchRoutablePageReverse(Benchmark, TestCase):
+    """
+    Reverses 3000 subpage URLs of a page with 30 routes, as the routablepageurl
+    template tag does for every link to a subpage.
+    """
+
+    def setUp(self):
+        self.page = BlogIndex()
+        self.reversals = [
+            ('latest', (), {}),
+            ('page', (3, ), {}),
+            ('month', ('2018', '06'), {}),
+            ('post', ('2018', '06', '21', 'hello-world'), {}),
+            ('tag', ('django', ), {}),
+            ('category', ('news', ), {}),
+            ('author', (), {'username': 'karl'}),
+            ('author_page', (), {'username': 'karl', 'page': 2}),
+            ('legacy_post', ('hello-world', ), {}),
+        ] * 334
+
+        self.page.reverse_subpage('latest')
+
+    def bench(self):
+        for name, args, kwargs in self.reversals:
+            self.page.reverse_subpage(name, args=args, kwargs=kwargs)
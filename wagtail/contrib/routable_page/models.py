@@ -1,7 +1,12 @@
+import re
+from collections import defaultdict
+from functools import lru_cache
+
 import django
 from django.conf.urls import url
 from django.http import Http404
 from django.template.response import TemplateResponse
+from django.urls import Resolver404
 
 from wagtail.core.models import Page
 from wagtail.core.url_routing import RouteResult
@@ -15,6 +20,14 @@ else:
 
 _creation_counter = 0
 
+# Maximum number of subpage URLs that are kept after being reversed, for all
+# routable page types together
+REVERSE_SUBPAGE_CACHE_SIZE = 1000
+
+# Matches the literal text at the start of a route's pattern, and the
+# character following it
+LITERAL_PREFIX_RE = re.compile(r'\^([^.^$*+?{}\[\]\\|()]*)(.?)')
+
 
 def route(pattern, name=None):
     def decorator(view_func):
@@ -36,6 +49,67 @@ def route(pattern, name=None):
     return decorator
 
 
+def has_top_level_alternation(pattern):
+    """
+    Returns True if the given regex pattern has a | outside of any group, so
+    that the whole pattern is a choice between alternatives
+    """
+    depth = 0
+    in_class = False
+    escaped = False
+
+    for char in pattern:
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif in_class:
+            if char == ']':
+                in_class = False
+        elif char == '[':
+            in_class = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            return True
+
+    return False
+
+
+def get_route_first_segment(url_pattern):
+    """
+    Returns the first path segment of all paths that the given route can
+    match, or None if the route may match paths starting with different
+    segments (or if that can't be told from its pattern)
+    """
+    if django.VERSION >= (2, 0):
+        regex = url_pattern.pattern.regex
+    else:  # Django 1.11 fallback
+        regex = url_pattern.regex
+
+    if has_top_level_alternation(regex.pattern):
+        # Each alternative may start with a different segment
+        return
+
+    match = LITERAL_PREFIX_RE.match(regex.pattern)
+    if match is None:
+        return
+
+    literal, next_char = match.groups()
+    if next_char and next_char in '?*+{':
+        # The last character of the literal text is optional or repeated, so
+        # it may not be followed by the rest of the literal text
+        return
+
+    if '/' in literal:
+        return literal.split('/', 1)[0]
+    elif next_char == '$':
+        # The whole pattern is literal
+        return literal
+
+
 class RoutablePageMixin:
     """
     This class can be mixed in to a Page model, allowing extra routes to be
@@ -83,6 +157,41 @@ class RoutablePageMixin:
 
         return cls._routablepage_urlresolver
 
+    @classmethod
+    def get_dispatch_table(cls):
+        """
+        Returns a dictionary mapping the first segment of a subpage path to the
+        routes that may match paths starting with it, in order of precedence,
+        and a list of the routes to try for all other paths.
+        """
+        if '_routablepage_dispatch_table' not in cls.__dict__:
+            routes_by_first_segment = defaultdict(list)
+            other_routes = []
+
+            for url_pattern in cls.get_subpage_urls():
+                first_segment = get_route_first_segment(url_pattern)
+
+                if first_segment is None:
+                    # This route may match paths starting with any segment
+                    other_routes.append(url_pattern)
+                    for routes in routes_by_first_segment.values():
+                        routes.append(url_pattern)
+                else:
+                    if first_segment not in routes_by_first_segment:
+                        routes_by_first_segment[first_segment] = list(other_routes)
+                    routes_by_first_segment[first_segment].append(url_pattern)
+
+            cls._routablepage_dispatch_table = dict(routes_by_first_segment), other_routes
+
+        return cls._routablepage_dispatch_table
+
+    @classmethod
+    @lru_cache(maxsize=REVERSE_SUBPAGE_CACHE_SIZE)
+    def _reverse_subpage(cls, name, args_key, kwargs_key):
+        args = [arg for arg_type, arg in args_key]
+        kwargs = {key: value for key, value_type, value in kwargs_key}
+        return cls.get_resolver().reverse(name, *args, **kwargs)
+
     def reverse_subpage(self, name, args=None, kwargs=None):
         """
         This method takes a route name/arguments and returns a URL path.
@@ -90,18 +199,38 @@ class RoutablePageMixin:
         args = args or []
         kwargs = kwargs or {}
 
-        return self.get_resolver().reverse(name, *args, **kwargs)
+        # Include the types of arguments in the key, so that values that are
+        # equal but format differently (such as 1 and True) aren't confused
+        args_key = tuple((type(arg), arg) for arg in args)
+        kwargs_key = tuple(sorted((key, type(value), value) for key, value in kwargs.items()))
+
+        try:
+            return self._reverse_subpage(name, args_key, kwargs_key)
+        except TypeError:
+            # The arguments can't be used as a key
+            return self.get_resolver().reverse(name, *args, **kwargs)
 
     def resolve_subpage(self, path):
         """
         This method takes a URL path and finds the view to call.
         """
-        view, args, kwargs = self.get_resolver().resolve(path)
+        if not path.startswith('/'):
+            raise Resolver404({'path': path})
+
+        # Only try the routes that can match paths starting with the same segment
+        path = path[1:]
+        routes_by_first_segment, other_routes = self.get_dispatch_table()
+        routes = routes_by_first_segment.get(path.split('/', 1)[0], other_routes)
 
-        # Bind the method
-        view = view.__get__(self, type(self))
+        for url_pattern in routes:
+            match = url_pattern.resolve(path)
+            if match:
+                # Bind the method
+                view = match.func.__get__(self, type(self))
 
-        return view, args, kwargs
+                return view, match.args, match.kwargs
+
+        raise Resolver404({'path': path})
 
     def route(self, request, path_components):
         """
@@ -129,6 +258,14 @@ class RoutablePageMixin:
             return super().serve(request, *args, **kwargs)
         return view(request, *args, **kwargs)
 
+    def get_etag(self, request, *args, **kwargs):
+        # Subpage views may render anything, so their responses can't be
+        # validated from the page alone
+        return None
+
+    def get_last_modified(self, request, *args, **kwargs):
+        return None
+
     def serve_preview(self, request, mode_name):
         view, args, kwargs = self.resolve_subpage('/')
         request.is_preview = True
@@ -1,7 +1,10 @@
 import mock
+from django.conf.urls import url
+from django.http import Http404
 from django.test import RequestFactory, TestCase
 from django.urls.exceptions import NoReverseMatch
 
+from wagtail.contrib.routable_page.models import RoutablePageMixin, get_route_first_segment, route
 from wagtail.contrib.routable_page.templatetags.wagtailroutablepage_tags import routablepageurl
 from wagtail.core.models import Page, Site
 from wagtail.tests.routablepage.models import (
@@ -87,6 +90,29 @@ class TestRoutablePage(TestCase):
 
         self.assertEqual(url, 'external-no-arg/')
 
+    def test_resolve_unknown_path(self):
+        with self.assertRaises(Http404):
+            self.routable_page.resolve_subpage('/archive/month/2014/')
+
+    def test_reverse_with_equal_arguments_of_different_types(self):
+        url = self.routable_page.reverse_subpage('archive_by_year', args=(1, ))
+        self.assertEqual(url, 'archive/year/1/')
+
+        # True == 1, but isn't a valid year
+        with self.assertRaises(NoReverseMatch):
+            self.routable_page.reverse_subpage('archive_by_year', args=(True, ))
+
+    def test_reverse_with_unhashable_arguments(self):
+        class Year:
+            __hash__ = None
+
+            def __str__(self):
+                return '2014'
+
+        url = self.routable_page.reverse_subpage('archive_by_year', args=(Year(), ))
+
+        self.assertEqual(url, 'archive/year/2014/')
+
     def test_get_index_route_view(self):
         response = self.client.get(self.routable_page.url)
 
@@ -148,6 +174,90 @@ class TestRoutablePage(TestCase):
             del RoutablePageTest.descriptor
 
 
+class TestDispatchTable(TestCase):
+    def test_get_route_first_segment(self):
+        def view(request):
+            pass
+
+        self.assertEqual(get_route_first_segment(url(r'^$', view)), '')
+        self.assertEqual(get_route_first_segment(url(r'^feed$', view)), 'feed')
+        self.assertEqual(get_route_first_segment(url(r'^archive/year/(\d+)/$', view)), 'archive')
+        self.assertEqual(get_route_first_segment(url(r'^external-no-arg/$', view)), 'external-no-arg')
+
+        # These may match paths that start with different segments
+        self.assertIsNone(get_route_first_segment(url(r'^(\d+)/$', view)))
+        self.assertIsNone(get_route_first_segment(url(r'^feed', view)))
+        self.assertIsNone(get_route_first_segment(url(r'^external\-no\-arg/$', view)))
+        self.assertIsNone(get_route_first_segment(url(r'archive/', view)))
+        self.assertIsNone(get_route_first_segment(url(r'^(?i)archive/', view)))
+        self.assertIsNone(get_route_first_segment(url(r'^tag/?(?P<tag>\w+)/$', view)))
+        self.assertIsNone(get_route_first_segment(url(r'^feeds?/$', view)))
+        self.assertIsNone(get_route_first_segment(url(r'^a/$|^b/$', view)))
+        self.assertEqual(get_route_first_segment(url(r'^tag/(a|b)/$', view)), 'tag')
+        self.assertEqual(get_route_first_segment(url(r'^tag/[|]/$', view)), 'tag')
+
+    def test_resolve_optional_literal(self):
+        class TestPage(RoutablePageMixin):
+            @route(r'^tag/?(?P<tag>\w+)/$')
+            def tag(self, request, tag):
+                pass
+
+        page = TestPage()
+
+        self.assertEqual(page.resolve_subpage('/tag/foo/'), (page.tag, (), {'tag': 'foo'}))
+        self.assertEqual(page.resolve_subpage('/tagfoo/'), (page.tag, (), {'tag': 'foo'}))
+
+    def test_resolve_alternatives(self):
+        class TestPage(RoutablePageMixin):
+            @route(r'^a/$|^b/$')
+            def a_or_b(self, request):
+                pass
+
+        page = TestPage()
+
+        self.assertEqual(page.resolve_subpage('/a/')[0], page.a_or_b)
+        self.assertEqual(page.resolve_subpage('/b/')[0], page.a_or_b)
+
+    def test_routes_keep_precedence(self):
+        class TestPage(RoutablePageMixin):
+            @route(r'^archive/latest/$')
+            def latest(self, request):
+                pass
+
+            @route(r'^([\w-]+)/latest/$')
+            def category_latest(self, request, category):
+                pass
+
+            @route(r'^archive/([\w-]+)/$')
+            def archive(self, request, slug):
+                pass
+
+            @route(r'^news/latest/$')
+            def news_latest(self, request):
+                pass
+
+        page = TestPage()
+
+        self.assertEqual(page.resolve_subpage('/')[0], page.index_route)
+        self.assertEqual(page.resolve_subpage('/archive/latest/')[0], page.latest)
+        self.assertEqual(page.resolve_subpage('/archive/2014/')[0], page.archive)
+        self.assertEqual(page.resolve_subpage('/events/latest/')[0], page.category_latest)
+
+        # The earlier route that may match any segment takes precedence
+        self.assertEqual(page.resolve_subpage('/news/latest/')[0], page.category_latest)
+
+        routes_by_first_segment, other_routes = page.get_dispatch_table()
+        self.assertEqual(
+            [url_pattern.name for url_pattern in routes_by_first_segment['archive']],
+            ['latest', 'category_latest', 'archive']
+        )
+        self.assertEqual(
+            [url_pattern.name for url_pattern in routes_by_first_segment['news']],
+            ['category_latest', 'news_latest']
+        )
+        self.assertEqual([url_pattern.name for url_pattern in other_routes], ['category_latest'])
+
+
 class TestRoutablePageTemplateTag(TestCase):
     def setUp(self):
         self.home_page = Page.objects.get(id=2)
@@ -4,10 +4,13 @@ from importlib import import_module
 from django import forms
 from django.core import checks
 from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
 from django.template.loader import render_to_string
 from django.utils.encoding import force_text
 from django.utils.safestring import mark_safe
 from django.utils.text import capfirst
+from django.utils.translation import get_language
 
 # unicode_literals ensures that any render / __str__ methods returning HTML via calls to mark_safe / format_html
 # return a SafeText, not SafeBytes; necessary so that it doesn't get re-encoded when the template engine
@@ -16,6 +19,23 @@ from django.utils.text import capfirst
 __all__ = ['BaseBlock', 'Block', 'BoundBlock', 'DeclarativeSubBlocksMetaclass', 'BlockWidget', 'BlockField']
 
 
+# Each block keeps the output of all_html_declarations for each language. The
+# blocks throw these away when this version changes
+_html_declarations_version = 0
+
+
+def clear_html_declarations_cache():
+    global _html_declarations_version
+    _html_declarations_version += 1
+
+
+@receiver(setting_changed)
+def reset_html_declarations_cache(**kwargs):
+    # The rendered forms may depend on any number of settings (such as the rich
+    # text editors or date formats), so start again when any of them change
+    clear_html_declarations_cache()
+
+
 # =========================================
 # Top-level superclasses and helper objects
 # =========================================
@@ -58,6 +78,12 @@ class Block(metaclass=BaseBlock):
     """
     dependencies = []
 
+    # Whether the output of html_declarations depends only on the block definition (and the active
+    # language), so that all_html_declarations can render it once and reuse it on every form. Blocks
+    # whose forms depend on anything else - such as choices loaded from the database - should set this
+    # to False.
+    cache_html_declarations = True
+
     def __new__(cls, *args, **kwargs):
         # adapted from django.utils.deconstruct.deconstructible; capture the arguments
         # so that we can return them in the 'deconstruct' method
@@ -82,8 +108,31 @@ class Block(metaclass=BaseBlock):
         return media
 
     def all_html_declarations(self):
-        declarations = filter(bool, [block.html_declarations() for block in self.all_blocks()])
-        return mark_safe('\n'.join(declarations))
+        """
+        Return the html_declarations of self and all of its dependencies. The declarations of each
+        block are only rendered once for each language, unless the block or any of its own
+        dependencies (whose forms it may render) set cache_html_declarations to False.
+        """
+        declarations = []
+        for block in self.all_blocks():
+            if all(dependency.cache_html_declarations for dependency in block.all_blocks()):
+                declarations.append(block._get_cached_html_declarations())
+            else:
+                declarations.append(block.html_declarations())
+
+        return mark_safe('\n'.join(filter(bool, declarations)))
+
+    def _get_cached_html_declarations(self):
+        if self._html_declarations_version != _html_declarations_version:
+            self._html_declarations_cache = {}
+            self._html_declarations_version = _html_declarations_version
+
+        language = get_language()
+        try:
+            return self._html_declarations_cache[language]
+        except KeyError:
+            declarations = self._html_declarations_cache[language] = self.html_declarations()
+            return declarations
 
     def __init__(self, **kwargs):
         self.meta = self._meta_class()
@@ -96,6 +145,9 @@ class Block(metaclass=BaseBlock):
         Block.creation_counter += 1
         self.definition_prefix = 'blockdef-%d' % self.creation_counter
 
+        self._html_declarations_cache = {}
+        self._html_declarations_version = _html_declarations_version
+
         self.label = self.meta.label or ''
 
     def set_name(self, name):
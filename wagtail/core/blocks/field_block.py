@@ -19,6 +19,15 @@ from .base import Block
 class FieldBlock(Block):
     """A block that wraps a Django form field"""
 
+    @property
+    def cache_html_declarations(self):
+        # Fields with a queryset (such as ModelChoiceField) render the choices read from the
+        # database, which can change at any time, when their widget is a select box or a list
+        # of radio buttons or checkboxes. Chooser widgets don't render any choices
+        return not (
+            hasattr(self.field, 'queryset') and isinstance(self.field.widget, forms.widgets.ChoiceWidget)
+        )
+
     def id_for_label(self, prefix):
         return self.field.widget.id_for_label(prefix)
 
@@ -417,6 +426,11 @@ class ChoiceBlock(FieldBlock):
             return local_choices
         return choices_callable
 
+    @property
+    def cache_html_declarations(self):
+        # Callable choices may be different each time the form is rendered
+        return not callable(self._constructor_kwargs['choices'])
+
     def deconstruct(self):
         """
         Always deconstruct ChoiceBlock instances as if they were plain ChoiceBlocks with their
@@ -43,6 +43,12 @@ class BaseStreamBlock(Block):
                 block.set_name(name)
                 self.child_blocks[name] = block
 
+        self.child_js_initializers = {}
+        for name, block in self.child_blocks.items():
+            js_initializer = block.js_initializer()
+            if js_initializer is not None:
+                self.child_js_initializers[name] = js_initializer
+
         self.dependencies = self.child_blocks.values()
 
     def get_default(self):
@@ -97,14 +103,14 @@ class BaseStreamBlock(Block):
     def js_initializer(self):
         # compile a list of info dictionaries, one for each available block type
         child_blocks = []
-        for name, child_block in self.child_blocks.items():
+        for name in self.child_blocks:
             # each info dictionary specifies at least a block name
             child_block_info = {'name': "'%s'" % name}
 
             # if the child defines a JS initializer function, include that in the info dict
             # along with the param that needs to be passed to it for initializing an empty/default block
             # of that type
-            child_js_initializer = child_block.js_initializer()
+            child_js_initializer = self.child_js_initializers.get(name)
             if child_js_initializer:
                 child_block_info['initializer'] = child_js_initializer
 
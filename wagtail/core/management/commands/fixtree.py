@@ -1,11 +1,13 @@
 import functools
 import operator
+import time
 
+from django.contrib.contenttypes.models import ContentType
 from django.core.management.base import BaseCommand
 from django.db import models
 from django.db.models import Q
 
-from wagtail.core.models import Page
+from wagtail.core.models import TREE_CHUNK_SIZE, Page
 
 
 class Command(BaseCommand):
@@ -16,6 +18,22 @@ class Command(BaseCommand):
         parser.add_argument(
             '--noinput', action='store_false', dest='interactive', default=True,
             help='If provided, any fixes requiring user interaction will be skipped.')
+        parser.add_argument(
+            '--chunk-size', action='store', dest='chunk_size', type=int, default=TREE_CHUNK_SIZE,
+            help="Number of pages to load from the database at a time")
+
+    def find_pages_missing_subclass_records(self):
+        # Finds the pages of each type whose row in the table of their specific
+        # model is missing, with one query per page type
+        page_types = Page.objects.order_by().values_list('content_type', flat=True).distinct()
+        for content_type in ContentType.objects.filter(id__in=page_types):
+            model = content_type.model_class()
+            if model is None or model is Page or not issubclass(model, Page):
+                continue
+
+            yield from Page.objects.filter(content_type=content_type).exclude(
+                id__in=model._base_manager.values('pk')
+            )
 
     def numberlist_to_string(self, numberlist):
         # Converts a list of numbers into a string
@@ -25,15 +43,14 @@ class Command(BaseCommand):
     def handle(self, **options):
         any_problems_fixed = False
 
-        for page in Page.objects.all():
-            try:
-                page.specific
-            except page.specific_class.DoesNotExist:
-                self.stdout.write("Page %d (%s) is missing a subclass record; deleting." % (page.id, page.title))
-                any_problems_fixed = True
-                page.delete()
+        for page in self.find_pages_missing_subclass_records():
+            self.stdout.write("Page %d (%s) is missing a subclass record; deleting." % (page.id, page.title))
+            any_problems_fixed = True
+            page.delete()
 
-        (bad_alpha, bad_path, orphans, bad_depth, bad_numchild) = Page.find_problems()
+        start_time = time.time()
+        (bad_alpha, bad_path, orphans, bad_depth, bad_numchild) = Page.find_problems(chunk_size=options['chunk_size'])
+        self.stdout.write("Checked the page tree in %.1fs." % (time.time() - start_time))
 
         if bad_depth:
             self.stdout.write("Incorrect depth value found for pages: %s" % self.numberlist_to_string(bad_depth))
@@ -86,7 +103,9 @@ class Command(BaseCommand):
 
         if any_problems_fixed:
             # re-run find_problems to see if any new ones have surfaced
-            (bad_alpha, bad_path, orphans, bad_depth, bad_numchild) = Page.find_problems()
+            (bad_alpha, bad_path, orphans, bad_depth, bad_numchild) = Page.find_problems(
+                chunk_size=options['chunk_size']
+            )
 
         if any((bad_alpha, bad_path, orphans, bad_depth, bad_numchild)):
             self.stdout.write("Remaining problems (cannot fix automatically):")
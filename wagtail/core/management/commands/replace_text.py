@@ -1,51 +1,159 @@
-from django.core.management.base import BaseCommand
+import functools
+import operator
+
+from django.core.management.base import BaseCommand, CommandError
 from django.db import models
 from modelcluster.models import get_all_child_relations
 
-from wagtail.core.models import PageRevision, get_page_models
+from wagtail.core.models import Page, PageRevision, get_page_models
+from wagtail.core.page_cache import invalidate_page_cache
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+class Replace(models.Func):
+    # REPLACE(expression, text, replacement) has the same meaning on all
+    # supported databases
+    function = 'REPLACE'
+
+    def __init__(self, expression, text, replacement, **extra):
+        super().__init__(expression, models.Value(text), models.Value(replacement), **extra)
 
 
-def replace_in_model(model, from_text, to_text):
-    text_field_names = [field.name for field in model._meta.fields if (
-        isinstance(field, models.TextField) or
-        isinstance(field, models.CharField)
-    )
+def get_text_fields(model):
+    """
+    Returns the text fields stored in the database table of this model (and
+    not the tables of its parent models)
+    """
+    return [
+        field for field in model._meta.local_concrete_fields
+        if isinstance(field, (models.TextField, models.CharField)) and not field.primary_key
     ]
-    updated_fields = []
-    for field in text_field_names:
-        field_value = getattr(model, field)
-        if field_value and (from_text in field_value):
-            updated_fields.append(field)
-            setattr(model, field, field_value.replace(from_text, to_text))
 
-    if updated_fields:
-        model.save(update_fields=updated_fields)
+
+def replace_in_model(queryset, from_text, to_text, chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False):
+    """
+    Replaces from_text with to_text in the text fields of the objects in the
+    queryset, in the database. Objects containing from_text are found and
+    updated chunk_size at a time, and the number of them is returned.
+    """
+    model = queryset.model
+    fields = get_text_fields(model)
+    if not fields:
+        return 0
+
+    queryset = queryset.filter(functools.reduce(operator.or_, [
+        models.Q(**{field.attname + '__contains': from_text}) for field in fields
+    ])).order_by('pk')
+
+    count = 0
+    last_pk = None
+    while True:
+        # Find the next chunk after the last one, rather than by offset, as
+        # updated objects no longer match the filter
+        chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        pks = list(chunk.values_list('pk', flat=True)[:chunk_size])
+        if not pks:
+            break
+
+        if not dry_run:
+            model._base_manager.filter(pk__in=pks).update(**{
+                field.attname: Replace(models.F(field.attname), from_text, to_text)
+                for field in fields
+            })
+
+        count += len(pks)
+        last_pk = pks[-1]
+
+    return count
 
 
 class Command(BaseCommand):
+    help = "Replaces text in the fields of pages, their child objects and their revisions"
+
     def add_arguments(self, parser):
         # Positional arguments
         parser.add_argument('from_text')
         parser.add_argument('to_text')
 
+        parser.add_argument(
+            '--app', action='append', dest='app_labels', metavar='APP_LABEL',
+            help="Only replace text in pages of types defined in this app. Can be given more than once")
+        parser.add_argument(
+            '--live-only', action='store_true', dest='live_only', default=False,
+            help="Only replace text in live pages")
+        parser.add_argument(
+            '--dry-run', action='store_true', dest='dry_run', default=False,
+            help="Report the number of objects that contain the text, without changing them")
+        parser.add_argument(
+            '--chunk-size', action='store', dest='chunk_size', type=int, default=DEFAULT_CHUNK_SIZE,
+            help="Number of objects to update at a time")
+
+    def get_page_models(self, app_labels):
+        page_models = get_page_models()
+        if app_labels:
+            page_models = [model for model in page_models if model._meta.app_label in app_labels]
+            if not page_models:
+                raise CommandError("No page types found in: %s" % ', '.join(app_labels))
+        return page_models
+
+    def get_targets(self, page_models, page_ids):
+        """
+        Yields a queryset of the objects to replace text in for each database
+        table: the tables of the page models (and the models they inherit
+        from), then the tables of their child relations.
+        """
+        seen_models = set()
+        for page_model in page_models:
+            for model in reversed([page_model] + page_model._meta.get_parent_list()):
+                if model not in seen_models and issubclass(model, Page):
+                    seen_models.add(model)
+                    yield model._base_manager.filter(pk__in=page_ids)
+
+        seen_relations = set()
+        for page_model in page_models:
+            for rel in get_all_child_relations(page_model):
+                if (rel.related_model, rel.field.name) not in seen_relations:
+                    seen_relations.add((rel.related_model, rel.field.name))
+                    yield rel.related_model._base_manager.filter(**{rel.field.name + '__in': page_ids})
+
     def handle(self, *args, **options):
         from_text = options['from_text']
         to_text = options['to_text']
+        chunk_size = options['chunk_size']
+        dry_run = options['dry_run']
+
+        if not from_text:
+            raise CommandError("The text to replace can't be empty")
+
+        page_models = self.get_page_models(options['app_labels'])
+
+        pages = Page.objects.order_by()
+        if options['app_labels']:
+            pages = pages.filter(functools.reduce(operator.or_, [pages.exact_type_q(model) for model in page_models]))
+        if options['live_only']:
+            pages = pages.live()
+        page_ids = pages.values('pk')
+
+        targets = [PageRevision.objects.filter(page__in=page_ids)]
+        targets.extend(self.get_targets(page_models, page_ids))
 
-        for revision in PageRevision.objects.filter(content_json__contains=from_text):
-            revision.content_json = revision.content_json.replace(from_text, to_text)
-            revision.save(update_fields=['content_json'])
+        total_count = 0
+        for queryset in targets:
+            count = replace_in_model(queryset, from_text, to_text, chunk_size=chunk_size, dry_run=dry_run)
+            if count:
+                self.stdout.write("%s: %d %s" % (
+                    queryset.model._meta.label, count,
+                    "would be updated" if dry_run else "updated",
+                ))
+            total_count += count
 
-        for page_class in get_page_models():
-            self.stdout.write("scanning %s" % page_class._meta.verbose_name)
+        self.stdout.write("%d objects %s" % (total_count, "would be updated" if dry_run else "updated"))
 
-            child_relation_names = [rel.get_accessor_name() for rel in get_all_child_relations(page_class)]
+        if total_count and not dry_run:
+            # Cached pages may contain the replaced text
+            invalidate_page_cache()
 
-            # Find all pages of this exact type; exclude subclasses, as they will
-            # appear in the get_page_models() list in their own right, and this
-            # ensures that replacement happens only once
-            for page in page_class.objects.exact_type(page_class):
-                replace_in_model(page, from_text, to_text)
-                for child_rel in child_relation_names:
-                    for child in getattr(page, child_rel).all():
-                        replace_in_model(child, from_text, to_text)
+            # The objects were updated without saving them, so search indexes
+            # that aren't kept in the database need to be rebuilt
+            self.stdout.write("Run the update_index command to update the search index.")
@@ -1,18 +1,127 @@
+import time
+
+import django
+from django.contrib.contenttypes.models import ContentType
 from django.core.management.base import BaseCommand
+from django.db import connection, models, transaction
 
-from wagtail.core.models import Page
+from wagtail.core.models import TREE_CHUNK_SIZE, Page, get_page_models
+from wagtail.core.page_cache import invalidate_page_cache
 
 
 class Command(BaseCommand):
 
     help = 'Resets url_path fields on each page recursively'
 
-    def set_subtree(self, root, parent=None):
-        root.set_url_path(parent)
-        root.save(update_fields=['url_path'])
-        for child in root.get_children():
-            self.set_subtree(child, root)
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true', dest='dry_run', default=False,
+            help="List the url_path values that would be changed, without changing them")
+        parser.add_argument(
+            '--chunk-size', action='store', dest='chunk_size', type=int, default=TREE_CHUNK_SIZE,
+            help="Number of pages to load from the database, and update, at a time")
+
+    def find_changes(self, chunk_size):
+        """
+        Reads the tree in path order and yields (id, old url_path, new url_path)
+        for each page whose url_path is wrong. Pages that aren't connected to
+        a root page are skipped.
+        """
+        steplen = Page.steplen
+
+        # Page types that override set_url_path are loaded individually, so
+        # that their own set_url_path can be called
+        custom_content_types = {
+            ContentType.objects.get_for_model(model).id: model
+            for model in get_page_models()
+            if model.set_url_path is not Page.set_url_path
+        }
+
+        # The paths, ids and new url_paths of the ancestors of the current page
+        stack = []
+
+        pages = Page.objects.order_by('path').values_list('pk', 'path', 'slug', 'url_path', 'content_type_id')
+        if django.VERSION >= (2, 0):
+            pages = pages.iterator(chunk_size=chunk_size)
+        else:
+            # Before Django 2.0, iterator() doesn't take a chunk size
+            pages = pages.iterator()
+
+        for pk, path, slug, url_path, content_type_id in pages:
+            self.page_count += 1
+
+            while stack and not path.startswith(stack[-1][0]):
+                stack.pop()
+
+            if len(path) == steplen:
+                parent = None
+            elif stack and stack[-1][0] == path[:-steplen]:
+                parent = stack[-1]
+            else:
+                continue
+
+            if content_type_id in custom_content_types:
+                new_url_path = self.get_custom_url_path(custom_content_types[content_type_id], pk, parent)
+            elif parent is None:
+                # a page without a parent is the tree root, which always has a url_path of '/'
+                new_url_path = '/'
+            else:
+                new_url_path = parent[2] + slug + '/'
+
+            stack.append((path, pk, new_url_path))
+
+            if new_url_path != url_path:
+                yield pk, url_path, new_url_path
+
+    def get_custom_url_path(self, model, pk, parent):
+        page = model.objects.get(pk=pk)
+        if parent is None:
+            return page.set_url_path(None)
+
+        parent_path, parent_pk, parent_url_path = parent
+        parent_page = Page.objects.get(pk=parent_pk)
+        # The parent's url_path may not have been written yet
+        parent_page.url_path = parent_url_path
+        return page.set_url_path(parent_page)
+
+    def update_url_paths(self, changes):
+        Page.objects.filter(pk__in=[pk for pk, url_path in changes]).update(url_path=models.Case(
+            *[models.When(pk=pk, then=models.Value(url_path)) for pk, url_path in changes],
+            output_field=models.TextField()
+        ))
 
     def handle(self, *args, **options):
-        for node in Page.get_root_nodes():
-            self.set_subtree(node)
+        chunk_size = options['chunk_size']
+        start_time = time.time()
+        self.page_count = 0
+        change_count = 0
+
+        # Each change adds three parameters to the query (in the WHERE clause
+        # and the CASE expression), and some databases limit their number
+        batch_size = min(chunk_size, connection.ops.bulk_batch_size(['pk', 'pk', 'url_path'], [None] * chunk_size))
+
+        with transaction.atomic():
+            batch = []
+            for pk, old_url_path, new_url_path in self.find_changes(chunk_size):
+                change_count += 1
+                if options['dry_run']:
+                    self.stdout.write("Page %d: %s -> %s" % (pk, old_url_path, new_url_path))
+                    continue
+
+                batch.append((pk, new_url_path))
+                if len(batch) >= batch_size:
+                    self.update_url_paths(batch)
+                    batch = []
+
+            if batch:
+                self.update_url_paths(batch)
+
+        if change_count and not options['dry_run']:
+            # Cached responses may be for the old URLs of these pages
+            invalidate_page_cache()
+
+        duration = max(time.time() - start_time, 0.001)
+        self.stdout.write("%s %d of %d pages in %.1fs (%d pages/s)" % (
+            "Would update" if options['dry_run'] else "Updated",
+            change_count, self.page_count, duration, self.page_count / duration,
+        ))
@@ -1,9 +1,13 @@
+import functools
 import json
 import logging
+import operator
+import uuid
 from collections import defaultdict
 from io import StringIO
 from urllib.parse import urlparse
 
+import django
 from django.conf import settings
 from django.contrib.auth.models import Group, Permission
 from django.contrib.contenttypes.models import ContentType
@@ -25,17 +29,22 @@ from django.utils.translation import ugettext_lazy as _
 from modelcluster.models import ClusterableModel, get_all_child_relations
 from treebeard.mp_tree import MP_Node
 
+from wagtail.core.page_cache import invalidate_page_cache
 from wagtail.core.query import PageQuerySet, TreeQuerySet
 from wagtail.core.signals import page_published, page_unpublished
 from wagtail.core.sites import get_site_for_hostname
 from wagtail.core.url_routing import RouteResult
-from wagtail.core.utils import WAGTAIL_APPEND_SLASH, camelcase_to_underscore, resolve_model_string
+from wagtail.core.utils import (
+    WAGTAIL_APPEND_SLASH, camelcase_to_underscore, make_etag, resolve_model_string)
 from wagtail.search import index
 
 logger = logging.getLogger('wagtail.core')
 
 PAGE_TEMPLATE_VAR = 'page'
 
+# Number of pages loaded from the database at a time when reading the whole tree
+TREE_CHUNK_SIZE = 2000
+
 
 class SiteManager(models.Manager):
     def get_by_natural_key(self, hostname, port):
@@ -563,6 +572,77 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
                 Value(new_url_path),
                 Substr('url_path', len(old_url_path) + 1))))
 
+        # Cached responses may be for the old URLs of any of these pages
+        invalidate_page_cache()
+
+    @classmethod
+    def find_problems(cls, chunk_size=TREE_CHUNK_SIZE):
+        """
+        Checks the page tree for the same problems as treebeard's
+        ``MP_Node.find_problems``, and returns the same five lists of ids.
+
+        Rather than making two queries per page, the tree is read in a single
+        query in path order, keeping the ancestors of the current page on a
+        stack, so large trees can be checked without loading them into memory.
+        """
+        steplen = cls.steplen
+        alphabet = set(cls.alphabet)
+        first_step, last_step = cls.alphabet[0] * steplen, cls.alphabet[-1] * steplen
+
+        evil_chars, bad_steplen, orphans, wrong_depth, wrong_numchild = [], [], [], [], []
+
+        # The pages on the stack, and their [id, numchild, children found, whether to check numchild]
+        stack = []
+        open_pages = {}
+
+        def close_page():
+            path = stack.pop()
+            pk, numchild, real_numchild, check_numchild = open_pages.pop(path)
+            if check_numchild and real_numchild != numchild:
+                wrong_numchild.append((path, pk))
+
+        pages = Page.objects.order_by('path').values_list('pk', 'path', 'depth', 'numchild')
+        if django.VERSION >= (2, 0):
+            pages = pages.iterator(chunk_size=chunk_size)
+        else:
+            # Before Django 2.0, iterator() doesn't take a chunk size
+            pages = pages.iterator()
+
+        for pk, path, depth, numchild in pages:
+            # Pages are in path order, so the pages that are no longer on the
+            # stack have no more descendants
+            while stack and not path.startswith(stack[-1]):
+                close_page()
+
+            # Count the page towards its parent's children, if it is in the
+            # same range of paths that treebeard counts
+            parent = open_pages.get(path[:-steplen])
+            if parent is not None:
+                parent_path = path[:-steplen]
+                if parent_path + first_step <= path <= parent_path + last_step:
+                    parent[2] += 1
+
+            stack.append(path)
+            open_pages[path] = [pk, numchild, 0, False]
+
+            if not set(path) <= alphabet:
+                evil_chars.append(pk)
+            elif len(path) % steplen:
+                bad_steplen.append(pk)
+            elif len(path) > steplen and parent is None:
+                orphans.append(pk)
+            elif depth != len(path) // steplen:
+                wrong_depth.append(pk)
+            else:
+                open_pages[path][3] = True
+
+        while stack:
+            close_page()
+
+        wrong_numchild = [pk for path, pk in sorted(wrong_numchild)]
+
+        return evil_chars, bad_steplen, orphans, wrong_depth, wrong_numchild
+
     #: Return this page in its most specific subclassed form.
     @cached_property
     def specific(self):
@@ -721,6 +801,42 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
             self.get_context(request, *args, **kwargs)
         )
 
+    def get_etag(self, request, *args, **kwargs):
+        """
+        Returns an ETag for the response that ``serve`` gives to this request,
+        which lets clients that already have a current copy of the page skip
+        downloading it again. Only used when ``WAGTAIL_CONDITIONAL_GET`` is
+        enabled.
+
+        The default ETag changes when the page is published. Page types that
+        render content from elsewhere (such as listings of other pages) should
+        override this to take that into account, or return None to opt out.
+        """
+        user = getattr(request, 'user', None)
+
+        return make_etag(
+            self.pk,
+            self.live_revision_id,
+            self.last_published_at,
+            user.pk if user is not None else None,
+            request.is_ajax(),
+            request.GET.urlencode(),
+        )
+
+    def get_last_modified(self, request, *args, **kwargs):
+        """
+        Returns the time the response that ``serve`` gives to this request was
+        last changed, or None to opt out. Only used when
+        ``WAGTAIL_CONDITIONAL_GET`` is enabled.
+        """
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            # Logging in doesn't change the modification time, but may change
+            # the content (such as by adding the user bar)
+            return None
+
+        return self.last_published_at
+
     def is_navigable(self):
         """
         Return true if it's meaningful to browse subpages of this page -
@@ -1039,6 +1155,11 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
         new_self.save()
         new_self._update_descendant_url_paths(old_url_path, new_url_path)
 
+        # The tree paths of restricted pages, and of pages permissions are
+        # given on, may have changed
+        cache.delete('wagtail_restricted_page_paths')
+        invalidate_page_permissions()
+
         # Log
         logger.info("Page moved: \"%s\" id=%d path=%s", self.title, self.id, new_url_path)
 
@@ -1581,6 +1702,184 @@ class GroupPagePermission(models.Model):
         )
 
 
+class TreePermissionIndex:
+    """
+    The permissions of a user on the nodes of a tree (pages or collections),
+    indexed by the path of the node each permission is given on.
+
+    A permission on a node applies to all of its descendants, whose paths
+    start with the path of the node. The permissions on a node are found by
+    looking up each prefix of its path, so this takes time proportional to
+    the depth of the node rather than the number of permissions.
+
+    Indexes are built by for_user, and kept on the user object so they are
+    shared for the rest of the request. Subclasses implement get_permissions.
+    """
+    steplen = MP_Node.steplen
+
+    # Name of the user attribute the index is kept in
+    user_attribute = None
+
+    # Prefix of the cache keys of the indexes stored in the cache, and of
+    # their version
+    cache_key_prefix = None
+
+    # Name of the setting giving the number of seconds to store indexes in
+    # the cache for, across requests
+    cache_timeout_setting = None
+
+    # Incremented whenever the permissions change in this process, so indexes
+    # kept on user objects are rebuilt
+    current_generation = 0
+
+    # The generation in which the permissions were changed, if the version in
+    # the cache hasn't been changed yet because the transaction is ongoing.
+    # Indexes aren't read from the cache in that generation
+    uncommitted_generation = None
+
+    def __init__(self, permissions, generation=None):
+        """
+        permissions is a list of (path, permission type) tuples
+        """
+        self.generation = generation
+        self.permissions_by_path = defaultdict(set)
+        for path, permission_type in permissions:
+            self.permissions_by_path[path].add(permission_type)
+
+    @classmethod
+    def get_permissions(cls, user):
+        """
+        Returns an iterable of (path, permission type) tuples for the
+        permissions of the user
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def get_version(cls):
+        version_cache_key = cls.cache_key_prefix + ':version'
+        version = cache.get(version_cache_key)
+
+        if version is None:
+            # Use add so concurrent processes agree on the same version
+            cache.add(version_cache_key, uuid.uuid4().hex, None)
+            version = cache.get(version_cache_key)
+
+        return version
+
+    @classmethod
+    def invalidate(cls):
+        """
+        Makes the indexes of all users be rebuilt the next time they are used.
+
+        The version of the indexes in the cache is changed once the current
+        transaction is committed, so that other processes can't store the old
+        permissions under the new version.
+        """
+        cls.current_generation += 1
+        cls.uncommitted_generation = cls.current_generation
+
+        def change_version():
+            cls.current_generation += 1
+            cache.set(cls.cache_key_prefix + ':version', uuid.uuid4().hex, None)
+
+        transaction.on_commit(change_version)
+
+    @classmethod
+    def build(cls, user):
+        """
+        Builds the index of the given user's permissions. If the setting named
+        by cache_timeout_setting is set, the permissions are stored in the
+        cache for that many seconds
+        """
+        generation = cls.current_generation
+        permissions = cls.get_permissions(user)
+
+        timeout = getattr(settings, cls.cache_timeout_setting, 0)
+        if timeout and generation != cls.uncommitted_generation:
+            cache_key = '%s:%s:%s' % (cls.cache_key_prefix, cls.get_version(), user.pk)
+            cached_permissions = cache.get(cache_key)
+            if cached_permissions is None:
+                cached_permissions = list(permissions)
+                cache.set(cache_key, cached_permissions, timeout)
+            permissions = cached_permissions
+
+        return cls(permissions, generation=generation)
+
+    @classmethod
+    def for_user(cls, user):
+        """
+        Returns the index of the given user's permissions, building it if the
+        permissions have changed since it was last built
+        """
+        index = getattr(user, cls.user_attribute, None)
+        if index is None or index.generation != cls.current_generation:
+            index = cls.build(user)
+            setattr(user, cls.user_attribute, index)
+
+        return index
+
+    def for_path(self, path):
+        """
+        Returns the set of permission types the user has on the node with the given path
+        """
+        permission_types = set()
+        for i in range(self.steplen, len(path) + 1, self.steplen):
+            permission_types.update(self.permissions_by_path.get(path[:i], ()))
+
+        return permission_types
+
+    def get_paths(self, permission_types):
+        """
+        Returns the paths of the nodes the user has any of the given
+        permissions on, leaving out those that are inside another one
+        """
+        paths = []
+        for path in sorted(self.permissions_by_path):
+            if not self.permissions_by_path[path].isdisjoint(permission_types):
+                # The descendants of a node are sorted straight after it
+                if not paths or not path.startswith(paths[-1]):
+                    paths.append(path)
+
+        return paths
+
+    def get_filter(self, permission_types, prefix=''):
+        """
+        Returns a Q object matching the nodes the user has any of the given
+        permissions on, or None if there aren't any. prefix is prepended to
+        the path field to filter models related to the nodes
+        """
+        paths = self.get_paths(permission_types)
+        if not paths:
+            return None
+
+        return functools.reduce(operator.or_, [
+            Q(**{prefix + 'path__startswith': path}) for path in paths
+        ])
+
+
+class PagePermissionIndex(TreePermissionIndex):
+    """
+    The page permissions of a user, indexed by the path of the page each
+    permission is given on. Permission types are those of PAGE_PERMISSION_TYPES
+    """
+    user_attribute = '_wagtail_page_permission_index'
+    cache_key_prefix = 'wagtail_page_permissions'
+    cache_timeout_setting = 'WAGTAIL_PAGE_PERMISSIONS_CACHE_TIMEOUT'
+
+    @classmethod
+    def get_permissions(cls, user):
+        return GroupPagePermission.objects.filter(group__user=user).values_list('page__path', 'permission_type')
+
+
+def invalidate_page_permissions():
+    """
+    Makes the page permission indexes of all users be rebuilt the next time
+    they are used. Called whenever group page permissions, the groups of a
+    user or the paths of pages change
+    """
+    PagePermissionIndex.invalidate()
+
+
 class UserPagePermissionsProxy:
     """Helper object that encapsulates all the page permission rules that this user has
     across the page hierarchy."""
@@ -1591,6 +1890,13 @@ class UserPagePermissionsProxy:
         if user.is_active and not user.is_superuser:
             self.permissions = GroupPagePermission.objects.filter(group__user=self.user).select_related('page')
 
+    def get_permission_index(self):
+        """
+        Returns the PagePermissionIndex of this user. The index is kept on the
+        user object, so it is shared by every proxy made during a request
+        """
+        return PagePermissionIndex.for_user(self.user)
+
     def revisions_for_moderation(self):
         """Return a queryset of page revisions awaiting moderation that this user has publish permission on"""
 
@@ -1600,18 +1906,13 @@ class UserPagePermissionsProxy:
         if self.user.is_superuser:
             return PageRevision.submitted_revisions.all()
 
-        # get the list of pages for which they have direct publish permission
-        # (i.e. they can publish any page within this subtree)
-        publishable_pages = [perm.page for perm in self.permissions if perm.permission_type == 'publish']
-        if not publishable_pages:
+        # return only those pages whose paths start with the path of a page
+        # the user has direct publish permission on (i.e. they can publish any
+        # page within this subtree)
+        only_my_sections = self.get_permission_index().get_filter(['publish'], prefix='page__')
+        if only_my_sections is None:
             return PageRevision.objects.none()
 
-        # compile a filter expression to apply to the PageRevision.submitted_revisions manager:
-        # return only those pages whose paths start with one of the publishable_pages paths
-        only_my_sections = Q(page__path__startswith=publishable_pages[0].path)
-        for page in publishable_pages[1:]:
-            only_my_sections = only_my_sections | Q(page__path__startswith=page.path)
-
         # return the filtered queryset
         return PageRevision.submitted_revisions.filter(only_my_sections)
 
@@ -1628,19 +1929,25 @@ class UserPagePermissionsProxy:
         if self.user.is_superuser:
             return Page.objects.all()
 
-        editable_pages = Page.objects.none()
+        index = self.get_permission_index()
+        filters = []
+
+        add_filter = index.get_filter(['add'])
+        if add_filter is not None:
+            # user has edit permission on any subpage of the pages they have
+            # add permission on (including the pages themselves) that is owned by them
+            filters.append(add_filter & Q(owner=self.user))
 
-        for perm in self.permissions.filter(permission_type='add'):
-            # user has edit permission on any subpage of perm.page
-            # (including perm.page itself) that is owned by them
-            editable_pages |= Page.objects.descendant_of(perm.page, inclusive=True).filter(owner=self.user)
+        edit_filter = index.get_filter(['edit'])
+        if edit_filter is not None:
+            # user has edit permission on any subpage of the pages they have
+            # edit permission on (including the pages themselves) regardless of owner
+            filters.append(edit_filter)
 
-        for perm in self.permissions.filter(permission_type='edit'):
-            # user has edit permission on any subpage of perm.page
-            # (including perm.page itself) regardless of owner
-            editable_pages |= Page.objects.descendant_of(perm.page, inclusive=True)
+        if not filters:
+            return Page.objects.none()
 
-        return editable_pages
+        return Page.objects.filter(functools.reduce(operator.or_, filters))
 
     def can_edit_pages(self):
         """Return True if the user has permission to edit any pages"""
@@ -1654,14 +1961,13 @@ class UserPagePermissionsProxy:
         if self.user.is_superuser:
             return Page.objects.all()
 
-        publishable_pages = Page.objects.none()
-
-        for perm in self.permissions.filter(permission_type='publish'):
-            # user has publish permission on any subpage of perm.page
-            # (including perm.page itself)
-            publishable_pages |= Page.objects.descendant_of(perm.page, inclusive=True)
+        # user has publish permission on any subpage of the pages they have
+        # publish permission on (including the pages themselves)
+        publish_filter = self.get_permission_index().get_filter(['publish'])
+        if publish_filter is None:
+            return Page.objects.none()
 
-        return publishable_pages
+        return Page.objects.filter(publish_filter)
 
     def can_publish_pages(self):
         """Return True if the user has permission to publish any pages"""
@@ -1676,10 +1982,7 @@ class PagePermissionTester:
         self.page_is_root = page.depth == 1  # Equivalent to page.is_root()
 
         if self.user.is_active and not self.user.is_superuser:
-            self.permissions = set(
-                perm.permission_type for perm in user_perms.permissions
-                if self.page.path.startswith(perm.page.path)
-            )
+            self.permissions = user_perms.get_permission_index().for_path(self.page.path)
 
     def can_add_subpage(self):
         if not self.user.is_active:
@@ -1922,6 +2225,26 @@ class PageViewRestriction(BaseViewRestriction):
 
     passed_view_restrictions_session_key = 'passed_page_view_restrictions'
 
+    @staticmethod
+    def get_restricted_paths():
+        """
+        Return a sorted list of the tree paths of the pages with view restrictions,
+        leaving out pages that are within another restricted page - used to find the
+        private sections of the tree without loading each restriction
+        """
+        result = cache.get('wagtail_restricted_page_paths')
+
+        if result is None:
+            result = []
+            # An ancestor's path sorts right before the paths of its descendants
+            for path in sorted(set(PageViewRestriction.objects.values_list('page__path', flat=True))):
+                if not result or not path.startswith(result[-1]):
+                    result.append(path)
+
+            cache.set('wagtail_restricted_page_paths', result, 3600)
+
+        return result
+
     class Meta:
         verbose_name = _('page view restriction')
         verbose_name_plural = _('page view restrictions')
@@ -2042,3 +2365,33 @@ class GroupCollectionPermission(models.Model):
     class Meta:
         unique_together = ('group', 'collection', 'permission')
         verbose_name = _('group collection permission')
+
+
+class CollectionPermissionIndex(TreePermissionIndex):
+    """
+    The collection permissions of a user, indexed by the path of the
+    collection each permission is given on. Permission types are permission
+    names in the 'app_label.codename' form used by user.has_perm
+    """
+    user_attribute = '_wagtail_collection_permission_index'
+    cache_key_prefix = 'wagtail_collection_permissions'
+    cache_timeout_setting = 'WAGTAIL_COLLECTION_PERMISSIONS_CACHE_TIMEOUT'
+
+    @classmethod
+    def get_permissions(cls, user):
+        permissions = GroupCollectionPermission.objects.filter(group__user=user).values_list(
+            'collection__path', 'permission__content_type__app_label', 'permission__codename'
+        )
+        return [
+            (path, '%s.%s' % (app_label, codename))
+            for path, app_label, codename in permissions
+        ]
+
+
+def invalidate_collection_permissions():
+    """
+    Makes the collection permission indexes of all users be rebuilt the next
+    time they are used. Called whenever group collection permissions or the
+    groups of a user change
+    """
+    CollectionPermissionIndex.invalidate()
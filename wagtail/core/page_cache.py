@@ -0,0 +1,180 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import cc_delim_re
+
+from wagtail.core import hooks
+
+
+class PageCache:
+    """
+    Stores the responses of ``wagtail.core.views.serve`` in a Django cache.
+
+    Each entry records the token of the page it was rendered from and the
+    generation of the whole cache, both read before the page was rendered.
+    Publishing or unpublishing a page replaces its token, and changes that
+    may affect many URLs (moving pages, changing sites or view restrictions)
+    replace the generation, so stale entries are never returned.
+
+    Configured through the ``WAGTAIL_PAGE_CACHE`` setting:
+
+    >>> WAGTAIL_PAGE_CACHE = {
+    ...     'CACHE': 'default',
+    ...     'TIMEOUT': 600,
+    ...     'VARY_ON': ['HTTP_ACCEPT_LANGUAGE'],
+    ... }
+    """
+    def __init__(self, params):
+        self.cache = caches[params.get('CACHE', 'default')]
+        self.timeout = params.get('TIMEOUT', 600)
+        self.key_prefix = params.get('KEY_PREFIX', 'wagtailpagecache')
+        self.vary_on = params.get('VARY_ON', [])
+        self.generation_key = self.key_prefix + ':generation'
+
+    def get_page_token_key(self, page_path):
+        # Pages are identified by their tree path. Moving pages changes these,
+        # but also invalidates the whole cache
+        return '%s:page:%s' % (self.key_prefix, page_path)
+
+    def get_response_key(self, request, path):
+        parts = [
+            request.site.id,
+            request.scheme,
+            request.get_host(),
+            [component for component in path.split('/') if component],
+            request.GET.urlencode(),
+            request.is_ajax(),
+        ]
+        parts.extend(request.META.get(name) for name in self.vary_on)
+
+        digest = hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+        return self.key_prefix + ':response:' + digest
+
+    def accepts_request(self, request):
+        """
+        Returns True if responses to this request can be read from and stored
+        in the cache. Only GET requests from anonymous users are cached.
+        """
+        if request.method != 'GET':
+            return False
+
+        user = getattr(request, 'user', None)
+        return user is None or not user.is_authenticated
+
+    def get(self, request, path):
+        """
+        Returns the cached response for the request, or None
+        """
+        entry = self.cache.get(self.get_response_key(request, path))
+        if entry is None:
+            return
+
+        tokens, response = entry
+        current_tokens = self.cache.get_many(list(tokens.keys()))
+        if current_tokens != tokens:
+            return
+
+        return response
+
+    def get_tokens(self, page):
+        """
+        Returns the current generation and token of the page. These must be
+        read before the page is rendered and passed to ``set``, so a response
+        that was rendered while the page was being changed isn't stored as
+        current.
+        """
+        keys = [self.generation_key, self.get_page_token_key(page.path)]
+        tokens = self.cache.get_many(keys)
+
+        for key in keys:
+            if key not in tokens:
+                # Use add so concurrent processes agree on the same token
+                self.cache.add(key, uuid.uuid4().hex, None)
+                tokens[key] = self.cache.get(key)
+
+        return tokens
+
+    def set(self, request, path, tokens, response):
+        if is_cacheable_response(request, response):
+            self.cache.set(self.get_response_key(request, path), (tokens, response), self.timeout)
+
+    def invalidate_pages(self, pages, include_parents=False):
+        page_paths = set()
+        for page in pages:
+            page_paths.add(page.path)
+
+            if include_parents and page.depth > 1:
+                page_paths.add(page.path[:-page.steplen])
+
+        self.cache.delete_many([self.get_page_token_key(page_path) for page_path in page_paths])
+
+    def invalidate_all(self):
+        self.cache.set(self.generation_key, uuid.uuid4().hex, None)
+
+
+def is_cacheable_response(request, response):
+    """
+    Checks that a rendered response doesn't contain anything specific to the
+    visitor it was rendered for
+    """
+    if response.status_code != 200 or response.streaming or response.cookies:
+        return False
+
+    cache_control = {
+        directive.split('=', 1)[0].strip().lower()
+        for directive in cc_delim_re.split(response.get('Cache-Control', ''))
+    }
+    if cache_control & {'private', 'no-cache', 'no-store'}:
+        return False
+
+    # The page contains a CSRF token or the visitor's messages. (The session is
+    # always accessed to find the user, so can't be checked the same way)
+    if request.META.get('CSRF_COOKIE_USED'):
+        return False
+
+    messages = getattr(request, '_messages', None)
+    if messages is not None and messages.used:
+        return False
+
+    return True
+
+
+def get_page_cache():
+    """
+    Returns the PageCache configured by the ``WAGTAIL_PAGE_CACHE`` setting,
+    or None if page caching is disabled
+    """
+    params = getattr(settings, 'WAGTAIL_PAGE_CACHE', None)
+    if params is None:
+        return
+
+    return PageCache(params)
+
+
+def has_custom_serve_hooks():
+    """
+    Returns True if there are ``before_serve_page`` hooks other than the one
+    that checks view restrictions. These may return a response depending on
+    the request, so must run before a cached response is used.
+    """
+    from wagtail.core.wagtail_hooks import check_view_restrictions
+
+    return any(fn is not check_view_restrictions for fn in hooks.get_hooks('before_serve_page'))
+
+
+def invalidate_page_cache(pages=None, include_parents=False):
+    """
+    Removes the cached responses of the given pages (and optionally their
+    parents) from the page cache, including the responses for any subpages
+    they serve. If no pages are given, the whole cache is invalidated.
+    """
+    page_cache = get_page_cache()
+    if page_cache is None:
+        return
+
+    if pages is None:
+        page_cache.invalidate_all()
+    else:
+        page_cache.invalidate_pages(pages, include_parents=include_parents)
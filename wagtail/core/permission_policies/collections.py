@@ -3,7 +3,7 @@ from django.contrib.auth.models import Group, Permission
 from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
 from django.db.models import Q
 
-from wagtail.core.models import Collection, GroupCollectionPermission
+from wagtail.core.models import Collection, CollectionPermissionIndex
 
 from .base import BaseDjangoAuthPermissionPolicy
 
@@ -19,6 +19,9 @@ class CollectionPermissionLookupMixin:
             codename__in=permission_codenames
         )
 
+    def _get_permission_names(self, actions):
+        return [self._get_permission_name(action) for action in actions]
+
     def _check_perm(self, user, actions, collection=None):
         """
         Equivalent to user.has_perm(self._get_permission_name(action)) on all listed actions,
@@ -32,41 +35,26 @@ class CollectionPermissionLookupMixin:
         if user.is_superuser:
             return True
 
-        collection_permissions = GroupCollectionPermission.objects.filter(
-            group__user=user,
-            permission__in=self._get_permission_objects_for_actions(actions),
-        )
+        # The user's collection permissions are looked up once per request
+        # (see CollectionPermissionIndex), rather than queried on every check
+        index = CollectionPermissionIndex.for_user(user)
+        permission_names = self._get_permission_names(actions)
 
         if collection:
-            collection_permissions = collection_permissions.filter(
-                collection__in=collection.get_ancestors(inclusive=True)
-            )
-
-        return collection_permissions.exists()
+            return not index.for_path(collection.path).isdisjoint(permission_names)
+        else:
+            return bool(index.get_paths(permission_names))
 
     def _collections_with_perm(self, user, actions):
         """
         Return a queryset of collections on which this user has a GroupCollectionPermission
         record for any of the given actions, either on the collection itself or an ancestor
         """
-        # Get the permission objects corresponding to these actions
-        permissions = self._get_permission_objects_for_actions(actions)
-
-        # Get the collections that have a GroupCollectionPermission record
-        # for any of these permissions and any of the user's groups;
-        # create a list of their paths
-        collection_root_paths = Collection.objects.filter(
-            group_permissions__group__in=user.groups.all(),
-            group_permissions__permission__in=permissions
-        ).values_list('path', flat=True)
-
-        if collection_root_paths:
-            # build a filter expression that will filter our model to just those
-            # instances in collections with a path that starts with one of the above
-            collection_path_filter = Q(path__startswith=collection_root_paths[0])
-            for path in collection_root_paths[1:]:
-                collection_path_filter = collection_path_filter | Q(path__startswith=path)
+        collection_path_filter = CollectionPermissionIndex.for_user(user).get_filter(
+            self._get_permission_names(actions)
+        )
 
+        if collection_path_filter is not None:
             return Collection.objects.filter(collection_path_filter)
         else:
             # no matching collections
@@ -213,9 +213,11 @@ class PageQuerySet(SearchableQuerySetMixin, TreeQuerySet):
     def public_q(self):
         from wagtail.core.models import PageViewRestriction
 
+        # Restricted pages within another restricted page are left out, so
+        # there is one condition per private section of the tree
         q = Q()
-        for restriction in PageViewRestriction.objects.all():
-            q &= ~self.descendant_of_q(restriction.page, inclusive=True)
+        for path in PageViewRestriction.get_restricted_paths():
+            q &= ~Q(path__startswith=path)
         return q
 
     def public(self):
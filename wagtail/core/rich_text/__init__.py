@@ -23,8 +23,17 @@ def expand_db_html(html):
     if FRONTEND_REWRITER is None:
         embed_rules = features.get_embed_types()
         link_rules = features.get_link_types()
+
+        # Embed handlers may define an expand_db_attributes_many method to handle
+        # all embeds of their type in one go
+        bulk_embed_rules = {
+            embed_type: rule.expand_db_attributes_many
+            for embed_type, rule in embed_rules.items()
+            if hasattr(rule, 'expand_db_attributes_many')
+        }
+
         FRONTEND_REWRITER = MultiRuleRewriter([
-            LinkRewriter(link_rules), EmbedRewriter(embed_rules)
+            LinkRewriter(link_rules), EmbedRewriter(embed_rules, bulk_embed_rules)
         ])
 
     return FRONTEND_REWRITER(html)
@@ -25,9 +25,15 @@ class EmbedRewriter:
     Rewrites <embed embedtype="foo" /> tags within rich text into the HTML fragment given by the
     embed rule for 'foo'. Each embed rule is a function that takes a dict of attributes and
     returns the HTML fragment.
+
+    bulk_rules optionally maps embed types to functions that take a list of attribute dicts
+    (one for each tag of that type within the HTML) and return a list of HTML fragments. These
+    are used in preference to embed_rules when there are several tags of that type, so that they
+    can all be handled at once.
     """
-    def __init__(self, embed_rules):
+    def __init__(self, embed_rules, bulk_rules=None):
         self.embed_rules = embed_rules
+        self.bulk_rules = bulk_rules or {}
 
     def replace_tag(self, match):
         attrs = extract_attrs(match.group(1))
@@ -38,8 +44,40 @@ class EmbedRewriter:
             return ''
         return rule(attrs)
 
+    def expand_bulk_tags(self, html):
+        """
+        Returns a dict mapping the attribute strings of all tags handled by a bulk rule to their
+        HTML fragment
+        """
+        tags_by_type = {}
+        for match in FIND_EMBED_TAG.finditer(html):
+            attrs = extract_attrs(match.group(1))
+            if attrs.get('embedtype') in self.bulk_rules:
+                tags_by_type.setdefault(attrs['embedtype'], {})[match.group(1)] = attrs
+
+        expanded_tags = {}
+        for embed_type, tags in tags_by_type.items():
+            if len(tags) < 2:
+                continue
+
+            fragments = self.bulk_rules[embed_type](list(tags.values()))
+            expanded_tags.update(zip(tags.keys(), fragments))
+
+        return expanded_tags
+
     def __call__(self, html):
-        return FIND_EMBED_TAG.sub(self.replace_tag, html)
+        if not self.bulk_rules:
+            return FIND_EMBED_TAG.sub(self.replace_tag, html)
+
+        expanded_tags = self.expand_bulk_tags(html)
+
+        def replace_tag(match):
+            try:
+                return expanded_tags[match.group(1)]
+            except KeyError:
+                return self.replace_tag(match)
+
+        return FIND_EMBED_TAG.sub(replace_tag, html)
 
 
 class LinkRewriter:
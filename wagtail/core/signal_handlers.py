@@ -1,9 +1,14 @@
 import logging
 
+from django.contrib.auth import get_user_model
 from django.core.cache import cache
-from django.db.models.signals import post_delete, post_save, pre_delete
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 
-from wagtail.core.models import Page, Site
+from wagtail.core.models import (
+    GroupCollectionPermission, GroupPagePermission, Page, PageViewRestriction, Site,
+    invalidate_collection_permissions, invalidate_page_permissions)
+from wagtail.core.page_cache import invalidate_page_cache
+from wagtail.core.signals import page_published, page_unpublished
 
 logger = logging.getLogger('wagtail.core')
 
@@ -11,10 +16,45 @@ logger = logging.getLogger('wagtail.core')
 # Clear the wagtail_site_root_paths from the cache whenever Site records are updated.
 def post_save_site_signal_handler(instance, update_fields=None, **kwargs):
     cache.delete('wagtail_site_root_paths')
+    invalidate_page_cache()
 
 
 def post_delete_site_signal_handler(instance, **kwargs):
     cache.delete('wagtail_site_root_paths')
+    invalidate_page_cache()
+
+
+# Clear the wagtail_restricted_page_paths from the cache whenever PageViewRestriction records are updated.
+def post_save_page_view_restriction_signal_handler(instance, **kwargs):
+    cache.delete('wagtail_restricted_page_paths')
+    invalidate_page_cache()
+
+
+def post_delete_page_view_restriction_signal_handler(instance, **kwargs):
+    cache.delete('wagtail_restricted_page_paths')
+    invalidate_page_cache()
+
+
+# Remove pages from the page cache when they are published or unpublished. Index
+# pages usually list their children, so the parent page is removed too
+def page_published_or_unpublished_page_cache_signal_handler(instance, **kwargs):
+    invalidate_page_cache([instance], include_parents=True)
+
+
+# Rebuild the page and collection permission indexes of users whenever the
+# permissions given to groups, or the groups users are in, change
+def group_page_permission_changed_signal_handler(**kwargs):
+    invalidate_page_permissions()
+
+
+def group_collection_permission_changed_signal_handler(**kwargs):
+    invalidate_collection_permissions()
+
+
+def user_groups_changed_signal_handler(action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_page_permissions()
+        invalidate_collection_permissions()
 
 
 def pre_delete_page_unpublish(sender, instance, **kwargs):
@@ -32,5 +72,20 @@ def register_signal_handlers():
     post_save.connect(post_save_site_signal_handler, sender=Site)
     post_delete.connect(post_delete_site_signal_handler, sender=Site)
 
+    post_save.connect(post_save_page_view_restriction_signal_handler, sender=PageViewRestriction)
+    post_delete.connect(post_delete_page_view_restriction_signal_handler, sender=PageViewRestriction)
+
+    post_save.connect(group_page_permission_changed_signal_handler, sender=GroupPagePermission)
+    post_delete.connect(group_page_permission_changed_signal_handler, sender=GroupPagePermission)
+    post_save.connect(group_collection_permission_changed_signal_handler, sender=GroupCollectionPermission)
+    post_delete.connect(group_collection_permission_changed_signal_handler, sender=GroupCollectionPermission)
+
+    user_groups = getattr(get_user_model(), 'groups', None)
+    if user_groups is not None:
+        m2m_changed.connect(user_groups_changed_signal_handler, sender=user_groups.through)
+
     pre_delete.connect(pre_delete_page_unpublish, sender=Page)
     post_delete.connect(post_delete_page_log_deletion, sender=Page)
+
+    page_published.connect(page_published_or_unpublished_page_cache_signal_handler)
+    page_unpublished.connect(page_published_or_unpublished_page_cache_signal_handler)
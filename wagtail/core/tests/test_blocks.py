@@ -6,12 +6,14 @@ import unittest
 from datetime import date, datetime
 from decimal import Decimal
 
+import mock
 # non-standard import name for ugettext_lazy, to prevent strings from being picked up for translation
 from django import forms
 from django.core.exceptions import ValidationError
 from django.forms.utils import ErrorList
 from django.template.loader import render_to_string
 from django.test import SimpleTestCase, TestCase
+from django.utils import translation
 from django.utils.html import format_html
 from django.utils.safestring import SafeData, mark_safe
 from django.utils.translation import ugettext_lazy as __
@@ -2422,6 +2424,113 @@ class TestStreamBlock(WagtailTestUtils, SimpleTestCase):
         block = ArticleBlock()
         self.assertIn('<script type="text/x-html-template">hello world</script>', block.all_html_declarations())
 
+    def test_all_html_declarations_are_cached(self):
+        class ArticleBlock(blocks.StreamBlock):
+            heading = blocks.CharBlock()
+            paragraph = blocks.CharBlock()
+
+        block = ArticleBlock()
+        html = block.all_html_declarations()
+
+        with mock.patch.object(block, 'html_declarations', return_value='') as html_declarations:
+            self.assertEqual(block.all_html_declarations(), html)
+            html_declarations.assert_not_called()
+
+            # They are rendered again for each language
+            with translation.override('fr'):
+                block.all_html_declarations()
+            html_declarations.assert_called_once_with()
+
+    def test_all_html_declarations_are_cached_on_each_block(self):
+        class ArticleBlock(blocks.StreamBlock):
+            heading = blocks.CharBlock()
+
+        block = ArticleBlock()
+        block.all_html_declarations()
+        self.assertEqual(list(block._html_declarations_cache), [translation.get_language()])
+
+        other_block = ArticleBlock()
+        with mock.patch.object(other_block, 'html_declarations', return_value='') as html_declarations:
+            other_block.all_html_declarations()
+            html_declarations.assert_called_once_with()
+
+    def test_all_html_declarations_cache_is_cleared_by_setting_change(self):
+        class ArticleBlock(blocks.StreamBlock):
+            heading = blocks.CharBlock()
+
+        block = ArticleBlock()
+        block.all_html_declarations()
+
+        with mock.patch.object(block, 'html_declarations', return_value='') as html_declarations:
+            with self.settings(WAGTAILADMIN_RICH_TEXT_EDITORS={}):
+                block.all_html_declarations()
+            html_declarations.assert_called_once_with()
+
+    def test_all_html_declarations_with_callable_choices_are_not_cached(self):
+        choices = [('tea', 'Tea')]
+
+        class ArticleBlock(blocks.StreamBlock):
+            drink = blocks.ChoiceBlock(choices=lambda: choices)
+
+        block = ArticleBlock()
+        self.assertIn('Tea', block.all_html_declarations())
+
+        choices.append(('coffee', 'Coffee'))
+        self.assertIn('Coffee', block.all_html_declarations())
+
+    def test_all_html_declarations_with_querysets_are_not_cached(self):
+        class PageBlock(blocks.FieldBlock):
+            def __init__(self, **kwargs):
+                self.field = forms.ModelChoiceField(queryset=Page.objects.all())
+                super().__init__(**kwargs)
+
+        class ArticleBlock(blocks.StreamBlock):
+            page = PageBlock()
+            heading = blocks.CharBlock()
+
+        block = ArticleBlock()
+        self.assertFalse(block.child_blocks['page'].cache_html_declarations)
+        self.assertTrue(block.child_blocks['heading'].cache_html_declarations)
+
+        # The choices are read from the database every time the form is rendered, so the
+        # declarations of the block, and of the stream block that renders its form, are
+        # rendered every time. The declarations of the other blocks are still cached
+        heading_block = block.child_blocks['heading']
+        with mock.patch.object(block, 'html_declarations', return_value='') as html_declarations, \
+                mock.patch.object(block.child_blocks['page'], 'html_declarations', return_value=''), \
+                mock.patch.object(heading_block, 'html_declarations', return_value='') as heading_html_declarations:
+            block.all_html_declarations()
+            block.all_html_declarations()
+            self.assertEqual(html_declarations.call_count, 2)
+            self.assertEqual(heading_html_declarations.call_count, 1)
+
+    def test_all_html_declarations_with_choosers_are_cached(self):
+        class ArticleBlock(blocks.StreamBlock):
+            page = blocks.PageChooserBlock()
+            heading = blocks.CharBlock()
+
+        block = ArticleBlock()
+        self.assertTrue(block.child_blocks['page'].cache_html_declarations)
+
+        # Chooser widgets don't render their choices, so they don't use the database
+        block.all_html_declarations()
+        with mock.patch.object(block, 'html_declarations', return_value='') as html_declarations:
+            block.all_html_declarations()
+            html_declarations.assert_not_called()
+
+    def test_js_initializer(self):
+        class ArticleBlock(blocks.StreamBlock):
+            heading = blocks.CharBlock()
+            links = blocks.ListBlock(blocks.CharBlock())
+
+        block = ArticleBlock()
+        js = block.js_initializer()
+
+        self.assertIn("'name': ('heading')", js)
+        self.assertIn("'name': ('links')", js)
+        self.assertIn("'initializer': (ListBlock(", js)
+        self.assertEqual(js.count("'initializer'"), 1)
+
     def test_ordering_in_form_submission_uses_order_field(self):
         class ArticleBlock(blocks.StreamBlock):
             heading = blocks.CharBlock()
@@ -1,9 +1,13 @@
+import mock
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser, Group, Permission
 from django.contrib.contenttypes.models import ContentType
-from django.test import TestCase
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, override_settings
 
-from wagtail.core.models import Collection, GroupCollectionPermission
+from wagtail.core.models import (
+    Collection, CollectionPermissionIndex, GroupCollectionPermission, invalidate_collection_permissions)
 from wagtail.core.permission_policies.collections import (
     CollectionOwnershipPermissionPolicy, CollectionPermissionPolicy)
 from wagtail.core.tests.test_permission_policies import PermissionPolicyTestUtils
@@ -946,3 +950,77 @@ class TestCollectionOwnershipPermissionPolicy(PermissionPolicyTestCase):
             ),
             []
         )
+
+
+class TestCollectionPermissionIndex(PermissionPolicyTestCase):
+    def setUp(self):
+        super().setUp()
+        self.policy = CollectionOwnershipPermissionPolicy(
+            Document,
+            owner_field_name='uploaded_by_user',
+        )
+
+    def test_permissions_looked_up_once(self):
+        self.assertTrue(self.policy.user_has_permission(self.report_changer, 'change'))
+
+        with self.assertNumQueries(0):
+            self.assertTrue(self.policy.user_has_permission(self.report_changer, 'delete'))
+            self.assertFalse(self.policy.user_has_permission(self.report_changer, 'add'))
+            self.assertTrue(self.policy.user_has_permission_for_instance(
+                self.report_changer, 'change', self.changer_report
+            ))
+            self.assertFalse(self.policy.user_has_permission_for_instance(
+                self.report_changer, 'change', self.changer_doc
+            ))
+
+    def test_permission_index(self):
+        index = CollectionPermissionIndex.for_user(self.report_adder)
+
+        self.assertEqual(index.for_path(self.reports_collection.path), {'wagtaildocs.add_document'})
+        self.assertEqual(index.for_path(self.root_collection.path), set())
+        self.assertEqual(index.get_paths(['wagtaildocs.add_document']), [self.reports_collection.path])
+
+    def test_index_rebuilt_when_group_permissions_change(self):
+        self.assertFalse(self.policy.user_has_permission(self.useless_user, 'add'))
+
+        group = Group.objects.get(name="Report adders")
+        self.useless_user.groups.add(group)
+        self.assertTrue(self.policy.user_has_permission(self.useless_user, 'add'))
+
+        GroupCollectionPermission.objects.filter(group=group).delete()
+        self.assertFalse(self.policy.user_has_permission(self.useless_user, 'add'))
+        self.assertFalse(self.policy.collections_user_has_permission_for(self.useless_user, 'add').exists())
+
+    @override_settings(WAGTAIL_COLLECTION_PERMISSIONS_CACHE_TIMEOUT=300)
+    def test_cache_is_not_rebuilt_from_uncommitted_changes(self):
+        # The version of the cache is only changed when the transaction is
+        # committed, which never happens in a TestCase
+        on_commit_callbacks = []
+        with mock.patch('django.db.transaction.on_commit', side_effect=on_commit_callbacks.append):
+            invalidate_collection_permissions()
+            on_commit_callbacks.pop()()
+
+            user = get_user_model().objects.get(pk=self.report_changer.pk)
+            old_permissions = list(CollectionPermissionIndex.get_permissions(user))
+            self.assertTrue(self.policy.user_has_permission(user, 'change'))
+
+            with transaction.atomic():
+                GroupCollectionPermission.objects.filter(group__user=self.report_changer).delete()
+                version = CollectionPermissionIndex.get_version()
+
+                # This process doesn't read the old permissions from the cache
+                user = get_user_model().objects.get(pk=self.report_changer.pk)
+                self.assertFalse(self.policy.user_has_permission(user, 'change'))
+
+                # Another process, which can't see the change yet, caches the
+                # old permissions under the current version
+                cache.set('%s:%s:%s' % (CollectionPermissionIndex.cache_key_prefix, version, user.pk), old_permissions)
+
+            self.assertEqual(CollectionPermissionIndex.get_version(), version)
+            for callback in on_commit_callbacks:
+                callback()
+
+        # Once the change is committed, the old permissions aren't used
+        self.assertNotEqual(CollectionPermissionIndex.get_version(), version)
+        user = get_user_model().objects.get(pk=self.report_changer.pk)
+        self.assertFalse(self.policy.user_has_permission(user, 'change'))
@@ -1,10 +1,13 @@
 from datetime import timedelta
 from io import StringIO
 
+import mock
 from django.core import management
+from django.core.management.base import CommandError
 from django.db import models
 from django.test import TestCase
 from django.utils import timezone
+from treebeard.mp_tree import MP_Node
 
 from wagtail.core.models import Page, PageRevision
 from wagtail.core.signals import page_published, page_unpublished
@@ -110,6 +113,40 @@ class TestFixTreeCommand(TestCase):
         self.assertFalse(Page.objects.filter(id=christmas_page.id).exists())
 
 
+class TestFindProblems(TestCase):
+    fixtures = ['test.json']
+
+    def assertSameProblems(self):
+        problems = Page.find_problems(chunk_size=3)
+        self.assertEqual(problems, MP_Node.find_problems.__func__(Page))
+        return problems
+
+    def test_no_problems(self):
+        self.assertEqual(self.assertSameProblems(), ([], [], [], [], []))
+
+    def test_problems(self):
+        homepage = Page.objects.get(url_path='/home/')
+        events_index = Page.objects.get(url_path='/home/events/')
+        about_us = Page.objects.get(url_path='/home/about-us/')
+
+        Page.objects.filter(id=homepage.id).update(numchild=12345, depth=3)
+        Page.objects.filter(id=about_us.id).update(numchild=5)
+        Page.objects.filter(url_path='/home/events/christmas/').update(path=events_index.path + '000a')
+        Page.objects.filter(url_path='/home/events/saint-patrick/').update(path=events_index.path + '00')
+        models.Model.delete(Page.objects.get(url_path='/home/events/final-event/').get_parent())
+
+        bad_alpha, bad_path, orphans, bad_depth, bad_numchild = self.assertSameProblems()
+        self.assertTrue(bad_alpha)
+        self.assertTrue(bad_path)
+        self.assertEqual(bad_depth, [homepage.id])
+        self.assertIn(about_us.id, bad_numchild)
+
+    def test_django_1_11(self):
+        # Before Django 2.0, iterator() doesn't take a chunk size
+        with mock.patch('django.VERSION', (1, 11, 0, 'final', 0)):
+            self.assertEqual(Page.find_problems(chunk_size=3), ([], [], [], [], []))
+
+
 class TestMovePagesCommand(TestCase):
     fixtures = ['test.json']
 
@@ -134,18 +171,103 @@ class TestSetUrlPathsCommand(TestCase):
 
     fixtures = ['test.json']
 
-    def run_command(self):
-        management.call_command('set_url_paths', stdout=StringIO())
+    def run_command(self, **options):
+        output = StringIO()
+        management.call_command('set_url_paths', stdout=output, **options)
+        output.seek(0)
+
+        return output.read()
 
     def test_set_url_paths(self):
         self.run_command()
 
+    def test_fixes_url_paths(self):
+        events_index = Page.objects.get(url_path='/home/events/')
+        christmas_page = Page.objects.get(url_path='/home/events/christmas/')
+        about_us = Page.objects.get(url_path='/home/about-us/')
+        broken_pages = events_index.get_descendants(inclusive=True)
+        broken_count = broken_pages.count() + 1
+        broken_pages.update(url_path='/broken/')
+        Page.objects.filter(id=about_us.id).update(url_path='/about-us/')
+
+        output = self.run_command()
+
+        self.assertIn("Updated %d of %d pages" % (broken_count, Page.objects.count()), output)
+        self.assertEqual(Page.objects.get(id=events_index.id).url_path, '/home/events/')
+        self.assertEqual(Page.objects.get(id=christmas_page.id).url_path, '/home/events/christmas/')
+        self.assertEqual(Page.objects.get(id=about_us.id).url_path, '/home/about-us/')
+
+    def test_dry_run(self):
+        events_index = Page.objects.get(url_path='/home/events/')
+        Page.objects.filter(id=events_index.id).update(url_path='/broken/')
+
+        output = self.run_command(dry_run=True)
+
+        self.assertIn("Page %d: /broken/ -> /home/events/" % events_index.id, output)
+        self.assertIn("Would update 1 of ", output)
+        self.assertEqual(Page.objects.get(id=events_index.id).url_path, '/broken/')
+
+    def test_skips_orphans(self):
+        events_index = Page.objects.get(url_path='/home/events/')
+        models.Model.delete(events_index)
+        Page.objects.filter(url_path='/home/events/christmas/').update(url_path='/orphan/')
+
+        self.run_command()
+
+        self.assertTrue(Page.objects.filter(url_path='/orphan/').exists())
+
+    def test_query_count_is_independent_of_tree_size(self):
+        Page.objects.filter(depth__gt=2).update(url_path='/broken/')
+
+        # Reading the tree, and a single update in a transaction
+        with self.assertNumQueries(4):
+            self.run_command()
+
+    def test_updates_in_batches(self):
+        Page.objects.filter(depth__gt=2).update(url_path='/broken/')
+        broken_count = Page.objects.filter(depth__gt=2).count()
+
+        # Reading the tree, and an update for every three pages in a transaction
+        with self.assertNumQueries(3 + (broken_count + 2) // 3):
+            output = self.run_command(chunk_size=3)
+
+        self.assertIn("Updated %d of " % broken_count, output)
+        self.assertFalse(Page.objects.filter(url_path='/broken/').exists())
+
+    def test_custom_set_url_path(self):
+        def set_url_path(page, parent):
+            page.url_path = parent.url_path + 'custom-' + page.slug + '/'
+            return page.url_path
+
+        with mock.patch.object(SimplePage, 'set_url_path', autospec=True, side_effect=set_url_path):
+            output = self.run_command()
+
+        # SimplePage's own set_url_path is used, and its children are placed under the new url_path
+        self.assertIn("Updated 5 of ", output)
+        self.assertEqual(Page.objects.get(id=11).url_path, '/home/custom-secret-plans/')
+        self.assertEqual(Page.objects.get(id=12).url_path, '/home/custom-secret-plans/steal-underpants/')
+        self.assertEqual(Page.objects.get(id=3).url_path, '/home/events/')
+
+    def test_django_1_11(self):
+        events_index = Page.objects.get(url_path='/home/events/')
+        Page.objects.filter(id=events_index.id).update(url_path='/broken/')
+
+        # Before Django 2.0, iterator() doesn't take a chunk size
+        with mock.patch('django.VERSION', (1, 11, 0, 'final', 0)):
+            self.run_command()
+
+        self.assertEqual(Page.objects.get(id=events_index.id).url_path, '/home/events/')
+
 
 class TestReplaceTextCommand(TestCase):
     fixtures = ['test.json']
 
-    def run_command(self, from_text, to_text):
-        management.call_command('replace_text', from_text, to_text, stdout=StringIO())
+    def run_command(self, from_text, to_text, **options):
+        output = StringIO()
+        management.call_command('replace_text', from_text, to_text, stdout=output, **options)
+        output.seek(0)
+
+        return output.read()
 
     def test_replace_text(self):
         # Check that the christmas page is definitely about christmas
@@ -165,6 +287,51 @@ class TestReplaceTextCommand(TestCase):
         self.assertEqual(easter_page.speakers.first().last_name, "Easter")
         self.assertEqual(easter_page.advert_placements.first().colour, "greener than a Easter tree")
 
+    def test_replace_text_in_revisions(self):
+        christmas_page = EventPage.objects.get(url_path='/home/events/christmas/')
+        christmas_page.save_revision()
+
+        self.run_command("Christmas", "Easter")
+
+        self.assertEqual(christmas_page.get_latest_revision_as_page().title, "Easter")
+
+    def test_reports_counts(self):
+        output = self.run_command("Christmas", "Easter")
+
+        self.assertIn("tests.EventPageSpeaker: 1 updated", output)
+        self.assertIn("wagtailcore.Page: 1 updated", output)
+
+    def test_replacement_containing_text(self):
+        self.run_command("Christmas", "Christmas Day", chunk_size=1)
+
+        christmas_page = EventPage.objects.get(url_path='/home/events/christmas/')
+        self.assertEqual(christmas_page.title, "Christmas Day")
+        self.assertEqual(christmas_page.advert_placements.first().colour, "greener than a Christmas Day tree")
+
+    def test_dry_run(self):
+        output = self.run_command("Christmas", "Easter", dry_run=True)
+
+        self.assertIn("wagtailcore.Page: 1 would be updated", output)
+        self.assertEqual(EventPage.objects.get(url_path='/home/events/christmas/').title, "Christmas")
+
+    def test_live_only(self):
+        self.run_command("Event", "Party", live_only=True)
+
+        self.assertTrue(Page.objects.filter(title="Partys").exists())
+        self.assertTrue(Page.objects.filter(title="Tentative Unpublished Event").exists())
+
+    def test_app_labels(self):
+        self.run_command("locked", "unlocked", app_labels=['wagtailcore'])
+        self.run_command("Secret", "Public", app_labels=['wagtailcore'])
+
+        # Only pages that are plain Page objects are changed
+        self.assertTrue(Page.objects.filter(title="My unlocked page").exists())
+        self.assertTrue(Page.objects.filter(title="Secret plans").exists())
+
+    def test_unknown_app_label(self):
+        with self.assertRaises(CommandError):
+            self.run_command("us", "them", app_labels=['nosuchapp'])
+
 
 class TestPublishScheduledPagesCommand(TestCase):
     def setUp(self):
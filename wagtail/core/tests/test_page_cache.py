@@ -0,0 +1,188 @@
+import mock
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.utils.cache import patch_cache_control
+
+from wagtail.core.models import Page, PageViewRestriction, Site
+from wagtail.tests.testapp.models import EventIndex, EventPage
+
+
+@override_settings(
+    CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    },
+    WAGTAIL_PAGE_CACHE={
+        'CACHE': 'default',
+        'TIMEOUT': 600,
+    },
+)
+class TestPageCache(TestCase):
+    fixtures = ['test.json']
+
+    def setUp(self):
+        cache.clear()
+
+    def assertCached(self, path, **extra):
+        self.client.get(path, **extra)
+
+        with mock.patch.object(EventPage, 'serve') as serve, mock.patch.object(EventIndex, 'serve') as index_serve:
+            response = self.client.get(path, **extra)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(serve.called or index_serve.called, "%s was rendered again" % path)
+        return response
+
+    def assertNotCached(self, path, **extra):
+        self.client.get(path, **extra)
+
+        response = self.client.get(path, **extra)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.templates, "%s was served from the cache" % path)
+        return response
+
+    def test_response_is_cached(self):
+        response = self.assertCached('/events/christmas/')
+        self.assertContains(response, '<h1>Christmas</h1>')
+
+    def test_cached_response_is_used_without_routing(self):
+        self.client.get('/events/christmas/')
+
+        with mock.patch('wagtail.core.views.has_custom_serve_hooks', return_value=False), \
+                mock.patch.object(Page, 'route') as route:
+            response = self.client.get('/events/christmas/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '<h1>Christmas</h1>')
+        self.assertFalse(route.called)
+
+    def test_hooks_run_before_cached_response_is_used(self):
+        self.client.get('/events/')
+
+        # The testapp blocks Googlebot with a before_serve_page hook
+        response = self.client.get('/events/', HTTP_USER_AGENT='GoogleBot')
+        self.assertContains(response, 'bad googlebot no cookie')
+
+    def test_query_string_is_part_of_key(self):
+        self.client.get('/events/christmas/')
+
+        response = self.client.get('/events/christmas/?foo=bar')
+        self.assertTrue(response.templates)
+
+    @override_settings(WAGTAIL_PAGE_CACHE={'CACHE': 'default', 'VARY_ON': ['HTTP_ACCEPT_LANGUAGE']})
+    def test_vary_on(self):
+        self.client.get('/events/christmas/', HTTP_ACCEPT_LANGUAGE='en')
+
+        response = self.client.get('/events/christmas/', HTTP_ACCEPT_LANGUAGE='fr')
+        self.assertTrue(response.templates)
+
+        self.assertCached('/events/christmas/', HTTP_ACCEPT_LANGUAGE='fr')
+
+    def test_publish_invalidates_page(self):
+        self.client.get('/events/christmas/')
+
+        christmas_page = EventPage.objects.get(url_path='/home/events/christmas/')
+        christmas_page.title = "Christmas 2"
+        christmas_page.save_revision().publish()
+
+        response = self.client.get('/events/christmas/')
+        self.assertContains(response, '<h1>Christmas 2</h1>')
+
+    def test_publish_invalidates_parent(self):
+        self.client.get('/events/')
+
+        christmas_page = EventPage.objects.get(url_path='/home/events/christmas/')
+        christmas_page.title = "Christmas 2"
+        christmas_page.save_revision().publish()
+
+        response = self.client.get('/events/')
+        self.assertContains(response, 'Christmas 2')
+
+    def test_publish_doesnt_invalidate_other_pages(self):
+        self.client.get('/events/final-event/')
+
+        christmas_page = EventPage.objects.get(url_path='/home/events/christmas/')
+        christmas_page.save_revision().publish()
+
+        self.assertCached('/events/final-event/')
+
+    def test_unpublish_invalidates_page(self):
+        self.client.get('/events/christmas/')
+
+        EventPage.objects.get(url_path='/home/events/christmas/').unpublish()
+
+        response = self.client.get('/events/christmas/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_move_invalidates_cache(self):
+        self.client.get('/events/christmas/')
+
+        christmas_page = Page.objects.get(url_path='/home/events/christmas/')
+        christmas_page.move(Page.objects.get(url_path='/home/about-us/'), pos='last-child')
+
+        response = self.client.get('/events/christmas/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_site_change_invalidates_cache(self):
+        self.client.get('/events/christmas/')
+
+        site = Site.objects.get(is_default_site=True)
+        site.root_page = Page.objects.get(url_path='/home/events/')
+        site.save()
+
+        response = self.client.get('/events/christmas/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_new_view_restriction_invalidates_cache(self):
+        self.client.get('/events/christmas/')
+
+        PageViewRestriction.objects.create(
+            page=Page.objects.get(url_path='/home/events/christmas/'),
+            restriction_type='password',
+            password='swordfish',
+        )
+
+        response = self.client.get('/events/christmas/')
+        self.assertTemplateUsed(response, 'tests/event_page_password_required.html')
+
+    def test_private_pages_arent_cached(self):
+        self.client.post('/_util/authenticate_with_password/1/11/', {
+            'password': 'swordfish',
+            'return_url': '/secret-plans/',
+        })
+
+        self.assertNotCached('/secret-plans/')
+
+    def test_logged_in_users_arent_cached(self):
+        user = get_user_model().objects.create_user('test', 'test@example.com', 'password')
+        self.client.force_login(user)
+
+        self.assertNotCached('/events/christmas/')
+
+    def test_private_responses_arent_cached(self):
+        def serve(page, request, *args, **kwargs):
+            response = HttpResponse("private")
+            patch_cache_control(response, private=True)
+            return response
+
+        with mock.patch.object(EventPage, 'serve', serve):
+            self.client.get('/events/christmas/')
+
+        response = self.client.get('/events/christmas/')
+        self.assertContains(response, '<h1>Christmas</h1>')
+
+    def test_post_requests_arent_cached(self):
+        self.client.get('/events/christmas/')
+
+        with mock.patch.object(EventPage, 'serve', return_value=HttpResponse("posted")):
+            response = self.client.post('/events/christmas/')
+
+        self.assertContains(response, "posted")
+
+    @override_settings(WAGTAIL_PAGE_CACHE=None)
+    def test_disabled(self):
+        self.assertNotCached('/events/christmas/')
@@ -1,6 +1,7 @@
 import datetime
 import json
 
+import mock
 import pytz
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
@@ -491,6 +492,55 @@ class TestServeView(TestCase):
         response = self.client.get('/events/', HTTP_USER_AGENT='GoogleBot')
         self.assertContains(response, 'bad googlebot no cookie')
 
+    def test_conditional_get_disabled_by_default(self):
+        response = self.client.get('/events/christmas/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+        self.assertFalse(response.has_header('Last-Modified'))
+
+    @override_settings(WAGTAIL_CONDITIONAL_GET=True)
+    def test_conditional_get(self):
+        response = self.client.get('/events/christmas/')
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        # The page isn't rendered again if the client's copy is current
+        with mock.patch.object(EventPage, 'serve') as serve:
+            response = self.client.get('/events/christmas/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse(serve.called)
+
+        # Publishing the page changes the ETag
+        christmas_page = EventPage.objects.get(url_path='/home/events/christmas/')
+        christmas_page.save_revision().publish()
+
+        response = self.client.get('/events/christmas/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    @override_settings(WAGTAIL_CONDITIONAL_GET=True)
+    def test_conditional_get_with_if_modified_since(self):
+        christmas_page = EventPage.objects.get(url_path='/home/events/christmas/')
+        christmas_page.save_revision().publish()
+
+        response = self.client.get('/events/christmas/')
+        self.assertEqual(response.status_code, 200)
+        last_modified = response['Last-Modified']
+
+        response = self.client.get('/events/christmas/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    @override_settings(WAGTAIL_CONDITIONAL_GET=True)
+    def test_conditional_get_opt_out(self):
+        with mock.patch.object(EventPage, 'get_etag', return_value=None), \
+                mock.patch.object(EventPage, 'get_last_modified', return_value=None):
+            response = self.client.get('/events/christmas/', HTTP_IF_NONE_MATCH='*')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+        self.assertFalse(response.has_header('Last-Modified'))
+
 
 class TestStaticSitePaths(TestCase):
     def setUp(self):
@@ -1,8 +1,13 @@
+import mock
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 
-from wagtail.core.models import GroupPagePermission, Page, UserPagePermissionsProxy
+from wagtail.core.models import (
+    GroupPagePermission, Page, PagePermissionIndex, UserPagePermissionsProxy,
+    invalidate_page_permissions)
 from wagtail.tests.testapp.models import BusinessSubIndex, EventIndex, EventPage
 
 
@@ -464,3 +469,130 @@ class TestPagePermission(TestCase):
         perms = UserPagePermissionsProxy(user).for_page(christmas_page)
 
         self.assertFalse(perms.can_lock())
+
+
+class TestPagePermissionIndex(TestCase):
+    fixtures = ['test.json']
+
+    def setUp(self):
+        self.event_moderator = get_user_model().objects.get(username='eventmoderator')
+        self.events_page = Page.objects.get(url_path='/home/events/')
+        self.christmas_page = EventPage.objects.get(url_path='/home/events/christmas/')
+        self.homepage = Page.objects.get(url_path='/home/')
+
+    def test_for_path(self):
+        index = PagePermissionIndex([
+            ('0001', 'add'),
+            ('00010002', 'edit'),
+            ('000100020003', 'publish'),
+            ('00010003', 'lock'),
+        ])
+
+        self.assertEqual(index.for_path('0001'), {'add'})
+        self.assertEqual(index.for_path('000100020003'), {'add', 'edit', 'publish'})
+        self.assertEqual(index.for_path('000100030001'), {'add', 'lock'})
+        self.assertEqual(index.for_path('0002'), set())
+
+    def test_get_paths_leaves_out_nested_pages(self):
+        index = PagePermissionIndex([
+            ('00010002', 'edit'),
+            ('000100020003', 'edit'),
+            ('00010003', 'edit'),
+            ('00010004', 'publish'),
+        ])
+
+        self.assertEqual(index.get_paths(['edit']), ['00010002', '00010003'])
+        self.assertEqual(index.get_paths(['lock']), [])
+        self.assertIsNone(index.get_filter(['lock']))
+
+    def test_index_is_shared_by_proxies(self):
+        UserPagePermissionsProxy(self.event_moderator).for_page(self.events_page)
+
+        with self.assertNumQueries(0):
+            for page in [self.homepage, self.events_page, self.christmas_page]:
+                UserPagePermissionsProxy(self.event_moderator).for_page(page)
+
+    def test_index_rebuilt_when_group_permissions_change(self):
+        user_perms = UserPagePermissionsProxy(self.event_moderator)
+        self.assertFalse(user_perms.for_page(self.homepage).can_publish())
+
+        group = self.event_moderator.groups.get(name='Event moderators')
+        GroupPagePermission.objects.create(group=group, page=self.homepage, permission_type='publish')
+
+        self.assertTrue(user_perms.for_page(self.homepage).can_publish())
+        self.assertTrue(user_perms.publishable_pages().filter(id=self.homepage.id).exists())
+
+    def test_index_rebuilt_when_user_groups_change(self):
+        user_perms = UserPagePermissionsProxy(self.event_moderator)
+        self.assertTrue(user_perms.for_page(self.christmas_page).can_publish())
+
+        self.event_moderator.groups.clear()
+
+        self.assertFalse(user_perms.for_page(self.christmas_page).can_publish())
+        self.assertFalse(user_perms.publishable_pages().exists())
+
+    def test_index_rebuilt_when_page_moved(self):
+        user_perms = UserPagePermissionsProxy(self.event_moderator)
+        self.assertTrue(user_perms.for_page(self.christmas_page).can_publish())
+
+        # The paths of the events index, which permissions are given on, and
+        # its children change
+        self.events_page.move(Page.objects.get(url_path='/home/about-us/'), pos='last-child')
+        self.christmas_page.refresh_from_db()
+
+        self.assertTrue(user_perms.for_page(self.christmas_page).can_publish())
+
+    def run_on_commit(self):
+        # The version of the cache is only changed when the transaction is
+        # committed, which never happens in a TestCase
+        return mock.patch('django.db.transaction.on_commit', side_effect=lambda callback: callback())
+
+    @override_settings(WAGTAIL_PAGE_PERMISSIONS_CACHE_TIMEOUT=300)
+    def test_cached_across_requests(self):
+        # Commit the permissions loaded from the fixtures
+        with self.run_on_commit():
+            invalidate_page_permissions()
+
+        UserPagePermissionsProxy(self.event_moderator).get_permission_index()
+
+        # A new user object, as a new request would have, reads the
+        # permissions from the cache
+        user = get_user_model().objects.get(pk=self.event_moderator.pk)
+        with CaptureQueriesContext(connection) as queries:
+            user_perms = UserPagePermissionsProxy(user)
+            self.assertTrue(user_perms.for_page(self.christmas_page).can_publish())
+
+        self.assertFalse(any(
+            GroupPagePermission._meta.db_table in query['sql'] for query in queries.captured_queries
+        ))
+
+        # Changing the permissions of the group changes the version of the cache
+        with self.run_on_commit():
+            GroupPagePermission.objects.filter(group__user=self.event_moderator).delete()
+        user = get_user_model().objects.get(pk=self.event_moderator.pk)
+        self.assertFalse(UserPagePermissionsProxy(user).for_page(self.christmas_page).can_publish())
+
+    @override_settings(WAGTAIL_PAGE_PERMISSIONS_CACHE_TIMEOUT=300)
+    def test_cache_version_changed_on_commit(self):
+        with self.run_on_commit():
+            invalidate_page_permissions()
+        version = PagePermissionIndex.get_version()
+
+        on_commit_callbacks = []
+        with mock.patch('django.db.transaction.on_commit', side_effect=on_commit_callbacks.append):
+            GroupPagePermission.objects.filter(group__user=self.event_moderator).delete()
+
+        # Until the change is committed, other processes may still read the
+        # old permissions, so they mustn't be cached under a new version
+        self.assertEqual(PagePermissionIndex.get_version(), version)
+
+        # This process doesn't use the cache in the meantime
+        user = get_user_model().objects.get(pk=self.event_moderator.pk)
+        self.assertFalse(UserPagePermissionsProxy(user).for_page(self.christmas_page).can_publish())
+
+        for callback in on_commit_callbacks:
+            callback()
+
+        self.assertNotEqual(PagePermissionIndex.get_version(), version)
+        user = get_user_model().objects.get(pk=self.event_moderator.pk)
+        self.assertFalse(UserPagePermissionsProxy(user).for_page(self.christmas_page).can_publish())
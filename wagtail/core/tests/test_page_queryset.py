@@ -397,6 +397,49 @@ class TestPageQuerySet(TestCase):
         # Check that the event is in the results
         self.assertTrue(pages.filter(id=event.id).exists())
 
+    def test_public_with_nested_restrictions(self):
+        events_index = Page.objects.get(url_path='/home/events/')
+        event = Page.objects.get(url_path='/home/events/christmas/')
+        about_us = Page.objects.get(url_path='/home/about-us/')
+
+        PageViewRestriction.objects.create(page=event, password='hello')
+        PageViewRestriction.objects.create(page=events_index, password='hello')
+        PageViewRestriction.objects.create(page=about_us, password='hello')
+
+        # The restriction on the event is covered by the one on the events index
+        restricted_paths = PageViewRestriction.get_restricted_paths()
+        self.assertIn(events_index.path, restricted_paths)
+        self.assertIn(about_us.path, restricted_paths)
+        self.assertNotIn(event.path, restricted_paths)
+
+        pages = Page.objects.public()
+        self.assertTrue(pages.filter(url_path='/home/').exists())
+        self.assertFalse(pages.filter(id=events_index.id).exists())
+        self.assertFalse(pages.filter(id=event.id).exists())
+        self.assertFalse(pages.filter(id=about_us.id).exists())
+
+    def test_public_after_restriction_deleted(self):
+        events_index = Page.objects.get(url_path='/home/events/')
+        restriction = PageViewRestriction.objects.create(page=events_index, password='hello')
+        self.assertFalse(Page.objects.public().filter(id=events_index.id).exists())
+
+        restriction.delete()
+        self.assertTrue(Page.objects.public().filter(id=events_index.id).exists())
+
+    def test_public_after_restricted_page_moved(self):
+        event = Page.objects.get(url_path='/home/events/christmas/')
+        homepage = Page.objects.get(url_path='/home/')
+        PageViewRestriction.objects.create(page=event, password='hello')
+        self.assertFalse(Page.objects.public().filter(id=event.id).exists())
+
+        old_path = event.path
+        event.move(homepage, pos='last-child')
+        self.assertFalse(Page.objects.public().filter(id=event.id).exists())
+
+        restricted_paths = PageViewRestriction.get_restricted_paths()
+        self.assertIn(Page.objects.get(id=event.id).path, restricted_paths)
+        self.assertNotIn(old_path, restricted_paths)
+
 
 class TestPageQueryInSite(TestCase):
     fixtures = ['test.json']
@@ -1,3 +1,5 @@
+import calendar
+import hashlib
 import inspect
 import re
 import unicodedata
@@ -5,7 +7,9 @@ import unicodedata
 from django.apps import apps
 from django.conf import settings
 from django.db.models import Model
+from django.utils.cache import get_conditional_response
 from django.utils.encoding import force_text
+from django.utils.http import http_date
 from django.utils.text import slugify
 
 WAGTAIL_APPEND_SLASH = getattr(settings, 'WAGTAIL_APPEND_SLASH', True)
@@ -103,3 +107,62 @@ def accepts_kwarg(func, kwarg):
         return True
     except TypeError:
         return False
+
+
+def make_etag(*parts):
+    """
+    Returns a weak ETag made from a hash of the given values. The values must
+    have a repr that doesn't change between processes
+    """
+    return 'W/"%s"' % hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+def get_not_modified_response(request, etag=None, last_modified=None):
+    """
+    Checks the conditional headers of a GET or HEAD request against the given
+    ETag and last modification time. Returns a "304 Not Modified" response if
+    the client's copy is still current (or "412 Precondition Failed" if an
+    If-Match precondition fails), or None if the full response must be sent.
+    """
+    if request.method not in ('GET', 'HEAD') or (etag is None and last_modified is None):
+        return
+
+    if last_modified is not None:
+        last_modified = calendar.timegm(last_modified.utctimetuple())
+
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def set_validator_headers(response, etag=None, last_modified=None):
+    """
+    Adds the ETag and Last-Modified headers to a successful response, unless
+    they are already set.
+    """
+    if response.status_code != 200:
+        return
+
+    if etag is not None and not response.has_header('ETag'):
+        response['ETag'] = etag
+
+    if last_modified is not None and not response.has_header('Last-Modified'):
+        response['Last-Modified'] = http_date(calendar.timegm(last_modified.utctimetuple()))
+
+
+HASH_READ_SIZE = 65536  # 64k
+
+
+def hash_filelike(filelike):
+    """
+    Returns the SHA-1 hash of the contents of a file-like object, as a hex
+    string. The file is read from the start in chunks, rather than all at
+    once, so that large files are not read into memory.
+    """
+    hasher = hashlib.sha1()
+    filelike.seek(0)
+    while True:
+        data = filelike.read(HASH_READ_SIZE)
+        if not data:
+            break
+        hasher.update(data)
+    filelike.seek(0)
+    return hasher.hexdigest()
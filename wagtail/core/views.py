@@ -1,10 +1,15 @@
+from django.conf import settings
 from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
 
 from wagtail.core import hooks
 from wagtail.core.forms import PasswordViewRestrictionForm
 from wagtail.core.models import Page, PageViewRestriction
+from wagtail.core.page_cache import get_page_cache, has_custom_serve_hooks
+from wagtail.core.utils import get_not_modified_response, set_validator_headers
 
 
 def serve(request, path):
@@ -13,6 +18,18 @@ def serve(request, path):
     if not request.site:
         raise Http404
 
+    page_cache = get_page_cache()
+    if page_cache is not None and not page_cache.accepts_request(request):
+        page_cache = None
+
+    # Cached responses are used without routing the request, unless there are
+    # hooks that may decide to respond differently to it
+    run_hooks_first = page_cache is not None and has_custom_serve_hooks()
+    if page_cache is not None and not run_hooks_first:
+        response = page_cache.get(request, path)
+        if response is not None:
+            return _get_cached_conditional_response(request, response)
+
     path_components = [component for component in path.split('/') if component]
     page, args, kwargs = request.site.root_page.specific.route(request, path_components)
 
@@ -21,7 +38,58 @@ def serve(request, path):
         if isinstance(result, HttpResponse):
             return result
 
-    return page.serve(request, *args, **kwargs)
+    if page_cache is None:
+        return _serve_page(request, page, args, kwargs)
+
+    # Private pages are never cached, even if this visitor may see them
+    restricted_paths = PageViewRestriction.get_restricted_paths()
+    if any(page.path.startswith(restricted_path) for restricted_path in restricted_paths):
+        return _serve_page(request, page, args, kwargs)
+
+    if run_hooks_first:
+        response = page_cache.get(request, path)
+        if response is not None:
+            return _get_cached_conditional_response(request, response)
+
+    tokens = page_cache.get_tokens(page)
+    response = _serve_page(request, page, args, kwargs)
+
+    if hasattr(response, 'render') and callable(response.render):
+        response.add_post_render_callback(lambda r: page_cache.set(request, path, tokens, r))
+    else:
+        page_cache.set(request, path, tokens, response)
+
+    return response
+
+
+def _serve_page(request, page, args, kwargs):
+    if not getattr(settings, 'WAGTAIL_CONDITIONAL_GET', False) or request.method not in ('GET', 'HEAD'):
+        return page.serve(request, *args, **kwargs)
+
+    # Answer conditional requests without rendering the page if the client's
+    # copy is still current
+    etag = page.get_etag(request, *args, **kwargs)
+    last_modified = page.get_last_modified(request, *args, **kwargs)
+
+    response = get_not_modified_response(request, etag, last_modified)
+    if response is not None:
+        return response
+
+    response = page.serve(request, *args, **kwargs)
+    set_validator_headers(response, etag, last_modified)
+    return response
+
+
+def _get_cached_conditional_response(request, response):
+    # Cached responses keep the validators they were rendered with
+    if not getattr(settings, 'WAGTAIL_CONDITIONAL_GET', False):
+        return response
+
+    last_modified = response.get('Last-Modified')
+    if last_modified is not None:
+        last_modified = parse_http_date_safe(last_modified)
+
+    return get_conditional_response(request, etag=response.get('ETag'), last_modified=last_modified, response=response)
 
 
 def authenticate_with_password(request, page_view_restriction_id, page_id):
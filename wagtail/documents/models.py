@@ -1,4 +1,5 @@
 import os.path
+from contextlib import contextmanager
 
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
@@ -10,6 +11,7 @@ from taggit.managers import TaggableManager
 
 from wagtail.admin.utils import get_object_usage
 from wagtail.core.models import CollectionMember
+from wagtail.core.utils import hash_filelike
 from wagtail.search import index
 from wagtail.search.queryset import SearchableQuerySetMixin
 
@@ -34,6 +36,8 @@ class AbstractDocument(CollectionMember, index.Indexed, models.Model):
     tags = TaggableManager(help_text=None, blank=True, verbose_name=_('tags'))
 
     file_size = models.PositiveIntegerField(null=True, editable=False)
+    # A SHA-1 hash of the file contents
+    file_hash = models.CharField(max_length=40, blank=True, editable=False, db_index=True)
 
     objects = DocumentQuerySet.as_manager()
 
@@ -60,6 +64,43 @@ class AbstractDocument(CollectionMember, index.Indexed, models.Model):
 
         return self.file_size
 
+    def _set_file_hash(self):
+        # Read the file in chunks, rather than loading it all into memory
+        with self.open_file() as f:
+            self.file_hash = hash_filelike(f)
+
+    def get_file_hash(self):
+        if self.file_hash == '':
+            try:
+                self._set_file_hash()
+            except (SystemExit, KeyboardInterrupt):
+                raise
+            except Exception:
+                # File doesn't exist
+                return
+
+            self.save(update_fields=['file_hash'])
+
+        return self.file_hash
+
+    @contextmanager
+    def open_file(self):
+        # Open the file if it is closed, and close it again afterwards
+        close_file = False
+        document_file = self.file
+
+        if document_file.closed:
+            # Some storage backends don't allow reopening the file, so get a
+            # fresh file instance from the storage
+            document_file = self._meta.get_field('file').storage.open(self.file.name, 'rb')
+            close_file = True
+
+        try:
+            yield document_file
+        finally:
+            if close_file:
+                document_file.close()
+
     def __str__(self):
         return self.title
 
@@ -1,3 +1,4 @@
+import hashlib
 import json
 
 from django.contrib.auth import get_user_model
@@ -128,8 +129,9 @@ class TestDocumentAddView(TestCase, WagtailTestUtils):
             root_collection
         )
 
-        # Check that the file_size field was set
+        # Check that the file_size and file_hash fields were set
         self.assertTrue(document.file_size)
+        self.assertEqual(document.file_hash, hashlib.sha1(b"A boring example document").hexdigest())
 
     def test_post_with_collections(self):
         root_collection = Collection.get_first_root_node()
@@ -434,6 +436,52 @@ class TestMultipleDocumentUploader(TestCase, WagtailTestUtils):
         # form should not contain a collection chooser
         self.assertNotIn('Collection', response_json['form'])
 
+    def test_add_post_duplicate(self):
+        """
+        Uploading a file that has already been uploaded stores it again by default
+        """
+        doc = models.Document.objects.create(
+            title="Test document",
+            file=ContentFile(b"Simple text document", name='test.txt'),
+        )
+        doc.get_file_hash()
+
+        response = self.client.post(reverse('wagtaildocs:add_multiple'), {
+            'files[]': SimpleUploadedFile('test.txt', b"Simple text document"),
+        }, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+        response_json = json.loads(response.content.decode())
+        self.assertTrue(response_json['success'])
+        self.assertFalse(response_json['duplicate'])
+        self.assertNotEqual(response_json['doc_id'], doc.id)
+        self.assertEqual(models.Document.objects.filter(file_hash=doc.file_hash).count(), 2)
+
+    @override_settings(WAGTAILDOCS_REUSE_DUPLICATE_UPLOADS=True)
+    def test_add_post_duplicate_reused(self):
+        """
+        With WAGTAILDOCS_REUSE_DUPLICATE_UPLOADS, uploading a file that has already been
+        uploaded returns the existing document instead
+        """
+        doc = models.Document.objects.create(
+            title="Test document",
+            file=ContentFile(b"Simple text document", name='test.txt'),
+        )
+        doc.get_file_hash()
+
+        response = self.client.post(reverse('wagtaildocs:add_multiple'), {
+            'files[]': SimpleUploadedFile('test.txt', b"Simple text document"),
+        }, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+        response_json = json.loads(response.content.decode())
+        self.assertTrue(response_json['success'])
+        self.assertTrue(response_json['duplicate'])
+        self.assertEqual(response_json['doc_id'], doc.id)
+        self.assertEqual(models.Document.objects.filter(file_hash=doc.file_hash).count(), 1)
+
+        # The existing document can't be deleted from the upload form
+        self.assertContains(response, "This file has already been uploaded")
+        self.assertNotContains(response, reverse('wagtaildocs:delete_multiple', args=(doc.id, )))
+
     def test_add_post_with_collections(self):
         """
         This tests that a POST request to the add view saves the document
@@ -964,6 +1012,22 @@ class TestEditOnlyPermissions(TestCase, WagtailTestUtils):
         # user should be able to see documents not owned by them
         self.assertContains(response, "Test document")
 
+    def test_get_index_num_queries(self):
+        for i in range(5):
+            models.Document.objects.create(
+                title="Test document %d" % i, file=ContentFile(b"Hello world", name='test.txt'),
+                collection=self.nice_plans_collection
+            )
+
+        # Fill the caches used by all admin views first
+        self.client.get(reverse('wagtaildocs:index'))
+
+        # The user's collection permissions are only looked up once, however
+        # many times they are checked
+        with self.assertNumQueries(18):
+            response = self.client.get(reverse('wagtaildocs:index'))
+        self.assertEqual(response.status_code, 200)
+
     def test_search(self):
         response = self.client.get(reverse('wagtaildocs:index'), {'q': "Hello"})
         self.assertEqual(response.status_code, 200)
@@ -111,6 +111,7 @@ def chooser_upload(request):
 
         if form.is_valid():
             document.file_size = document.file.size
+            document._set_file_hash()
 
             form.save()
 
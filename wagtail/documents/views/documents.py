@@ -97,6 +97,7 @@ def add(request):
         form = DocumentForm(request.POST, request.FILES, instance=doc, user=request.user)
         if form.is_valid():
             doc.file_size = doc.file.size
+            doc._set_file_hash()
 
             form.save()
 
@@ -131,10 +132,12 @@ def edit(request, document_id):
         original_file = doc.file
         form = DocumentForm(request.POST, request.FILES, instance=doc, user=request.user)
         if form.is_valid():
-            doc = form.save()
             if 'file' in form.changed_data:
                 doc.file_size = doc.file.size
+                doc._set_file_hash()
 
+            doc = form.save()
+            if 'file' in form.changed_data:
                 # if providing a new document file, delete the old one.
                 # NB Doing this via original_file.delete() clears the file field,
                 # which definitely isn't what we want...
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.core.exceptions import PermissionDenied
 from django.http import HttpResponseBadRequest, JsonResponse
 from django.shortcuts import get_object_or_404, render
@@ -50,14 +51,29 @@ def add(request):
             doc = form.save(commit=False)
             doc.uploaded_by_user = request.user
             doc.file_size = doc.file.size
-            doc.save()
+            doc._set_file_hash()
+
+            duplicate = None
+            if getattr(settings, 'WAGTAILDOCS_REUSE_DUPLICATE_UPLOADS', False):
+                # Use an existing document with the same file, rather than storing
+                # the file again
+                duplicate = permission_policy.instances_user_has_permission_for(
+                    request.user, 'change'
+                ).filter(collection=doc.collection, file_hash=doc.file_hash).order_by('pk').first()
+
+            if duplicate is not None:
+                doc = duplicate
+            else:
+                doc.save()
 
             # Success! Send back an edit form for this document to the user
             return JsonResponse({
                 'success': True,
                 'doc_id': int(doc.id),
+                'duplicate': duplicate is not None,
                 'form': render_to_string('wagtaildocs/multiple/edit_form.html', {
                     'doc': doc,
+                    'duplicate': duplicate is not None,
                     'form': DocumentMultiForm(
                         instance=doc, prefix='doc-%d' % doc.id, user=request.user
                     ),
@@ -0,0 +1,44 @@
+from django.test import TestCase
+
+from wagtail.embeds.finders import get_finders
+from wagtail.tests.benchmark import Benchmark
+
+
+URL_TEMPLATES = [
+    'https://www.youtube.com/watch?v={}',
+    'https://youtu.be/{}',
+    'https://vimeo.com/{}',
+    'https://twitter.com/wagtailcms/status/{}',
+    'https://www.instagram.com/p/{}/',
+    'https://www.flickr.com/photos/wagtail/{}',
+    'https://soundcloud.com/wagtail/{}',
+    'https://www.slideshare.net/wagtail/{}',
+    'https://wagtail.tumblr.com/post/{}',
+    'https://www.ted.com/talks/{}',
+    'http://vzaar.me/{}',
+    'https://speakerdeck.com/wagtail/{}',
+    # URLs which aren't handled by any provider have to be checked against
+    # every pattern so make sure they're well represented
+    'https://wagtail.io/blog/{}/',
+    'https://example.com/videos/{}',
+    'http://localhost:8000/{}',
+]
+
+
+class BenchOEmbedFinderAccept(Benchmark, TestCase):
+    """
+    Looks up the finder for 3000 URLs of a mix of popular providers and
+    unsupported sites, as get_embed does for every embed being rendered.
+    """
+
+    def setUp(self):
+        self.urls = [
+            URL_TEMPLATES[i % len(URL_TEMPLATES)].format(i)
+            for i in range(3000)
+        ]
+
+    def bench(self):
+        for url in self.urls:
+            for finder in get_finders():
+                if finder.accept(url):
+                    break
@@ -1,5 +1,6 @@
 from wagtail.core import blocks
-from wagtail.embeds.format import embed_to_frontend_html
+from wagtail.embeds import embeds
+from wagtail.embeds.format import embed_obj_to_frontend_html, embed_to_frontend_html
 
 
 class EmbedValue:
@@ -10,10 +11,16 @@ class EmbedValue:
     we want to be able to do {% embed value.url 500 %} without
     doing a redundant fetch of the embed at the default width.
     """
-    def __init__(self, url):
+    def __init__(self, url, embed=None):
         self.url = url
 
+        # The Embed object for the URL, if it has already been loaded
+        self._embed = embed
+
     def __str__(self):
+        if self._embed is not None:
+            return embed_obj_to_frontend_html(self._embed)
+
         return embed_to_frontend_html(self.url)
 
 
@@ -36,6 +43,17 @@ class EmbedBlock(blocks.URLBlock):
         else:
             return EmbedValue(value)
 
+    def bulk_to_python(self, values):
+        # Load the embeds of all blocks in a StreamField with a single query.
+        # Embeds that aren't in the database yet are fetched when rendered.
+        values = list(values)
+        embed_objs = embeds.get_embeds([(url, None) for url in values if url], fetch_missing=False)
+
+        return [
+            EmbedValue(url, embed=embed_objs.get((url, None))) if url else None
+            for url in values
+        ]
+
     def get_prep_value(self, value):
         # serialisable value should be a URL string
         if value is None:
@@ -1,28 +1,116 @@
-from datetime import datetime
+import hashlib
+import logging
+import threading
+from datetime import timedelta
 
-from .exceptions import EmbedUnsupportedProviderException
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+
+from .exceptions import EmbedException, EmbedUnsupportedProviderException
 from .finders import get_finders
 from .models import Embed
 
 
+logger = logging.getLogger('wagtail.embeds')
+
+# Number of seconds another refresh of a stale embed is held off for, while a
+# refresh of that embed is in progress (or after it has failed)
+REFRESH_LOCK_TIMEOUT = 60
+
+
+def find_embed(url, max_width=None):
+    for finder in get_finders():
+        if finder.accept(url):
+            return finder.find_embed(url, max_width=max_width)
+
+    raise EmbedUnsupportedProviderException
+
+
 def get_embed(url, max_width=None, finder=None):
     # Check database
     try:
-        return Embed.objects.get(url=url, max_width=max_width)
+        embed = Embed.objects.get(url=url, max_width=max_width)
     except Embed.DoesNotExist:
         pass
+    else:
+        _refresh_if_stale(embed, finder=finder)
+        return embed
+
+    return fetch_embed(url, max_width, finder=finder)
+
+
+def get_embeds(embed_requests, finder=None, fetch_missing=True):
+    """
+    Bulk version of get_embed. Takes an iterable of (url, max_width) tuples and
+    returns a dict mapping each of them to its Embed object.
+
+    All embeds that are already in the database are loaded with a single query.
+    The rest are fetched from the finders, unless fetch_missing is False. Embeds
+    that can't be found are left out of the result rather than raising
+    EmbedException.
+    """
+    embed_requests = set(embed_requests)
+    if not embed_requests:
+        return {}
+
+    embeds = {}
+    for embed in Embed.objects.filter(url__in={url for url, max_width in embed_requests}):
+        key = (embed.url, embed.max_width)
+        if key in embed_requests:
+            _refresh_if_stale(embed, finder=finder)
+            embeds[key] = embed
+
+    if fetch_missing:
+        for url, max_width in embed_requests - set(embeds):
+            try:
+                embeds[(url, max_width)] = fetch_embed(url, max_width, finder=finder)
+            except EmbedException:
+                pass
+
+    return embeds
+
+
+def fetch_embed(url, max_width=None, finder=None):
+    """
+    Fetches an embed from the finders and stores it in the database.
 
-    # Get/Call finder
-    if not finder:
-        def finder(url, max_width=None):
-            for finder in get_finders():
-                if finder.accept(url):
-                    return finder.find_embed(url, max_width=max_width)
+    Failed lookups are remembered for WAGTAILEMBEDS_NEGATIVE_CACHE_TIMEOUT
+    seconds so broken URLs don't cause a request to the provider each time a
+    page that contains them is rendered.
+    """
+    failure_cache_key = _get_cache_key('failure', url, max_width)
+    failure = cache.get(failure_cache_key)
+    if failure is not None:
+        raise failure("Fetching an embed for %s failed recently" % url)
 
-            raise EmbedUnsupportedProviderException
+    try:
+        embed_dict = (finder or find_embed)(url, max_width)
+    except EmbedException as e:
+        timeout = getattr(settings, 'WAGTAILEMBEDS_NEGATIVE_CACHE_TIMEOUT', 300)
+        if timeout:
+            cache.set(failure_cache_key, type(e), timeout)
+        raise
+
+    return _save_embed(url, max_width, embed_dict)
+
+
+def refresh_embed(url, max_width=None, finder=None):
+    """
+    Fetches an embed from the finders again and updates the database record.
+    Returns None if the finders couldn't find the embed.
+    """
+    try:
+        embed_dict = (finder or find_embed)(url, max_width)
+    except EmbedException:
+        logger.warning("Failed to refresh embed for %s", url)
+        return
+
+    return _save_embed(url, max_width, embed_dict)
 
-    embed_dict = finder(url, max_width)
 
+def _save_embed(url, max_width, embed_dict):
     # Make sure width and height are valid integers before inserting into database
     try:
         embed_dict['width'] = int(embed_dict['width'])
@@ -38,15 +126,50 @@ def get_embed(url, max_width=None, finder=None):
     if 'html' not in embed_dict or not embed_dict['html']:
         embed_dict['html'] = ''
 
-    # Create database record
-    embed, created = Embed.objects.get_or_create(
+    # Create or update database record (this also sets last_updated)
+    embed, created = Embed.objects.update_or_create(
         url=url,
         max_width=max_width,
         defaults=embed_dict,
     )
 
-    # Save
-    embed.last_updated = datetime.now()
-    embed.save()
-
     return embed
+
+
+def _get_cache_key(prefix, url, max_width):
+    digest = hashlib.sha1('{}:{}'.format(url, max_width).encode('utf-8')).hexdigest()
+    return 'wagtailembeds:{}:{}'.format(prefix, digest)
+
+
+def _refresh_if_stale(embed, finder=None):
+    """
+    If the embed is older than WAGTAILEMBEDS_MAX_AGE seconds, start refreshing
+    it in the background. The stale embed is still used in the meantime, so
+    rendering never waits on the provider.
+    """
+    max_age = getattr(settings, 'WAGTAILEMBEDS_MAX_AGE', None)
+    if max_age is None or embed.last_updated is None:
+        return
+
+    if embed.last_updated > timezone.now() - timedelta(seconds=max_age):
+        return
+
+    # Make sure only one process refreshes this embed at a time
+    if cache.add(_get_cache_key('refresh', embed.url, embed.max_width), True, REFRESH_LOCK_TIMEOUT):
+        _refresh_embed_in_background(embed.url, embed.max_width, finder=finder)
+
+
+def _refresh_embed_in_background(url, max_width, finder=None):
+    def refresh():
+        try:
+            refresh_embed(url, max_width, finder=finder)
+        except Exception:
+            # Catch and log all errors as there's nothing else to report them to
+            logger.exception("Exception raised while refreshing embed for %s", url)
+        finally:
+            # The thread opened its own database connection
+            connection.close()
+
+    thread = threading.Thread(target=refresh)
+    thread.daemon = True
+    thread.start()
@@ -1,7 +1,10 @@
+from functools import lru_cache
 from importlib import import_module
 
-from django.utils.module_loading import import_string
 from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
 
 
 def import_finder_class(dotted_path):
@@ -34,7 +37,8 @@ def _get_config_from_settings():
         ]
 
 
-def get_finders():
+@lru_cache()
+def _get_finders():
     finders = []
 
     for finder_config in _get_config_from_settings():
@@ -43,4 +47,16 @@ def get_finders():
 
         finders.append(cls(**finder_config))
 
-    return finders
+    return tuple(finders)
+
+
+def get_finders():
+    # Finders are built once per process as some of them (such as the oEmbed
+    # finder) do a lot of work on initialisation
+    return list(_get_finders())
+
+
+@receiver(setting_changed)
+def reset_finders(setting, **kwargs):
+    if setting == 'WAGTAILEMBEDS_FINDERS':
+        _get_finders.cache_clear()
@@ -19,24 +19,37 @@ class OEmbedFinder(EmbedFinder):
         self._endpoints = {}
 
         for provider in providers or all_providers:
-            patterns = []
-
             endpoint = provider['endpoint'].replace('{format}', 'json')
+            self._endpoints[endpoint] = provider['urls']
+
+        # Combine the URL patterns of all providers into a single regex so a URL
+        # can be matched in one pass. Each pattern is wrapped in a capturing
+        # group; as it encloses any groups within the pattern, it is always the
+        # last group to close and the index of the group that matched is given
+        # by match.lastindex.
+        self._pattern_endpoints = [None]
+        combined_patterns = []
+        for endpoint, patterns in self._endpoints.items():
+            for pattern in patterns:
+                combined_patterns.append('(' + pattern + ')')
+                self._pattern_endpoints.append(endpoint)
 
-            for url in provider['urls']:
-                patterns.append(re.compile(url))
+                # Keep group indices in step with any groups within the pattern
+                self._pattern_endpoints.extend([endpoint] * re.compile(pattern).groups)
 
-            self._endpoints[endpoint] = patterns
+        self._pattern = re.compile('|'.join(combined_patterns)) if combined_patterns else None
 
         if options:
             self.options = self.options.copy()
             self.options.update(options)
 
     def _get_endpoint(self, url):
-        for endpoint, patterns in self._endpoints.items():
-            for pattern in patterns:
-                if re.match(pattern, url):
-                    return endpoint
+        if self._pattern is None:
+            return
+
+        match = self._pattern.match(url)
+        if match:
+            return self._pattern_endpoints[match.lastindex]
 
     def accept(self, url):
         return self._get_endpoint(url) is not None
@@ -7,20 +7,28 @@ from wagtail.embeds.exceptions import EmbedException
 def embed_to_frontend_html(url):
     try:
         embed = embeds.get_embed(url)
-
-        # Render template
-        return render_to_string('wagtailembeds/embed_frontend.html', {
-            'embed': embed,
-        })
     except EmbedException:
         # silently ignore failed embeds, rather than letting them crash the page
         return ''
 
+    return embed_obj_to_frontend_html(embed)
+
+
+def embed_obj_to_frontend_html(embed):
+    # Render template
+    return render_to_string('wagtailembeds/embed_frontend.html', {
+        'embed': embed,
+    })
+
 
 def embed_to_editor_html(url):
     embed = embeds.get_embed(url)
     # catching EmbedException is the responsibility of the caller
 
+    return embed_obj_to_editor_html(embed)
+
+
+def embed_obj_to_editor_html(embed):
     # Render template
     return render_to_string('wagtailembeds/embed_editor.html', {
         'embed': embed,
@@ -9,12 +9,30 @@ from wagtail.embeds.exceptions import EmbedException
 
 # Front-end conversion
 
-def media_embedtype_handler(attrs):
-    """
-    Given a dict of attributes from the <embed> tag, return the real HTML
-    representation for use on the front-end.
-    """
-    return format.embed_to_frontend_html(attrs['url'])
+class MediaEmbedTypeHandler:
+    def __call__(self, attrs):
+        """
+        Given a dict of attributes from the <embed> tag, return the real HTML
+        representation for use on the front-end.
+        """
+        return format.embed_to_frontend_html(attrs['url'])
+
+    def expand_db_attributes_many(self, attrs_list):
+        """
+        Given a list of attribute dicts for all the <embed> tags in a piece of
+        rich text, return their front-end HTML representations, loading all the
+        embeds at once.
+        """
+        embed_objs = embeds.get_embeds([(attrs['url'], None) for attrs in attrs_list])
+
+        return [
+            format.embed_obj_to_frontend_html(embed_objs[(attrs['url'], None)])
+            if (attrs['url'], None) in embed_objs else ''
+            for attrs in attrs_list
+        ]
+
+
+media_embedtype_handler = MediaEmbedTypeHandler()
 
 
 # hallo.js / editor-html conversion
@@ -49,6 +67,21 @@ class MediaEmbedHandler:
             # Could be replaced with a nice error message
             return ''
 
+    @staticmethod
+    def expand_db_attributes_many(attrs_list):
+        """
+        Given a list of attribute dicts for all the <embed> tags in a piece of
+        rich text, return their HTML representations for use within the editor,
+        loading all the embeds at once.
+        """
+        embed_objs = embeds.get_embeds([(attrs['url'], None) for attrs in attrs_list])
+
+        return [
+            format.embed_obj_to_editor_html(embed_objs[(attrs['url'], None)])
+            if (attrs['url'], None) in embed_objs else ''
+            for attrs in attrs_list
+        ]
+
 
 EditorHTMLEmbedConversionRule = [
     editor_html.EmbedTypeRule('media', MediaEmbedHandler)
@@ -1,3 +1,4 @@
+import datetime
 import unittest
 import urllib.request
 from urllib.error import URLError
@@ -7,13 +8,14 @@ from django import template
 from django.core.exceptions import ValidationError
 from django.test import TestCase, override_settings
 from django.urls import reverse
+from django.utils.timezone import utc
 from mock import patch
 
 from wagtail.core import blocks
 from wagtail.core.rich_text import expand_db_html
 from wagtail.embeds import oembed_providers
 from wagtail.embeds.blocks import EmbedBlock, EmbedValue
-from wagtail.embeds.embeds import get_embed
+from wagtail.embeds.embeds import get_embed, get_embeds, refresh_embed
 from wagtail.embeds.exceptions import EmbedNotFoundException, EmbedUnsupportedProviderException
 from wagtail.embeds.finders import get_finders
 from wagtail.embeds.finders.embedly import EmbedlyFinder as EmbedlyFinder
@@ -77,6 +79,9 @@ class TestGetFinders(TestCase):
         self.assertIsInstance(finders[0], OEmbedFinder)
         self.assertEqual(finders[0].options, {'foo': 'bar'})
 
+    def test_finders_are_reused(self):
+        self.assertIs(get_finders()[0], get_finders()[0])
+
 
 class TestEmbeds(TestCase):
     def setUp(self):
@@ -159,6 +164,105 @@ class TestEmbeds(TestCase):
         with self.assertRaises(EmbedUnsupportedProviderException):
             get_embed('www.test.com/1234', max_width=400)
 
+    def test_failed_lookups_are_cached(self):
+        def broken_finder(url, max_width=None):
+            self.hit_count += 1
+            raise EmbedNotFoundException
+
+        with self.assertRaises(EmbedNotFoundException):
+            get_embed('www.test.com/broken', finder=broken_finder)
+
+        # The finder shouldn't be asked again while the failure is cached
+        with self.assertRaises(EmbedNotFoundException):
+            get_embed('www.test.com/broken', finder=broken_finder)
+
+        self.assertEqual(self.hit_count, 1)
+
+    @override_settings(WAGTAILEMBEDS_NEGATIVE_CACHE_TIMEOUT=0)
+    def test_failed_lookups_arent_cached_when_disabled(self):
+        def broken_finder(url, max_width=None):
+            self.hit_count += 1
+            raise EmbedNotFoundException
+
+        for i in range(2):
+            with self.assertRaises(EmbedNotFoundException):
+                get_embed('www.test.com/broken', finder=broken_finder)
+
+        self.assertEqual(self.hit_count, 2)
+
+    def test_get_embeds(self):
+        get_embed('www.test.com/1234', finder=self.dummy_finder)
+        get_embed('www.test.com/1234', max_width=400, finder=self.dummy_finder)
+        self.hit_count = 0
+
+        def finder(url, max_width=None):
+            if url == 'www.test.com/broken':
+                raise EmbedNotFoundException
+
+            return self.dummy_finder(url, max_width=max_width)
+
+        with self.assertNumQueries(1):
+            embeds = get_embeds([
+                ('www.test.com/1234', None),
+                ('www.test.com/1234', 400),
+            ], finder=finder)
+
+        self.assertEqual(embeds[('www.test.com/1234', None)].width, 640)
+        self.assertEqual(embeds[('www.test.com/1234', 400)].width, 400)
+        self.assertEqual(self.hit_count, 0)
+
+        # Missing embeds are fetched and embeds that can't be found are left out
+        embeds = get_embeds([
+            ('www.test.com/1234', None),
+            ('www.test.com/4321', None),
+            ('www.test.com/broken', None),
+        ], finder=finder)
+
+        self.assertEqual(set(embeds.keys()), {('www.test.com/1234', None), ('www.test.com/4321', None)})
+        self.assertEqual(self.hit_count, 1)
+
+    def test_get_embeds_without_fetching_missing(self):
+        get_embed('www.test.com/1234', finder=self.dummy_finder)
+
+        embeds = get_embeds([
+            ('www.test.com/1234', None),
+            ('www.test.com/4321', None),
+        ], finder=self.dummy_finder, fetch_missing=False)
+
+        self.assertEqual(set(embeds.keys()), {('www.test.com/1234', None)})
+        self.assertEqual(self.hit_count, 1)
+
+    @override_settings(WAGTAILEMBEDS_MAX_AGE=3600)
+    @patch('wagtail.embeds.embeds._refresh_embed_in_background')
+    def test_stale_embed_is_refreshed_in_background(self, refresh_embed_in_background):
+        get_embed('www.test.com/1234', finder=self.dummy_finder)
+
+        # Not stale yet
+        get_embed('www.test.com/1234', finder=self.dummy_finder)
+        self.assertFalse(refresh_embed_in_background.called)
+
+        Embed.objects.update(last_updated=datetime.datetime(2000, 1, 1, tzinfo=utc))
+
+        # The stale embed is returned without waiting for the finder
+        embed = get_embed('www.test.com/1234', finder=self.dummy_finder)
+        self.assertEqual(embed.title, "Test: www.test.com/1234")
+        self.assertEqual(self.hit_count, 1)
+        refresh_embed_in_background.assert_called_once_with('www.test.com/1234', None, finder=self.dummy_finder)
+
+        # Only one refresh is started at a time
+        get_embed('www.test.com/1234', finder=self.dummy_finder)
+        self.assertEqual(refresh_embed_in_background.call_count, 1)
+
+    def test_refresh_embed(self):
+        get_embed('www.test.com/1234', finder=self.dummy_finder)
+        Embed.objects.update(title="Old title", last_updated=datetime.datetime(2000, 1, 1, tzinfo=utc))
+
+        embed = refresh_embed('www.test.com/1234', finder=self.dummy_finder)
+
+        self.assertEqual(embed.title, "Test: www.test.com/1234")
+        self.assertEqual(Embed.objects.get().title, "Test: www.test.com/1234")
+        self.assertGreater(Embed.objects.get().last_updated.year, 2000)
+
 
 class TestChooser(TestCase, WagtailTestUtils):
     def setUp(self):
@@ -360,6 +464,17 @@ class TestOembed(TestCase):
         finder = OEmbedFinder(providers=[oembed_providers.twitter])
         self.assertFalse(finder.accept("http://www.youtube.com/watch/"))
 
+    def test_oembed_without_providers(self):
+        finder = OEmbedFinder(providers=[{'endpoint': 'http://example.com/oembed', 'urls': []}])
+        self.assertFalse(finder.accept("http://www.youtube.com/watch/"))
+
+    def test_oembed_matches_provider_after_patterns_with_groups(self):
+        # The patterns of both of these providers contain capturing groups
+        finder = OEmbedFinder(providers=[oembed_providers.five_hundred_px, oembed_providers.vzaar, oembed_providers.vimeo])
+        self.assertEqual(finder._get_endpoint("http://500px.com/photo/1234"), "http://500px.com/photo/{1}/oembed.json")
+        self.assertEqual(finder._get_endpoint("http://vzaar.me/1234"), "http://vzaar.com/api/videos/{1}.json")
+        self.assertEqual(finder._get_endpoint("https://vimeo.com/217403396"), "http://www.vimeo.com/api/oembed.json")
+
     @patch('urllib.request.urlopen')
     @patch('json.loads')
     def test_endpoint_with_format_param(self, loads, urlopen):
@@ -401,6 +516,20 @@ class TestEmbedTag(TestCase):
 
 
 class TestEmbedBlock(TestCase):
+    def test_bulk_to_python(self):
+        Embed.objects.create(url='http://www.example.com/foo', html='<h1>Hello world!</h1>')
+
+        block = EmbedBlock(required=False)
+
+        with self.assertNumQueries(1):
+            values = block.bulk_to_python(['http://www.example.com/foo', 'http://www.example.com/bar', ''])
+
+        self.assertEqual([value.url for value in values[:2]], ['http://www.example.com/foo', 'http://www.example.com/bar'])
+        self.assertIsNone(values[2])
+
+        with self.assertNumQueries(0):
+            self.assertIn('<h1>Hello world!</h1>', str(values[0]))
+
     def test_deserialize(self):
         """
         Deserialising the JSONish value of an EmbedBlock (a URL) should give us an EmbedValue
@@ -630,3 +759,45 @@ class TestMediaEmbedHandler(TestCase):
         result = expand_db_html('<p>1 2 <embed embedtype="media" url="https://www.youtube.com/watch?v=O7D-1RG-VRk&amp;t=25" /> 3 4</p>')
         self.assertIn('test html', result)
         get_embed.assert_called_with('https://www.youtube.com/watch?v=O7D-1RG-VRk&t=25')
+
+    @patch('wagtail.embeds.embeds.get_embeds')
+    def test_expand_multiple_embeds(self, get_embeds):
+        get_embeds.return_value = {
+            ('http://www.youtube.com/watch/1', None): Embed(html='first embed'),
+            ('http://www.youtube.com/watch/2', None): Embed(html='second embed'),
+        }
+
+        result = expand_db_html(
+            '<p><embed embedtype="media" url="http://www.youtube.com/watch/1" /></p>'
+            '<p><embed embedtype="media" url="http://www.youtube.com/watch/2" /></p>'
+            '<p><embed embedtype="media" url="http://www.youtube.com/watch/3" /></p>'
+        )
+
+        # All the embeds are looked up at once and missing ones are removed
+        self.assertEqual(get_embeds.call_count, 1)
+        self.assertEqual(set(get_embeds.call_args[0][0]), {
+            ('http://www.youtube.com/watch/1', None),
+            ('http://www.youtube.com/watch/2', None),
+            ('http://www.youtube.com/watch/3', None),
+        })
+        self.assertIn('first embed', result)
+        self.assertIn('second embed', result)
+        self.assertNotIn('watch/3', result)
+
+    @patch('wagtail.embeds.embeds.get_embeds')
+    def test_expand_multiple_embeds_for_editor(self, get_embeds):
+        get_embeds.return_value = {
+            ('http://www.youtube.com/watch/1', None): Embed(url='http://www.youtube.com/watch/1', title='first embed'),
+            ('http://www.youtube.com/watch/2', None): Embed(url='http://www.youtube.com/watch/2', title='second embed'),
+        }
+
+        result = MediaEmbedHandler.expand_db_attributes_many([
+            {'url': 'http://www.youtube.com/watch/1'},
+            {'url': 'http://www.youtube.com/watch/2'},
+            {'url': 'http://www.youtube.com/watch/3'},
+        ])
+
+        self.assertEqual(len(result), 3)
+        self.assertIn('first embed', result[0])
+        self.assertIn('second embed', result[1])
+        self.assertEqual(result[2], '')
@@ -0,0 +1,18 @@
+# Generated by Django 2.0.13 on 2026-10-19 12:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wagtailimages', '0021_image_file_hash'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='image',
+            name='file_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=40),
+        ),
+    ]
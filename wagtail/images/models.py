@@ -20,6 +20,7 @@ from willow.image import Image as WillowImage
 from wagtail.admin.utils import get_object_usage
 from wagtail.core import hooks
 from wagtail.core.models import CollectionMember
+from wagtail.core.utils import hash_filelike
 from wagtail.images.exceptions import InvalidFilterSpecError
 from wagtail.images.rect import Rect
 from wagtail.search import index
@@ -81,7 +82,7 @@ class AbstractImage(CollectionMember, index.Indexed, models.Model):
 
     file_size = models.PositiveIntegerField(null=True, editable=False)
     # A SHA-1 hash of the file contents
-    file_hash = models.CharField(max_length=40, blank=True, editable=False)
+    file_hash = models.CharField(max_length=40, blank=True, editable=False, db_index=True)
 
     objects = ImageQuerySet.as_manager()
 
@@ -112,14 +113,17 @@ class AbstractImage(CollectionMember, index.Indexed, models.Model):
 
         return self.file_size
 
-    def _set_file_hash(self, file_contents):
-        self.file_hash = hashlib.sha1(file_contents).hexdigest()
+    def _set_file_hash(self, file_contents=None):
+        if file_contents is not None:
+            self.file_hash = hashlib.sha1(file_contents).hexdigest()
+        else:
+            # Read the file in chunks, rather than loading it all into memory
+            with self.open_file() as f:
+                self.file_hash = hash_filelike(f)
 
     def get_file_hash(self):
         if self.file_hash == '':
-            with self.open_file() as f:
-                self._set_file_hash(f.read())
-
+            self._set_file_hash()
             self.save(update_fields=['file_hash'])
 
         return self.file_hash
@@ -277,40 +281,81 @@ class AbstractImage(CollectionMember, index.Indexed, models.Model):
         cache_key = filter.get_cache_key(self)
         Rendition = self.get_rendition_model()
 
+        rendition = self._get_prefetched_rendition(filter.spec, cache_key)
+        if rendition is not None:
+            return rendition
+
         try:
-            rendition = self.renditions.get(
+            # Not self.renditions, which may be limited to prefetched renditions
+            rendition = Rendition.objects.get(
+                image=self,
                 filter_spec=filter.spec,
                 focal_point_key=cache_key,
             )
         except Rendition.DoesNotExist:
-            # Generate the rendition image
-            generated_image = filter.run(self, BytesIO())
-
-            # Generate filename
-            input_filename = os.path.basename(self.file.name)
-            input_filename_without_extension, input_extension = os.path.splitext(input_filename)
-
-            # A mapping of image formats to extensions
-            FORMAT_EXTENSIONS = {
-                'jpeg': '.jpg',
-                'png': '.png',
-                'gif': '.gif',
-            }
+            rendition = self.create_rendition(filter, self.generate_rendition_file(filter))
 
-            output_extension = filter.spec.replace('|', '.') + FORMAT_EXTENSIONS[generated_image.format_name]
-            if cache_key:
-                output_extension = cache_key + '.' + output_extension
+        return rendition
 
-            # Truncate filename to prevent it going over 60 chars
-            output_filename_without_extension = input_filename_without_extension[:(59 - len(output_extension))]
-            output_filename = output_filename_without_extension + '.' + output_extension
+    def _get_prefetched_rendition(self, filter_spec, focal_point_key):
+        # Use the renditions loaded by prefetch_renditions, or by
+        # prefetch_related('renditions'), if any
+        rendition = getattr(self, '_prefetched_renditions', {}).get((filter_spec, focal_point_key))
+        if rendition is not None:
+            return rendition
 
-            rendition, created = self.renditions.get_or_create(
-                filter_spec=filter.spec,
-                focal_point_key=cache_key,
-                defaults={'file': File(generated_image.f, name=output_filename)}
-            )
+        try:
+            renditions = self._prefetched_objects_cache['renditions']
+        except (AttributeError, KeyError):
+            return None
+
+        for rendition in renditions:
+            if rendition.filter_spec == filter_spec and rendition.focal_point_key == focal_point_key:
+                return rendition
 
+    def generate_rendition_file(self, filter):
+        """
+        Generates the image file of the rendition for the given filter, without
+        saving it. This doesn't use the database, so it can be called from
+        another thread.
+        """
+        cache_key = filter.get_cache_key(self)
+
+        # Generate the rendition image
+        generated_image = filter.run(self, BytesIO())
+
+        # Generate filename
+        input_filename = os.path.basename(self.file.name)
+        input_filename_without_extension, input_extension = os.path.splitext(input_filename)
+
+        # A mapping of image formats to extensions
+        FORMAT_EXTENSIONS = {
+            'jpeg': '.jpg',
+            'png': '.png',
+            'gif': '.gif',
+        }
+
+        output_extension = filter.spec.replace('|', '.') + FORMAT_EXTENSIONS[generated_image.format_name]
+        if cache_key:
+            output_extension = cache_key + '.' + output_extension
+
+        # Truncate filename to prevent it going over 60 chars
+        output_filename_without_extension = input_filename_without_extension[:(59 - len(output_extension))]
+        output_filename = output_filename_without_extension + '.' + output_extension
+
+        return File(generated_image.f, name=output_filename)
+
+    def create_rendition(self, filter, rendition_file):
+        """
+        Saves a rendition file generated by generate_rendition_file, unless a
+        rendition for the filter has been created in the meantime.
+        """
+        rendition, created = self.get_rendition_model().objects.get_or_create(
+            image=self,
+            filter_spec=filter.spec,
+            focal_point_key=filter.get_cache_key(self),
+            defaults={'file': rendition_file}
+        )
         return rendition
 
     def is_portrait(self):
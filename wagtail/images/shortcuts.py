@@ -1,4 +1,10 @@
-from wagtail.images.models import SourceImageIOError
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from wagtail.images.models import Filter, SourceImageIOError
+
+# The number of renditions prefetch_renditions generates at the same time
+RENDITION_WORKERS = 4
 
 
 def get_rendition_or_not_found(image, specs):
@@ -19,3 +25,66 @@ def get_rendition_or_not_found(image, specs):
         rendition = Rendition(image=image, width=0, height=0)
         rendition.file.name = 'not-found'
         return rendition
+
+
+def _generate_rendition_file(image, filter):
+    try:
+        return image.generate_rendition_file(filter)
+    except Exception:
+        # Leave images that can't be rendered to get_rendition_or_not_found
+        # (or the template that renders them), as if they hadn't been prefetched
+        return None
+
+
+def prefetch_renditions(images, specs, max_workers=RENDITION_WORKERS):
+    """
+    Loads the renditions of a list of images for one filter spec in a single
+    query, so that image.get_rendition (and the {% image %} tag) don't look
+    them up one by one. Any missing renditions are generated first, up to
+    max_workers at a time.
+
+    :param images: list of AbstractImage, all of the same model
+    :param specs: str or Filter
+    :return: list of AbstractImage
+    """
+    images = list(images)
+    if not images:
+        return images
+
+    filter = Filter(spec=specs) if isinstance(specs, str) else specs
+    Rendition = images[0].get_rendition_model()
+    renditions = Rendition.objects.filter(filter_spec=filter.spec)
+
+    existing = set(renditions.filter(image__in=images).values_list('image_id', 'focal_point_key'))
+    missing_images = [
+        image for image in images
+        if (image.id, filter.get_cache_key(image)) not in existing
+    ]
+
+    if missing_images:
+        # Generating the files doesn't use the database, so it can be done in
+        # other threads. The renditions are then saved in this one
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            rendition_files = list(executor.map(
+                lambda image: _generate_rendition_file(image, filter), missing_images
+            ))
+
+        for image, rendition_file in zip(missing_images, rendition_files):
+            if rendition_file is not None:
+                image.create_rendition(filter, rendition_file)
+
+    # The renditions are kept apart from the prefetch cache of image.renditions,
+    # which would otherwise only contain the renditions for this filter
+    renditions_by_image_id = defaultdict(list)
+    for rendition in renditions.filter(image__in=images):
+        renditions_by_image_id[rendition.image_id].append(rendition)
+
+    for image in images:
+        if not hasattr(image, '_prefetched_renditions'):
+            image._prefetched_renditions = {}
+
+        for rendition in renditions_by_image_id[image.id]:
+            rendition.image = image
+            image._prefetched_renditions[(rendition.filter_spec, rendition.focal_point_key)] = rendition
+
+    return images
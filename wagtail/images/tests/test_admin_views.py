@@ -890,6 +890,45 @@ class TestMultipleImageUploader(TestCase, WagtailTestUtils):
         self.assertEqual(response_json['image_id'], response.context['image'].id)
         self.assertTrue(response_json['success'])
 
+    def test_add_post_duplicate(self):
+        """
+        Uploading a file that has already been uploaded stores it again by default
+        """
+        self.image.get_file_hash()
+
+        response = self.client.post(reverse('wagtailimages:add_multiple'), {
+            'files[]': SimpleUploadedFile('test.png', get_test_image_file().file.getvalue()),
+        }, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+        response_json = json.loads(response.content.decode())
+        self.assertTrue(response_json['success'])
+        self.assertFalse(response_json['duplicate'])
+        self.assertNotEqual(response_json['image_id'], self.image.id)
+        self.assertEqual(Image.objects.filter(file_hash=self.image.file_hash).count(), 2)
+
+    @override_settings(WAGTAILIMAGES_REUSE_DUPLICATE_UPLOADS=True)
+    def test_add_post_duplicate_reused(self):
+        """
+        With WAGTAILIMAGES_REUSE_DUPLICATE_UPLOADS, uploading a file that has already been
+        uploaded returns the existing image instead
+        """
+        self.image.get_file_hash()
+
+        response = self.client.post(reverse('wagtailimages:add_multiple'), {
+            'files[]': SimpleUploadedFile('test.png', get_test_image_file().file.getvalue()),
+        }, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+        response_json = json.loads(response.content.decode())
+        self.assertTrue(response_json['success'])
+        self.assertTrue(response_json['duplicate'])
+        self.assertEqual(response_json['image_id'], self.image.id)
+        self.assertEqual(Image.objects.filter(file_hash=self.image.file_hash).count(), 1)
+
+        # The existing image can't be deleted from the upload form
+        self.assertEqual(response.context['image'], self.image)
+        self.assertContains(response, "This file has already been uploaded")
+        self.assertNotContains(response, reverse('wagtailimages:delete_multiple', args=(self.image.id, )))
+
     def test_add_post_noajax(self):
         """
         This tests that only AJAX requests are allowed to POST to the add view
@@ -1260,6 +1299,19 @@ class TestEditOnlyPermissions(TestCase, WagtailTestUtils):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.context['query_string'], "Hello")
 
+    def test_get_index_num_queries(self):
+        for i in range(5):
+            Image.objects.create(title="Test image %d" % i, file=get_test_image_file())
+
+        # Generate the thumbnails first
+        self.client.get(reverse('wagtailimages:index'))
+
+        # The user's collection permissions are only looked up once, however
+        # many times they are checked
+        with self.assertNumQueries(20):
+            response = self.client.get(reverse('wagtailimages:index'))
+        self.assertEqual(response.status_code, 200)
+
     def test_get_add(self):
         response = self.client.get(reverse('wagtailimages:add'))
         # permission should be denied
@@ -1,7 +1,8 @@
 # coding=utf-8
 from django.test import TestCase
 
-from wagtail.images.shortcuts import get_rendition_or_not_found
+from wagtail.images.models import Rendition
+from wagtail.images.shortcuts import get_rendition_or_not_found, prefetch_renditions
 
 from .utils import Image, get_test_image_file
 
@@ -22,3 +23,76 @@ class TestShortcuts(TestCase):
 
         rendition = get_rendition_or_not_found(bad_image, 'width-400')
         self.assertEqual(rendition.file.name, 'not-found')
+
+
+class TestPrefetchRenditions(TestCase):
+
+    fixtures = ['test.json']
+
+    def setUp(self):
+        self.images = [
+            Image.objects.create(title="Test image %d" % i, file=get_test_image_file())
+            for i in range(3)
+        ]
+
+    def test_prefetch_renditions(self):
+        # One of the renditions already exists
+        existing_rendition = self.images[0].get_rendition('max-165x165')
+
+        images = prefetch_renditions(Image.objects.filter(id__in=[image.id for image in self.images]), 'max-165x165')
+
+        # The renditions are all loaded, so getting them doesn't use the database
+        with self.assertNumQueries(0):
+            renditions = [image.get_rendition('max-165x165') for image in images]
+
+        self.assertIn(existing_rendition, renditions)
+        self.assertEqual(Rendition.objects.filter(filter_spec='max-165x165').count(), 3)
+        self.assertEqual([rendition.width for rendition in renditions], [165, 165, 165])
+
+    def test_prefetch_renditions_queries(self):
+        for image in self.images:
+            image.get_rendition('max-165x165')
+
+        # The existing renditions are found, and then loaded, in one query each
+        with self.assertNumQueries(2):
+            prefetch_renditions(self.images, 'max-165x165')
+
+    def test_other_filters_are_looked_up(self):
+        images = prefetch_renditions(self.images, 'max-165x165')
+
+        rendition = images[0].get_rendition('width-400')
+        self.assertEqual(rendition.width, 400)
+
+        # The same rendition is found again, and the other renditions of the
+        # image are still available
+        self.assertEqual(images[0].get_rendition('width-400'), rendition)
+        self.assertEqual(images[0].get_rendition('width-400').width, 400)
+        self.assertEqual(images[0].renditions.count(), 2)
+        self.assertEqual(images[0].renditions.all().count(), 2)
+
+    def test_other_filters_that_exist_are_looked_up(self):
+        existing_rendition = self.images[0].get_rendition('width-400')
+        images = prefetch_renditions(self.images, 'max-165x165')
+
+        self.assertEqual(images[0].get_rendition('width-400'), existing_rendition)
+        self.assertEqual(images[0].get_rendition('width-400'), existing_rendition)
+        self.assertEqual(images[0].get_rendition('max-165x165').width, 165)
+
+    def test_prefetch_renditions_for_several_filters(self):
+        images = prefetch_renditions(self.images, 'max-165x165')
+        images = prefetch_renditions(images, 'width-400')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(images[0].get_rendition('max-165x165').width, 165)
+            self.assertEqual(images[0].get_rendition('width-400').width, 400)
+            self.assertEqual(images[0].get_rendition('width-400').image, images[0])
+
+    def test_missing_image_file(self):
+        bad_image = Image.objects.get(id=1)
+
+        images = prefetch_renditions(self.images + [bad_image], 'max-165x165')
+
+        # The missing file is left to get_rendition_or_not_found
+        rendition = get_rendition_or_not_found(images[-1], 'max-165x165')
+        self.assertEqual(rendition.file.name, 'not-found')
+        self.assertEqual(Rendition.objects.filter(filter_spec='max-165x165').count(), 3)
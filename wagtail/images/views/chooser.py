@@ -12,6 +12,7 @@ from wagtail.images import get_image_model
 from wagtail.images.formats import get_image_format
 from wagtail.images.forms import ImageInsertionForm, get_image_form
 from wagtail.images.permissions import permission_policy
+from wagtail.images.shortcuts import prefetch_renditions
 from wagtail.search import index as search_index
 from wagtail.utils.pagination import paginate
 
@@ -78,6 +79,7 @@ def chooser(request):
 
         # Pagination
         paginator, images = paginate(request, images, per_page=12)
+        images.object_list = prefetch_renditions(images.object_list, 'max-165x165')
 
         return render(request, "wagtailimages/chooser/results.html", {
             'images': images,
@@ -93,6 +95,7 @@ def chooser(request):
             collections = None
 
         paginator, images = paginate(request, images, per_page=12)
+        images.object_list = prefetch_renditions(images.object_list, 'max-165x165')
 
         return render_modal_workflow(request, 'wagtailimages/chooser/chooser.html', 'wagtailimages/chooser/chooser.js', {
             'images': images,
@@ -131,8 +134,7 @@ def chooser_upload(request):
             image.file_size = image.file.size
 
             # Set image file hash
-            image.file.seek(0)
-            image._set_file_hash(image.file.read())
+            image._set_file_hash()
 
             form.save()
 
@@ -16,6 +16,7 @@ from wagtail.images.exceptions import InvalidFilterSpecError
 from wagtail.images.forms import URLGeneratorForm, get_image_form
 from wagtail.images.models import Filter, SourceImageIOError
 from wagtail.images.permissions import permission_policy
+from wagtail.images.shortcuts import prefetch_renditions
 from wagtail.images.views.serve import generate_signature
 from wagtail.search import index as search_index
 from wagtail.utils.pagination import paginate
@@ -56,6 +57,9 @@ def index(request):
 
     paginator, images = paginate(request, images)
 
+    # Look up (or generate) the thumbnails for the whole page at once
+    images.object_list = prefetch_renditions(images.object_list, 'max-165x165')
+
     collections = permission_policy.collections_user_has_any_permission_for(
         request.user, ['add', 'change']
     )
@@ -102,8 +106,7 @@ def edit(request, image_id):
                 image.file_size = image.file.size
 
                 # Set new image file hash
-                image.file.seek(0)
-                image._set_file_hash(image.file.read())
+                image._set_file_hash()
 
             form.save()
 
@@ -258,8 +261,7 @@ def add(request):
             image.file_size = image.file.size
 
             # Set image file hash
-            image.file.seek(0)
-            image._set_file_hash(image.file.read())
+            image._set_file_hash()
 
             form.save()
 
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.core.exceptions import PermissionDenied
 from django.http import HttpResponseBadRequest, JsonResponse
 from django.shortcuts import get_object_or_404, render
@@ -67,16 +68,29 @@ def add(request):
             image = form.save(commit=False)
             image.uploaded_by_user = request.user
             image.file_size = image.file.size
-            image.file.seek(0)
-            image._set_file_hash(image.file.read())
-            image.save()
+            image._set_file_hash()
+
+            duplicate = None
+            if getattr(settings, 'WAGTAILIMAGES_REUSE_DUPLICATE_UPLOADS', False):
+                # Use an existing image of the same file, rather than storing the
+                # file (and generating its renditions) again
+                duplicate = permission_policy.instances_user_has_permission_for(
+                    request.user, 'change'
+                ).filter(collection=image.collection, file_hash=image.file_hash).order_by('pk').first()
+
+            if duplicate is not None:
+                image = duplicate
+            else:
+                image.save()
 
             # Success! Send back an edit form for this image to the user
             return JsonResponse({
                 'success': True,
                 'image_id': int(image.id),
+                'duplicate': duplicate is not None,
                 'form': render_to_string('wagtailimages/multiple/edit_form.html', {
                     'image': image,
+                    'duplicate': duplicate is not None,
                     'form': get_image_edit_form(Image)(
                         instance=image, prefix='image-%d' % image.id, user=request.user
                     ),
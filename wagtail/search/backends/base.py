@@ -3,6 +3,7 @@ from warnings import warn
 from django.db.models.lookups import Lookup
 from django.db.models.query import QuerySet
 from django.db.models.sql.where import SubqueryConstraint, WhereNode
+from django.utils.module_loading import import_string
 
 from wagtail.search.index import class_is_indexed
 from wagtail.search.query import MATCH_ALL, PlainText
@@ -171,6 +172,10 @@ class BaseSearchResults:
         self._count_cache = None
         self._score_field = None
 
+        # The total number of hits for the unsliced query, if the backend
+        # returned it alongside the results
+        self._total_count = None
+
     def _set_limits(self, start=None, stop=None):
         if stop is not None:
             if self.stop is not None:
@@ -199,9 +204,81 @@ class BaseSearchResults:
     def _do_count(self):
         raise NotImplementedError
 
+    def _get_cache_key_data(self):
+        """
+        Returns a value that identifies the compiled query, including its
+        filters and ordering but not its slice. This is used to build the key
+        of the results cache.
+
+        Returns None if the results of this query can't be cached.
+        """
+        return None
+
+    def _get_results_cache_key(self, kind, start=None, stop=None):
+        if self.backend is None or self.backend.results_cache is None:
+            return
+
+        data = self._get_cache_key_data()
+        if data is None:
+            return
+
+        if start is None:
+            start, stop = self.start, self.stop
+
+        return self.backend.results_cache.make_key(
+            type(self).__module__, type(self).__name__, kind, data, start, stop, bool(self._score_field)
+        )
+
+    def _get_results_from_hits_cache(self, hits):
+        """
+        Loads model instances from a list of cached ``(pk, score)`` pairs,
+        preserving their order
+        """
+        results = {
+            obj.pk: obj
+            for obj in self.query_compiler.queryset.filter(pk__in=[pk for pk, score in hits])
+        }
+
+        for pk, score in hits:
+            obj = results.get(pk)
+            if obj is None:
+                continue
+
+            if self._score_field:
+                setattr(obj, self._score_field, score)
+
+            yield obj
+
+    def _store_total_count(self, generation):
+        if self._total_count is None:
+            return
+
+        # The backend returned the total number of hits with the results, so
+        # cache the count of the unsliced query without asking the backend again
+        cache_key = self._get_results_cache_key('count', 0, None)
+        self.backend.results_cache.set(cache_key, generation, self._total_count)
+
     def results(self):
         if self._results_cache is None:
-            self._results_cache = list(self._do_search())
+            cache_key = self._get_results_cache_key('results')
+
+            if cache_key is None:
+                self._results_cache = list(self._do_search())
+            else:
+                generation, hits = self.backend.results_cache.get(cache_key)
+
+                if hits is not None:
+                    self._results_cache = list(self._get_results_from_hits_cache(hits))
+                else:
+                    self._results_cache = list(self._do_search())
+
+                    hits = [
+                        (obj.pk, getattr(obj, self._score_field) if self._score_field else None)
+                        for obj in self._results_cache
+                    ]
+                    self.backend.results_cache.set(cache_key, generation, hits)
+                    self._store_total_count(generation)
+
         return self._results_cache
 
     def count(self):
@@ -209,7 +286,18 @@ class BaseSearchResults:
             if self._results_cache is not None:
                 self._count_cache = len(self._results_cache)
             else:
-                self._count_cache = self._do_count()
+                cache_key = self._get_results_cache_key('count')
+
+                if cache_key is None:
+                    self._count_cache = self._do_count()
+                else:
+                    generation, count = self.backend.results_cache.get(cache_key)
+
+                    if count is None:
+                        count = self._do_count()
+                        self.backend.results_cache.set(cache_key, generation, count)
+
+                    self._count_cache = count
         return self._count_cache
 
     def __getitem__(self, key):
@@ -270,9 +358,24 @@ class BaseSearchBackend:
     query_compiler_class = None
     results_class = None
     rebuilder_class = None
+    results_cache_class = 'wagtail.search.cache.SearchResultsCache'
 
     def __init__(self, params):
-        pass
+        results_cache_params = params.pop('RESULTS_CACHE', None)
+
+        if results_cache_params is not None:
+            results_cache_class = import_string(results_cache_params.get('BACKEND', self.results_cache_class))
+            self.results_cache = results_cache_class(results_cache_params)
+        else:
+            self.results_cache = None
+
+    def invalidate_results_cache(self):
+        """
+        Discards all cached search results. Called whenever the contents of
+        the index change.
+        """
+        if self.results_cache is not None:
+            self.results_cache.bump_generation()
 
     def get_index_for_model(self, model):
         return None
@@ -315,6 +418,10 @@ class BaseSearchBackend:
         if query == "":
             return EmptySearchResults()
 
+        # A queryset that can't match anything (e.g. .none()) has no results
+        if queryset.query.is_empty():
+            return EmptySearchResults()
+
         # Search
         search_query = self.query_compiler_class(
             queryset, query, fields=fields, operator=operator, order_by_relevance=order_by_relevance
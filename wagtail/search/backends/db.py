@@ -1,5 +1,6 @@
 from warnings import warn
 
+from django.core.exceptions import EmptyResultSet
 from django.db import models
 from django.db.models.expressions import Value
 
@@ -84,7 +85,7 @@ class DatabaseSearchQueryCompiler(BaseSearchQueryCompiler):
 
 
 class DatabaseSearchResults(BaseSearchResults):
-    def get_queryset(self):
+    def get_queryset(self, sliced=True):
         queryset = self.query_compiler.queryset
 
         # Run _get_filters_from_queryset to test that no fields that are not
@@ -93,7 +94,20 @@ class DatabaseSearchResults(BaseSearchResults):
 
         q = self.query_compiler.build_database_filter()
 
-        return queryset.filter(q).distinct()[self.start:self.stop]
+        queryset = queryset.filter(q).distinct()
+
+        if sliced:
+            queryset = queryset[self.start:self.stop]
+
+        return queryset
+
+    def _get_cache_key_data(self):
+        try:
+            return self.get_queryset(sliced=False).query.sql_with_params()
+        except EmptyResultSet:
+            # The queryset can't match anything (e.g. .none()), so there is
+            # no SQL to identify it by. These queries are cheap, so don't cache them
+            return None
 
     def _do_search(self):
         queryset = self.get_queryset()
@@ -112,7 +126,7 @@ class DatabaseSearchBackend(BaseSearchBackend):
     results_class = DatabaseSearchResults
 
     def reset_index(self):
-        pass  # Not needed
+        self.invalidate_results_cache()
 
     def add_type(self, model):
         pass  # Not needed
@@ -120,14 +134,17 @@ class DatabaseSearchBackend(BaseSearchBackend):
     def refresh_index(self):
         pass  # Not needed
 
+    # There's no index to update, but the database content has changed so any
+    # cached results are stale
+
     def add(self, obj):
-        pass  # Not needed
+        self.invalidate_results_cache()
 
     def add_bulk(self, model, obj_list):
-        return  # Not needed
+        self.invalidate_results_cache()
 
     def delete(self, obj):
-        pass  # Not needed
+        self.invalidate_results_cache()
 
 
 SearchBackend = DatabaseSearchBackend
@@ -3,6 +3,7 @@ import json
 import warnings
 from urllib.parse import urlparse
 
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import DEFAULT_DB_ALIAS, models
 from django.db.models.sql import Query
 from django.db.models.sql.constants import MULTI
@@ -615,6 +616,12 @@ class Elasticsearch2SearchResults(BaseSearchResults):
 
         return body
 
+    def _get_cache_key_data(self):
+        return (
+            self.backend.get_index_for_model(self.query_compiler.queryset.model).name,
+            json.dumps(self._get_es_body(), sort_keys=True, cls=DjangoJSONEncoder),
+        )
+
     def _get_results_from_hits(self, hits):
         """
         Yields Django model instances from a page of hits returned by Elasticsearch
@@ -667,6 +674,7 @@ class Elasticsearch2SearchResults(BaseSearchResults):
 
             # Send to Elasticsearch
             page = self.backend.es.search(**params)
+            self._total_count = page['hits']['total']
 
             while True:
                 hits = page['hits']['hits']
@@ -710,7 +718,9 @@ class Elasticsearch2SearchResults(BaseSearchResults):
             })
 
             # Send to Elasticsearch
-            hits = self.backend.es.search(**params)['hits']['hits']
+            page = self.backend.es.search(**params)
+            self._total_count = page['hits']['total']
+            hits = page['hits']['hits']
 
             # Get results
             for result in self._get_results_from_hits(hits):
@@ -1043,6 +1053,7 @@ class Elasticsearch2SearchBackend(BaseSearchBackend):
     def reset_index(self):
         # Use the rebuilder to reset the index
         self.get_rebuilder().reset_index()
+        self.invalidate_results_cache()
 
     def add_type(self, model):
         warnings.warn(
@@ -1070,6 +1081,7 @@ class Elasticsearch2SearchBackend(BaseSearchBackend):
         )
 
         self.get_index_for_model(type(obj)).add_item(obj)
+        self.invalidate_results_cache()
 
     def add_bulk(self, model, obj_list):
         warnings.warn(
@@ -1079,6 +1091,7 @@ class Elasticsearch2SearchBackend(BaseSearchBackend):
         )
 
         self.get_index_for_model(model).add_items(model, obj_list)
+        self.invalidate_results_cache()
 
     def delete(self, obj):
         warnings.warn(
@@ -1088,6 +1101,7 @@ class Elasticsearch2SearchBackend(BaseSearchBackend):
         )
 
         self.get_index_for_model(type(obj)).delete_item(obj)
+        self.invalidate_results_cache()
 
 
 SearchBackend = Elasticsearch2SearchBackend
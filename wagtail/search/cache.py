@@ -0,0 +1,72 @@
+import hashlib
+import uuid
+
+from django.core.cache import caches
+
+
+class SearchResultsCache:
+    """
+    Stores search results in a Django cache.
+
+    Every entry is tagged with the index generation that was current when
+    the search was started. The generation is replaced whenever the index is
+    modified (see ``BaseSearchBackend.invalidate_results_cache``), so results
+    from a previous generation are never returned and are left to expire.
+
+    Configured through the ``RESULTS_CACHE`` parameter of a search backend:
+
+    >>> WAGTAILSEARCH_BACKENDS = {
+    ...     'default': {
+    ...         'BACKEND': 'wagtail.search.backends.db',
+    ...         'RESULTS_CACHE': {
+    ...             'CACHE': 'default',
+    ...             'TIMEOUT': 300,
+    ...         },
+    ...     }
+    ... }
+    """
+    def __init__(self, params):
+        self.cache = caches[params.get('CACHE', 'default')]
+        self.timeout = params.get('TIMEOUT', 300)
+        self.key_prefix = params.get('KEY_PREFIX', 'wagtailsearch')
+        self.generation_key = self.key_prefix + ':generation'
+
+    def make_key(self, *parts):
+        digest = hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+        return self.key_prefix + ':' + digest
+
+    def get(self, key):
+        """
+        Returns a ``(generation, value)`` tuple. ``value`` is ``None`` when
+        there is no entry for the key in the current generation.
+
+        The generation must be passed back to ``set`` so results that were
+        computed while the index was being modified aren't stored as current.
+        """
+        values = self.cache.get_many([self.generation_key, key])
+        generation = values.get(self.generation_key)
+
+        if generation is None:
+            return self.get_generation(), None
+
+        entry = values.get(key)
+        if entry is None or entry[0] != generation:
+            return generation, None
+
+        return generation, entry[1]
+
+    def set(self, key, generation, value):
+        self.cache.set(key, (generation, value), self.timeout)
+
+    def get_generation(self):
+        generation = self.cache.get(self.generation_key)
+
+        if generation is None:
+            # Use add so concurrent processes agree on the same generation
+            self.cache.add(self.generation_key, uuid.uuid4().hex, None)
+            generation = self.cache.get(self.generation_key)
+
+        return generation
+
+    def bump_generation(self):
+        self.cache.set(self.generation_key, uuid.uuid4().hex, None)
@@ -59,6 +59,10 @@ class Command(BaseCommand):
 
         if not backend.rebuilder_class:
             self.stdout.write("Backend '%s' doesn't require rebuilding" % backend_name)
+
+            # The database may still have been changed without updating the
+            # index, so discard any cached search results
+            backend.invalidate_results_cache()
             return
 
         models_grouped_by_index = group_models_by_index(backend, get_indexed_models()).items()
@@ -92,6 +96,9 @@ class Command(BaseCommand):
             # Finish rebuild
             rebuilder.finish()
 
+            # The index has been rebuilt so any cached search results are stale
+            backend.invalidate_results_cache()
+
             self.stdout.write(backend_name + ": indexed %d objects" % object_count)
             self.print_newline()
 
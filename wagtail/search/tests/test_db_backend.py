@@ -1,6 +1,12 @@
 import unittest
+from io import StringIO
 
-from django.test import TestCase
+from django.core import management
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from wagtail.search.backends import get_search_backend
+from wagtail.tests.search import models
 
 from .test_backends import BackendTests
 
@@ -57,3 +63,92 @@ class TestDBBackend(BackendTests, TestCase):
     @unittest.expectedFailure
     def test_incomplete_plain_text(self):
         super().test_incomplete_plain_text()
+
+
+@override_settings(
+    CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'search-results-cache-tests',
+        }
+    },
+    WAGTAILSEARCH_BACKENDS={
+        'default': {
+            'BACKEND': 'wagtail.search.backends.db',
+            'RESULTS_CACHE': {
+                'CACHE': 'default',
+            },
+        }
+    }
+)
+class TestDBBackendResultsCache(TestCase):
+    fixtures = ['search']
+
+    def setUp(self):
+        caches['default'].clear()
+        self.backend = get_search_backend('default')
+
+    def test_results_are_cached(self):
+        results = self.backend.search("JavaScript", models.Book)
+        self.assertEqual(len(results), 2)
+
+        # Change the titles without sending signals so the cache isn't invalidated
+        models.Book.objects.filter(title__icontains="JavaScript").update(title="Python")
+
+        results = self.backend.search("JavaScript", models.Book)
+        self.assertEqual(len(results), 2)
+
+        # The objects themselves are loaded from the database
+        self.assertEqual({result.title for result in results}, {"Python"})
+
+    def test_count_is_cached(self):
+        self.assertEqual(self.backend.search("JavaScript", models.Book).count(), 2)
+
+        models.Book.objects.filter(title__icontains="JavaScript").update(title="Python")
+
+        self.assertEqual(self.backend.search("JavaScript", models.Book).count(), 2)
+
+    def test_slices_are_cached_separately(self):
+        results = self.backend.search("JavaScript", models.Book)
+        first = list(results[:1])
+        second = list(results[1:2])
+
+        self.assertEqual(len(first), 1)
+        self.assertEqual(len(second), 1)
+        self.assertNotEqual(first[0].pk, second[0].pk)
+
+    def test_filters_are_part_of_the_key(self):
+        results = self.backend.search("JavaScript", models.Book.objects.filter(number_of_pages__lt=0))
+        self.assertEqual(len(results), 0)
+
+        results = self.backend.search("JavaScript", models.Book)
+        self.assertEqual(len(results), 2)
+
+    def test_empty_queryset(self):
+        results = self.backend.search("JavaScript", models.Book.objects.none())
+        self.assertEqual(len(results), 0)
+        self.assertEqual(results.count(), 0)
+
+        results = self.backend.search("JavaScript", models.Book.objects.filter(number_of_pages__in=[]))
+        self.assertEqual(list(results), [])
+
+    def test_saving_an_object_invalidates_the_cache(self):
+        results = self.backend.search("JavaScript", models.Book)
+        self.assertEqual(len(results), 2)
+
+        book = models.Book.objects.get(title="JavaScript: The good parts")
+        book.title = "The good parts"
+        book.save()
+
+        results = self.backend.search("JavaScript", models.Book)
+        self.assertEqual(len(results), 1)
+
+    def test_update_index_invalidates_the_cache(self):
+        results = self.backend.search("JavaScript", models.Book)
+        self.assertEqual(len(results), 2)
+
+        models.Book.objects.filter(title="JavaScript: The good parts").update(title="The good parts")
+        management.call_command('update_index', backend_name='default', stdout=StringIO())
+
+        results = self.backend.search("JavaScript", models.Book)
+        self.assertEqual(len(results), 1)
@@ -0,0 +1 @@
+default_app_config = 'wagtail.tests.postgresforms.apps.WagtailPostgresFormsTestsAppConfig'
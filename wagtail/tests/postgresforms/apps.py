@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+from django.utils.translation import ugettext_lazy as _
+
+
+class WagtailPostgresFormsTestsAppConfig(AppConfig):
+    name = 'wagtail.tests.postgresforms'
+    label = 'postgresformstests'
+    verbose_name = _("Wagtail PostgreSQL form submission tests")
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import django.contrib.postgres.fields.jsonb
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+import wagtail.contrib.forms.postgres
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('wagtailcore', '0040_page_draft_title'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JSONFormSubmission',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('submit_time', models.DateTimeField(auto_now_add=True, verbose_name='submit time')),
+                ('form_data', django.contrib.postgres.fields.jsonb.JSONField()),
+                ('page', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='wagtailcore.Page')),
+            ],
+            options={
+                'verbose_name': 'form submission',
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='OtherJSONFormSubmission',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('submit_time', models.DateTimeField(auto_now_add=True, verbose_name='submit time')),
+                ('form_data', django.contrib.postgres.fields.jsonb.JSONField()),
+                ('page', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='wagtailcore.Page')),
+            ],
+            options={
+                'verbose_name': 'form submission',
+                'abstract': False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='jsonformsubmission',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['form_data'], name='postgresfor_form_da_6c4fec_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='otherjsonformsubmission',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['form_data'], name='postgresfor_form_da_f3640b_gin'),
+        ),
+        wagtail.contrib.forms.postgres.AddFormDataIndex('JSONFormSubmission', 'your-email'),
+    ]
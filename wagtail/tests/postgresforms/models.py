@@ -0,0 +1,10 @@
+from wagtail.contrib.forms.postgres import AbstractJSONFormSubmission
+
+
+class JSONFormSubmission(AbstractJSONFormSubmission):
+    pass
+
+
+# A second subclass, to check that the indexes each one inherits don't share a name
+class OtherJSONFormSubmission(AbstractJSONFormSubmission):
+    pass
@@ -165,7 +165,7 @@ WAGTAILSEARCH_BACKENDS = {
 AUTH_USER_MODEL = 'customuser.CustomUser'
 
 if os.environ.get('DATABASE_ENGINE') == 'django.db.backends.postgresql':
-    INSTALLED_APPS += ('wagtail.contrib.postgres_search',)
+    INSTALLED_APPS += ('wagtail.contrib.postgres_search', 'wagtail.tests.postgresforms')
     WAGTAILSEARCH_BACKENDS['postgresql'] = {
         'BACKEND': 'wagtail.contrib.postgres_search.backend',
         'AUTO_UPDATE': False,
@@ -0,0 +1,28 @@
+# Generated by Django 2.0.13 on 2026-10-19 12:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests', '0032_auto_20180505_0008'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customdocument',
+            name='file_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=40),
+        ),
+        migrations.AlterField(
+            model_name='customimage',
+            name='file_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=40),
+        ),
+        migrations.AlterField(
+            model_name='customimagefilepath',
+            name='file_hash',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=40),
+        ),
+    ]
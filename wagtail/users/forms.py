@@ -20,7 +20,7 @@ from wagtail.admin.widgets import AdminPageChooser
 from wagtail.core import hooks
 from wagtail.core.models import (
     PAGE_PERMISSION_TYPE_CHOICES, PAGE_PERMISSION_TYPES, GroupPagePermission, Page,
-    UserPagePermissionsProxy)
+    UserPagePermissionsProxy, invalidate_page_permissions)
 from wagtail.users.models import UserProfile
 
 User = get_user_model()
@@ -359,6 +359,10 @@ class BaseGroupPagePermissionFormSet(forms.BaseFormSet):
             for (page, permission_type) in permissions_to_add
         ])
 
+        # bulk_create doesn't send the post_save signal
+        if permissions_to_add:
+            invalidate_page_permissions()
+
     def as_admin_panel(self):
         return render_to_string('wagtailusers/groups/includes/page_permissions_formset.html', {
             'formset': self